@@ -0,0 +1,132 @@
+"""
+Compare VAD backends on a directory of recordings.
+
+Reports the processing speed of each backend and how well their trim
+boundaries agree with the reference backend (webrtc by default).
+
+Usage:
+    python benchmarks/compare_vad.py <recordings-dir> [--aggressiveness 2]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from helvox.utils.trim import detect_voiced_frames, find_speech_bounds
+from helvox.utils.vad import VAD_BACKENDS, get_vad_backend
+
+AUDIO_SUFFIXES = {".flac", ".wav"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--aggressiveness", type=int, default=2)
+    parser.add_argument("--frame-ms", type=int, default=30)
+    parser.add_argument("--padding-s", type=float, default=0.1)
+    parser.add_argument("--reference", default="webrtc", choices=VAD_BACKENDS)
+    parser.add_argument(
+        "--tolerance-ms",
+        type=float,
+        default=50.0,
+        help="boundary difference still counted as agreement",
+    )
+    args = parser.parse_args()
+
+    files = sorted(
+        path
+        for path in args.directory.rglob("*")
+        if path.suffix.lower() in AUDIO_SUFFIXES
+    )
+    if not files:
+        parser.error(f"No recordings found in {args.directory}")
+
+    backends = {
+        name: get_vad_backend(name, args.aggressiveness) for name in VAD_BACKENDS
+    }
+    # Warm up so one-time initialisation is not counted
+    warmup = np.zeros((10, 480), dtype=np.int16)
+    for backend in backends.values():
+        backend.decide(warmup, 16000)
+
+    seconds = {name: 0.0 for name in backends}
+    audio_seconds = 0.0
+    frame_agreement = {name: [] for name in backends}
+    start_diff_ms = {name: [] for name in backends}
+    end_diff_ms = {name: [] for name in backends}
+    skipped = 0
+
+    for path in files:
+        audio, sample_rate = sf.read(path, dtype="int16", always_2d=True)
+        if not all(
+            backend.supports(sample_rate, args.frame_ms)
+            for backend in backends.values()
+        ):
+            skipped += 1
+            continue
+
+        audio_seconds += len(audio) / sample_rate
+        decisions = {}
+        bounds = {}
+
+        for name, backend in backends.items():
+            start = time.perf_counter()
+            decisions[name] = detect_voiced_frames(
+                audio,
+                sample_rate=sample_rate,
+                frame_duration_ms=args.frame_ms,
+                backend=backend,
+            )
+            seconds[name] += time.perf_counter() - start
+
+            bounds[name] = find_speech_bounds(
+                audio,
+                sample_rate=sample_rate,
+                frame_duration_ms=args.frame_ms,
+                padding_duration_s=args.padding_s,
+                backend=backend,
+            ) or (0, len(audio))
+
+        reference = args.reference
+        for name in backends:
+            frame_agreement[name].append(
+                float(np.mean(decisions[name] == decisions[reference]))
+            )
+            start_diff_ms[name].append(
+                abs(bounds[name][0] - bounds[reference][0]) / sample_rate * 1000
+            )
+            end_diff_ms[name].append(
+                abs(bounds[name][1] - bounds[reference][1]) / sample_rate * 1000
+            )
+
+    processed = len(files) - skipped
+    print(f"Recordings: {processed} ({audio_seconds:.1f} s of audio)")
+    if skipped:
+        print(f"Skipped: {skipped} (sample rate not supported by every backend)")
+    if processed == 0:
+        return
+
+    print()
+    print(
+        f"{'backend':<10} {'time (s)':>9} {'x realtime':>11} {'frames agree':>13} "
+        f"{'start p50/p95 ms':>17} {'end p50/p95 ms':>15} {'within tol':>11}"
+    )
+    for name in backends:
+        starts = np.array(start_diff_ms[name])
+        ends = np.array(end_diff_ms[name])
+        within = np.mean((starts <= args.tolerance_ms) & (ends <= args.tolerance_ms))
+        speed = audio_seconds / seconds[name] if seconds[name] > 0 else float("inf")
+        print(
+            f"{name:<10} {seconds[name]:>9.3f} {speed:>11.0f} "
+            f"{np.mean(frame_agreement[name]):>13.1%} "
+            f"{np.median(starts):>8.0f}/{np.percentile(starts, 95):<8.0f} "
+            f"{np.median(ends):>6.0f}/{np.percentile(ends, 95):<8.0f} "
+            f"{within:>11.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare output encoding profiles on a directory of recordings.
+
+Every recording is decoded once and then written with each profile into a
+temporary folder. Reports the time spent in the save path, the background
+conversion time of deferred profiles and the resulting bytes per hour of
+speech.
+
+Usage:
+    python benchmarks/encoding_profiles.py <recordings-dir> [--dtype int16]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import soundfile as sf
+
+from helvox.utils.encoding import ENCODING_PROFILES, pending_path, transcode_to_flac
+
+AUDIO_SUFFIXES = {".flac", ".wav"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument(
+        "--dtype",
+        default="float32",
+        choices=("float32", "int16"),
+        help="sample format of the takes, as captured by the recorder",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    files = sorted(
+        path
+        for path in args.directory.rglob("*")
+        if path.suffix.lower() in AUDIO_SUFFIXES
+    )
+    if not files:
+        parser.error(f"No recordings found in {args.directory}")
+
+    takes = [sf.read(path, dtype=args.dtype) for path in files]
+    audio_seconds = sum(len(audio) / sample_rate for audio, sample_rate in takes)
+
+    print(f"Recordings: {len(takes)} ({audio_seconds:.1f} s of audio, {args.dtype})")
+    print()
+    print(
+        f"{'profile':<14} {'save (ms/take)':>15} {'background (ms)':>16} "
+        f"{'x realtime':>11} {'MB / hour':>10}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+
+        for name, profile in ENCODING_PROFILES.items():
+            best_save = float("inf")
+            best_background = float("inf")
+
+            for _ in range(args.repeat):
+                save_s = 0.0
+                background_s = 0.0
+                size = 0
+
+                for i, (audio, sample_rate) in enumerate(takes):
+                    flac_path = out_dir / f"{name}-{i}.flac"
+                    wav_path = pending_path(flac_path)
+                    flac_path.unlink(missing_ok=True)
+
+                    start = time.perf_counter()
+                    if profile.deferred:
+                        sf.write(
+                            wav_path,
+                            audio,
+                            sample_rate,
+                            subtype=profile.subtype,
+                            format="WAV",
+                        )
+                    else:
+                        profile.write_flac(flac_path, audio, sample_rate)
+                    save_s += time.perf_counter() - start
+
+                    if profile.deferred:
+                        start = time.perf_counter()
+                        transcode_to_flac(wav_path, flac_path, profile)
+                        background_s += time.perf_counter() - start
+
+                    size += flac_path.stat().st_size
+
+                best_save = min(best_save, save_s)
+                best_background = min(best_background, background_s)
+
+            total_s = best_save + best_background
+            speed = audio_seconds / total_s if total_s > 0 else float("inf")
+            mb_per_hour = size / audio_seconds * 3600 / 1e6
+            background = (
+                f"{best_background / len(takes) * 1000:>16.2f}"
+                if profile.deferred
+                else f"{'-':>16}"
+            )
+            print(
+                f"{name:<14} {best_save / len(takes) * 1000:>15.2f} {background} "
+                f"{speed:>11.0f} {mb_per_hour:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
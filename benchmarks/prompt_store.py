@@ -0,0 +1,131 @@
+"""
+Compare the memory and load time of the prompt store with a dict per prompt.
+
+Writes a synthetic input corpus with a German text and one text per dialect
+for every prompt, then loads it the way the recorder used to (a dict of the
+parsed dicts) and into a PromptStore keeping only the speaker's columns.
+Reports load time, retained memory (traced Python heap after loading) and
+the time of a pass of prompt lookups.
+
+Usage:
+    python benchmarks/prompt_store.py [--rows 1000000] [--dialects 8]
+"""
+
+import argparse
+import gc
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from helvox.utils.data import read_dataset
+from helvox.utils.prompts import PromptStore, prompt_columns
+
+DIALECTS = ("ag", "be", "bs", "gr", "lu", "sg", "vs", "zh", "zg", "sh", "so", "tg")
+WORDS = (
+    "Grüezi mitenand de Zug fahrt hüt nöd pünktlich ab uf em Bahnhof "
+    "mir gönd am Abig no is Kino oder blibed dihei und kochet öppis Feins"
+).split()
+
+
+def write_corpus(path: Path, rows: int, dialects: int) -> None:
+    rng = random.Random(0)
+
+    def sentence() -> str:
+        return " ".join(rng.choices(WORDS, k=rng.randint(5, 14)))
+
+    with open(path, mode="w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(rows):
+            sample = {"id": f"prompt-{i:07d}", "de": sentence()}
+            for dialect in DIALECTS[:dialects]:
+                sample[f"ch_{dialect}"] = sentence()
+            f.write(("," if i else "") + json.dumps(sample, ensure_ascii=False))
+        f.write("]")
+
+
+def load_dicts(path: Path, dialect: str):
+    return {
+        str(sample["id"]): sample
+        for sample in read_dataset(path, dialect_filter=dialect)
+    }
+
+
+def load_store(path: Path, dialect: str):
+    return PromptStore.from_samples(
+        read_dataset(path, dialect_filter=dialect), prompt_columns(dialect)
+    )
+
+
+def prompt_text(index, id: str, dialect: str) -> str:
+    # Same lookup as Recorder.get_prompt_text
+    sample = index.get(id, {})
+    return sample.get("ch") or sample.get(f"ch_{dialect}") or sample.get("de", "")
+
+
+def measure(name: str, load, path: Path, dialect: str, lookups: int) -> dict:
+    gc.collect()
+    start = time.perf_counter()
+    index = load(path, dialect)
+    load_s = time.perf_counter() - start
+
+    ids = list(index)
+    sample_ids = random.Random(1).choices(ids, k=lookups)
+    start = time.perf_counter()
+    for id in sample_ids:
+        prompt_text(index, id, dialect)
+    lookup_us = (time.perf_counter() - start) / lookups * 1e6
+    del index, ids, sample_ids
+
+    # Memory in a separate run, tracing slows down the load a lot
+    gc.collect()
+    tracemalloc.start()
+    index = load(path, dialect)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+
+    return {
+        "name": name,
+        "load_s": load_s,
+        "retained_mb": retained / 1e6,
+        "peak_mb": peak / 1e6,
+        "lookup_us": lookup_us,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dialects", type=int, default=8, choices=range(1, 13))
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    dialect = DIALECTS[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "input.json"
+        write_corpus(path, args.rows, args.dialects)
+        size_mb = path.stat().st_size / 1e6
+        print(f"{args.rows} prompts, {args.dialects} dialects, {size_mb:.0f} MB")
+        print()
+
+        results = [
+            measure("dict per prompt", load_dicts, path, dialect, args.lookups),
+            measure("PromptStore", load_store, path, dialect, args.lookups),
+        ]
+
+    print(f"{'index':<16} {'load':>8} {'retained':>10} {'peak':>10} {'lookup':>10}")
+    for result in results:
+        print(
+            f"{result['name']:<16} {result['load_s']:>7.2f}s "
+            f"{result['retained_mb']:>8.0f}MB {result['peak_mb']:>8.0f}MB "
+            f"{result['lookup_us']:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Soak test the recorder over thousands of record/save cycles.
+
+Drives a Recorder through monitor -> record -> trim -> save cycles with a
+simulated input device that plays a synthetic take faster than real time.
+Samples RSS, traced Python heap, open file handles, threads and per-cycle
+latency along the way, and fails if any of them trends upward by more than
+its threshold over the run (fitted linearly, after a warm-up).
+
+Usage:
+    python benchmarks/soak.py [--cycles 3000] [--capture-rate 44100]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+import helvox.utils.recorder as recorder_module
+from helvox.utils.recorder import Recorder
+
+DEVICE_NAME = "simulated"
+
+# Samples needed after the warm-up for a trend to mean anything
+MIN_MEASURED_SAMPLES = 3
+
+
+def synthetic_take(sample_rate: int, seconds: float = 3.0) -> np.ndarray:
+    """Noise floor, 2 s of a harmonic voice-like signal, noise floor."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * 2.0)) / sample_rate
+    voice = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    voice *= 0.2 * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+
+    pad = int(sample_rate * (seconds - 2.0) / 2)
+    take = np.concatenate((np.zeros(pad), voice, np.zeros(pad)))
+    take += rng.normal(0.0, 1e-3, len(take))
+    return take.astype(np.float32)
+
+
+class SimulatedInputStream:
+    """
+    Stand-in for sounddevice.InputStream calling back from its own thread,
+    like PortAudio does, with blocks of a looped synthetic take.
+    """
+
+    speed = 20.0
+    blocksize = 1024
+    sources: dict = {}
+
+    def __init__(
+        self,
+        device=None,
+        channels=1,
+        samplerate=48000,
+        dtype="float32",
+        callback=None,
+        **kwargs,
+    ) -> None:
+        self.channels = channels
+        self.samplerate = int(samplerate)
+        self.dtype = dtype
+        self.callback = callback
+        self.stopped = threading.Event()
+        self.thread = None
+
+        key = (self.samplerate, dtype)
+        if key not in self.sources:
+            take = synthetic_take(self.samplerate)
+            if dtype == "int16":
+                take = (take * 32767).astype(np.int16)
+            self.sources[key] = np.repeat(take[:, None], channels, axis=1)
+        self.source = self.sources[key]
+
+    def start(self) -> None:
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        position = 0
+        interval = self.blocksize / self.samplerate / self.speed
+        while not self.stopped.is_set():
+            end = position + self.blocksize
+            block = self.source[position:end]
+            if len(block) < self.blocksize:
+                block = np.concatenate((block, self.source[: end - len(self.source)]))
+            position = end % len(self.source)
+            self.callback(block, self.blocksize, None, None)
+            self.stopped.wait(interval)
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def close(self) -> None:
+        pass
+
+
+def install_simulated_device(capture_rate: int) -> None:
+    device = {
+        "name": DEVICE_NAME,
+        "max_input_channels": 1,
+        "default_samplerate": float(capture_rate),
+    }
+
+    def query_devices(device_id=None, kind=None):
+        return [device] if device_id is None else device
+
+    recorder_module.sd.InputStream = SimulatedInputStream
+    recorder_module.sd.query_devices = query_devices
+
+
+def get_rss_mb() -> float:
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / 1e6
+    except ImportError:
+        pass
+
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def get_open_handles() -> int:
+    try:
+        import psutil
+
+        process = psutil.Process()
+        if hasattr(process, "num_fds"):
+            return process.num_fds()
+        return process.num_handles()
+    except ImportError:
+        return len(os.listdir("/proc/self/fd"))
+
+
+def growth(cycles: list[int], values: list[float]) -> float:
+    """Growth over the run of the least squares line through values."""
+    if len(values) < 3:
+        return 0.0
+    slope, _ = np.polyfit(cycles, values, 1)
+    return float(slope * (cycles[-1] - cycles[0]))
+
+
+def make_recorder(folder: Path, prompts: int, args: argparse.Namespace) -> Recorder:
+    input_file = folder / "input.json"
+    with open(input_file, mode="w", encoding="utf-8") as f:
+        json.dump(
+            [
+                {"id": f"soak-{i:05d}", "de": f"Satz {i}", "ch_ag": f"Satz {i}"}
+                for i in range(prompts)
+            ],
+            f,
+        )
+
+    recorder = Recorder(folder / "recordings", sample_rate=args.sample_rate)
+    recorder.dtype = args.dtype
+    recorder.vad_backend = args.vad
+    recorder.encoding_profile = args.encoding
+    recorder.speaker_id = "soak"
+    recorder.speaker_dialect = "AG"
+    recorder.input_file = str(input_file)
+    recorder.output_file = recorder.get_speaker_folder() / "output.json"
+    recorder.skipped_file = recorder.get_speaker_folder() / "skipped.txt"
+    recorder.refresh_audio_devices()
+    recorder.selected_device = DEVICE_NAME
+    recorder.load_data()
+    return recorder
+
+
+def run_cycle(recorder: Recorder, id: str, take_blocks: int) -> dict:
+    recorder.start_recording()
+    while len(recorder.audio_data) < take_blocks:
+        time.sleep(0.001)
+
+    start = time.perf_counter()
+    recorder.stop_recording()
+    finalized = time.perf_counter()
+    duration_s = recorder.save_audio(id)
+    saved = time.perf_counter()
+    recorder.add_sample(
+        id,
+        text_de="",
+        text_ch="",
+        dialect="ag",
+        audio_path=recorder.audio_relpath(id),
+        duration_s=duration_s,
+        quality=recorder.last_metrics,
+    )
+    done = time.perf_counter()
+    recorder.release_take()
+
+    return {
+        "finalize_ms": (finalized - start) * 1000,
+        "save_ms": (saved - finalized) * 1000,
+        "manifest_ms": (done - saved) * 1000,
+        "total_ms": (done - start) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=3000)
+    parser.add_argument(
+        "--prompts",
+        type=int,
+        default=200,
+        help="prompt pool, re-recorded in turn so the manifest stays bounded",
+    )
+    parser.add_argument("--take-s", type=float, default=3.0)
+    parser.add_argument("--speed", type=float, default=20.0, help="x real time")
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--capture-rate", type=int, default=48000)
+    parser.add_argument("--dtype", default="int16", choices=("float32", "int16"))
+    parser.add_argument("--vad", default="webrtc")
+    parser.add_argument("--encoding", default="flac")
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=0.1,
+        help="share of the cycles ignored for the trends, at least one pass "
+        "over the prompt pool while the manifest still grows",
+    )
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50.0)
+    parser.add_argument("--max-heap-growth-mb", type=float, default=10.0)
+    parser.add_argument("--max-handle-growth", type=float, default=4.0)
+    parser.add_argument("--max-thread-growth", type=float, default=2.0)
+    parser.add_argument(
+        "--max-latency-growth",
+        type=float,
+        default=0.5,
+        help="allowed relative increase of the median cycle latency",
+    )
+    parser.add_argument("--json", type=Path, help="write the samples here")
+    args = parser.parse_args()
+
+    # Without cycles after the warm-up there is no trend to check
+    warmup = max(int(args.cycles * args.warmup), args.prompts)
+    if args.cycles <= warmup:
+        parser.error(
+            f"--cycles must be larger than the warm-up of {warmup} cycles "
+            "(--warmup share, at least --prompts)"
+        )
+
+    SimulatedInputStream.speed = args.speed
+    install_simulated_device(args.capture_rate)
+    take_blocks = int(args.take_s * args.capture_rate / SimulatedInputStream.blocksize)
+
+    if not args.no_tracemalloc:
+        tracemalloc.start(10)
+
+    samples = []
+    baseline = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = make_recorder(Path(tmp), args.prompts, args)
+        recorder.start_monitoring()
+        pool = list(recorder.input_index)
+        latencies = []
+        started = time.perf_counter()
+
+        for cycle in range(args.cycles):
+            id = recorder.get_next_id() or pool[cycle % len(pool)]
+            latencies.append(run_cycle(recorder, id, take_blocks))
+
+            if (cycle + 1) % args.sample_every and cycle + 1 != args.cycles:
+                continue
+
+            window = latencies[-args.sample_every :]
+            sample = {
+                "cycle": cycle + 1,
+                "rss_mb": get_rss_mb(),
+                "handles": get_open_handles(),
+                "threads": threading.active_count(),
+            }
+            for key in window[0]:
+                sample[key] = float(np.median([entry[key] for entry in window]))
+            if tracemalloc.is_tracing():
+                sample["heap_mb"] = tracemalloc.get_traced_memory()[0] / 1e6
+                if baseline is None and cycle + 1 >= warmup:
+                    baseline = tracemalloc.take_snapshot()
+            samples.append(sample)
+
+            print(
+                f"{cycle + 1:>6} cycles  rss {sample['rss_mb']:7.1f} MB  "
+                f"heap {sample.get('heap_mb', 0.0):6.1f} MB  "
+                f"handles {sample['handles']:>4}  threads {sample['threads']:>3}  "
+                f"cycle {sample['total_ms']:6.1f} ms",
+                flush=True,
+            )
+
+        recorder.stop_monitoring()
+        recorder.shutdown_transcoder()
+        elapsed = time.perf_counter() - started
+
+        top_allocators = []
+        if baseline is not None:
+            snapshot = tracemalloc.take_snapshot()
+            top_allocators = snapshot.compare_to(baseline, "lineno")[:10]
+
+    # Trends over the samples after the warm-up
+    measured = [sample for sample in samples if sample["cycle"] > warmup]
+    cycles = [sample["cycle"] for sample in measured]
+    if len(measured) < MIN_MEASURED_SAMPLES:
+        print(
+            f"Only {len(measured)} samples after the warm-up of {warmup} cycles, "
+            f"need {MIN_MEASURED_SAMPLES}: raise --cycles or lower --sample-every"
+        )
+        sys.exit(1)
+
+    def trend(key: str) -> float:
+        return growth(cycles, [sample[key] for sample in measured])
+
+    first_latency = float(np.median([s["total_ms"] for s in measured[:3]]))
+    checks = [
+        ("RSS (MB)", trend("rss_mb"), args.max_rss_growth_mb),
+        ("open handles", trend("handles"), args.max_handle_growth),
+        ("threads", trend("threads"), args.max_thread_growth),
+        (
+            "cycle latency (relative)",
+            trend("total_ms") / first_latency if first_latency else 0.0,
+            args.max_latency_growth,
+        ),
+    ]
+    if measured and "heap_mb" in measured[0]:
+        checks.append(("traced heap (MB)", trend("heap_mb"), args.max_heap_growth_mb))
+
+    print()
+    print(f"{args.cycles} cycles in {elapsed:.0f} s")
+    print()
+    print(f"{'metric':<26} {'growth':>10} {'limit':>10}")
+    failed = False
+    for name, value, limit in checks:
+        status = "FAIL" if value > limit else "ok"
+        failed |= value > limit
+        print(f"{name:<26} {value:>10.2f} {limit:>10.2f}  {status}")
+
+    if top_allocators:
+        print()
+        print("Top allocators since warm-up:")
+        for stat in top_allocators:
+            print(f"  {stat}")
+
+    if args.json:
+        with open(args.json, mode="w", encoding="utf-8") as f:
+            json.dump({"samples": samples, "checks": checks}, f, indent=4)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
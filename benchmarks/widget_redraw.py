@@ -0,0 +1,157 @@
+"""
+Measure hover and resize redraw times of the rounded widgets.
+
+Builds a window with the app's buttons and waveform canvases, then times
+hover enter/leave and a sweep of canvas resizes. Each step is flushed with
+update_idletasks(), so Tk's own redraw is included. The cached path (item
+state swaps and reshaping the kept background) is compared against a full
+rebuild of the items, which is what every hover and resize used to do.
+
+Needs a display. Usage:
+    python benchmarks/widget_redraw.py [--buttons 10] [--canvases 3]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tkinter as tk
+
+from helvox.ui.button import RoundedButton
+from helvox.ui.rounded_canvas import RoundedCanvas
+from helvox.ui.shapes import rounded_rect_points
+
+
+def full_hover(button: RoundedButton, hover: bool) -> None:
+    button.draw_button(hover=hover)
+
+
+def full_resize(canvas: RoundedCanvas) -> None:
+    # Delete and recreate the background, as before the shape cache
+    canvas.delete("rounded_bg")
+    width = canvas.winfo_width()
+    height = canvas.winfo_height()
+    points = list(rounded_rect_points.__wrapped__(width, height, canvas.corner_radius))
+    canvas.create_polygon(
+        points, fill=canvas.bg, smooth=True, outline=canvas.bg, tags="rounded_bg"
+    )
+
+
+def time_steps(root: tk.Tk, steps) -> list[float]:
+    """Milliseconds per step, including the redraw it causes."""
+    times = []
+    for step in steps:
+        start = time.perf_counter()
+        step()
+        root.update_idletasks()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def draw_waveform(canvas: RoundedCanvas, columns: int = 400) -> None:
+    # Some content, so redraws cost what they cost in the app
+    height = canvas.winfo_height()
+    for x in range(columns):
+        amplitude = (x * 7919 % 100) / 100 * height / 2
+        canvas.create_line(
+            x, height / 2 - amplitude, x, height / 2 + amplitude, fill="#FFFFFF"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--buttons", type=int, default=10)
+    parser.add_argument("--canvases", type=int, default=3)
+    parser.add_argument("--hovers", type=int, default=200, help="per button")
+    parser.add_argument("--widths", type=int, default=200, help="resize steps")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available: {e}")
+        sys.exit(1)
+
+    root.geometry("900x700")
+    buttons = [
+        RoundedButton(root, text=f"Button {i}", bg_color="#000000", dot=i == 0)
+        for i in range(args.buttons)
+    ]
+    for i, button in enumerate(buttons):
+        button.grid(row=i // 5, column=i % 5, padx=5, pady=5)
+
+    canvases = [
+        RoundedCanvas(root, bg="#555555", height=120, corner_radius=20)
+        for _ in range(args.canvases)
+    ]
+    # Placed with an explicit width, so the resize steps control the size
+    for i, canvas in enumerate(canvases):
+        canvas.place(x=5, y=150 + i * 130, width=400, height=120)
+    root.update()
+    for canvas in canvases:
+        draw_waveform(canvas)
+    root.update()
+
+    results = []
+
+    hover_steps = [
+        lambda button=button, hover=hover: button.set_hover(hover)
+        for _ in range(args.hovers)
+        for button in buttons
+        for hover in (True, False)
+    ]
+    full_hover_steps = [
+        lambda button=button, hover=hover: full_hover(button, hover)
+        for _ in range(args.hovers)
+        for button in buttons
+        for hover in (True, False)
+    ]
+    results.append(("hover, full rebuild", time_steps(root, full_hover_steps)))
+    results.append(("hover, state swap", time_steps(root, hover_steps)))
+
+    # Grow and shrink the canvases through the sweep of widths, twice
+    widths = [400 + (i % args.widths) * 2 for i in range(args.widths * 2)]
+
+    def resize_steps(redraw):
+        steps = []
+        for width in widths:
+
+            def step(width=width):
+                for canvas in canvases:
+                    canvas.place_configure(width=width)
+                    canvas.update_idletasks()
+                    redraw(canvas)
+
+            steps.append(step)
+        return steps
+
+    # Unbind the automatic redraw so only the measured path runs
+    for canvas in canvases:
+        canvas.unbind("<Configure>")
+    results.append(
+        ("resize, full rebuild", time_steps(root, resize_steps(full_resize)))
+    )
+    for canvas in canvases:
+        canvas.draw_canvas()
+    results.append(
+        (
+            "resize, reshape",
+            time_steps(root, resize_steps(lambda canvas: canvas.draw_canvas())),
+        )
+    )
+
+    root.destroy()
+
+    print(f"{args.buttons} buttons, {args.canvases} canvases")
+    print()
+    print(f"{'redraw':<24} {'median':>10} {'p95':>10} {'total':>10}")
+    for name, times in results:
+        p95 = sorted(times)[int(len(times) * 0.95)]
+        print(
+            f"{name:<24} {statistics.median(times):>8.3f}ms "
+            f"{p95:>8.3f}ms {sum(times):>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,30 @@
 import tkinter as tk
+from collections import deque
 from pathlib import Path
-from tkinter import ttk
-
-from platformdirs import user_config_path
+from tkinter import messagebox, ttk
 
 from helvox.ui.auto_resize_text import AutoResizingText
 from helvox.ui.button import RoundedButton
+from helvox.ui.review import ReviewDialog
 from helvox.ui.rounded_canvas import RoundedCanvas
+from helvox.ui.search import SearchDialog
 from helvox.ui.settings import SettingsDialog
-from helvox.utils.platform import app_font, default_recordings_dir
+from helvox.utils.platform import app_font, default_recordings_dir, settings_file
+from helvox.utils.reconcile import (
+    format_report,
+    has_issues,
+    reconcile_output_folder,
+    reconcile_speaker,
+    repair_speaker,
+)
 from helvox.utils.recorder import Recorder
+from helvox.utils.tracing import span
+
+# Refresh interval of the playhead while previewing
+PLAYHEAD_INTERVAL_MS = 30
+
+# Poll interval while a take is being processed on the worker thread
+FINALIZE_POLL_MS = 20
 
 
 class App:
@@ -20,16 +35,31 @@ class App:
             output_folder=default_recordings_dir(), sample_rate=48000, channels=1
         )
 
-        self.settings_path = (
-            user_config_path(appname="helvox", appauthor="noxenum") / "config.ini"
-        )
+        # Canvas items of the live waveform, oldest first
+        self.live_items = deque()
+        self.live_x = 0
+
+        # Whether the hands-free endpointer was in a take at the last poll
+        self.hands_free_recording = False
+
+        # Which preview is playing and the pending playhead refresh
+        self.preview_trimmed = False
+        self.playhead_job = None
+
+        self.settings_path = settings_file()
 
         self.setup_window()
         self.setup_ui()
 
+        # Load the saved settings once, the dialog edits the recorder's copy
+        self.recorder.load_settings(self.settings_path)
+
         # Show settings dialog on startup
         self.show_settings()
 
+        # Check that manifests and audio folders are in sync
+        self.check_session()
+
     def setup_window(self) -> None:
         self.root.title("Helvox")
         self.root.geometry("800x600")
@@ -46,6 +76,9 @@ class App:
         # Bind configure event
         self.root.bind("<Configure>", self.configure_handler)
 
+        # Release resources (e.g. leased prompts) when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
     def setup_ui(self) -> None:
         # Main frame
         main_frame = ttk.Frame(self.root, padding="10")
@@ -75,6 +108,33 @@ class App:
         )
         settings_btn.grid(row=0, column=0, padx=5, sticky="e")
 
+        review_btn = RoundedButton(
+            settings_frame,
+            text="Review",
+            command=self.show_review,
+            bg_color="#E6E6E6",
+            fg_color="#363636",
+            width=120,
+            height=40,
+            corner_radius=20,
+            dot=False,
+        )
+        review_btn.grid(row=0, column=1, padx=5, sticky="e")
+
+        search_btn = RoundedButton(
+            settings_frame,
+            text="Search",
+            command=self.show_search,
+            bg_color="#E6E6E6",
+            fg_color="#363636",
+            width=120,
+            height=40,
+            corner_radius=20,
+            dot=False,
+        )
+        search_btn.grid(row=0, column=2, padx=5, sticky="e")
+        self.root.bind("<Control-f>", lambda e: self.show_search())
+
         # Text frame
         text_frame = ttk.LabelFrame(main_frame, text="Text", padding="5")
         text_frame.grid(row=1, column=0, sticky="we", pady=5, padx=5)
@@ -180,7 +240,7 @@ class App:
         self.play_btn_full = RoundedButton(
             recording_frame,
             text="Preview",
-            command=self.recorder.play_audio_data_full_audio,
+            command=self.toggle_preview_full,
             bg_color="#10A560",
             fg_color="#FFFFFF",
             width=120,
@@ -202,7 +262,7 @@ class App:
         self.play_btn_trimmed = RoundedButton(
             recording_frame,
             text="Preview",
-            command=self.recorder.play_audio_data_trimmed_audio,
+            command=self.toggle_preview_trimmed,
             bg_color="#10A560",
             fg_color="#FFFFFF",
             width=120,
@@ -211,6 +271,14 @@ class App:
         )
         self.play_btn_trimmed.grid(row=2, column=3, padx=5)
 
+        # Click on a waveform to play from that point
+        self.waveform_canvas_full.bind(
+            "<Button-1>", lambda e: self.seek_preview(e, trimmed=False)
+        )
+        self.waveform_canvas_trimmed.bind(
+            "<Button-1>", lambda e: self.seek_preview(e, trimmed=True)
+        )
+
         self.duration_text_trimmed = tk.StringVar(
             value="Trimmed | Duration: 0.0 seconds"
         )
@@ -280,7 +348,6 @@ class App:
         settings_btn.grid(row=0, column=2, padx=5, sticky="e")
 
     def show_settings(self) -> None:
-        self.recorder.load_settings(self.settings_path)
         dialog = SettingsDialog(self.root, self.recorder)
         result = dialog.show()
 
@@ -291,6 +358,22 @@ class App:
             self.recorder.speaker_id = result["speaker_id"]
             self.recorder.speaker_dialect = result["speaker_dialect"]
             self.recorder.input_file = result["input_file"]
+            self.recorder.dtype = result["sample_format"]
+            self.recorder.vad_backend = result["vad_backend"]
+            self.recorder.coordinator_file = result["coordinator_file"]
+            self.recorder.station_id = result["station_id"]
+            self.recorder.encoding_profile = result["encoding_profile"]
+            self.recorder.hands_free = result["hands_free"]
+            self.recorder.trailing_silence_s = result["trailing_silence_s"]
+            self.recorder.auto_save = result["auto_save"]
+            self.recorder.prompt_order = result["prompt_order"]
+            self.recorder.prompt_seed = result["prompt_seed"]
+            self.recorder.audio_layout = result["audio_layout"]
+            self.recorder.sample_rate = result["sample_rate"]
+            self.recorder.native_rate = result["native_rate"]
+            self.recorder.post_save_hooks = result["post_save_hooks"]
+            self.recorder.hook_workers = result["hook_workers"]
+            self.recorder.hook_copy_folder = result["hook_copy_folder"]
             self.recorder.output_file = (
                 Path(result["output_folder"]) / result["speaker_id"] / "output.json"
             )
@@ -299,13 +382,79 @@ class App:
             )
 
             self.recorder.save_settings(self.settings_path)
+            self.recorder.configure_coordinator()
+            self.recorder.configure_pipeline()
+            # Only re-reads the input, manifest or skip list if they changed
             self.recorder.load_data()
+            self.load_next_sample()
 
+        # On cancel the current prompt and its take stay as they were
         self.start_monitoring()
-        self.load_next_sample()
 
         self.update_duration()
 
+    def show_review(self) -> None:
+        if self.recorder.recording:
+            return
+
+        dialog = ReviewDialog(self.root, self.recorder)
+        dialog.show()
+
+    def show_search(self) -> None:
+        if self.recorder.recording:
+            return
+
+        dialog = SearchDialog(self.root, self.recorder)
+        id = dialog.show()
+        if id is None or id == self.current_id:
+            return
+
+        if not self.recorder.jump_to(id, self.current_id):
+            messagebox.showinfo(
+                "Prompt In Use",
+                f"Prompt {id} is being recorded at another station.",
+                parent=self.root,
+            )
+            return
+
+        # An unsaved take belongs to the previous prompt
+        self.recorder.release_take()
+        self.clear_waveform_canvas()
+        self.load_sample(id)
+
+    def check_session(self) -> None:
+        reports = [
+            report
+            for report in reconcile_output_folder(self.recorder.output_folder)
+            if has_issues(report)
+        ]
+        if not reports:
+            return
+
+        summary = "\n".join(format_report(report) for report in reports)
+        repair = messagebox.askyesno(
+            "Session Check",
+            "The recordings and their manifests are out of sync:\n\n"
+            f"{summary}\n\n"
+            "Repair now? Orphaned files are moved to an 'orphaned' folder and "
+            "prompts with missing audio are reopened.",
+            parent=self.root,
+        )
+        if not repair:
+            return
+
+        # Conversions resumed by load_data would race the moves, let them
+        # finish and check again since their WAV files are FLAC files now
+        self.recorder.shutdown_transcoder()
+        for report in reports:
+            report = reconcile_speaker(report["speaker_dir"])
+            if has_issues(report):
+                repair_speaker(report)
+
+        self.recorder.load_data()
+        self.load_next_sample()
+        self.update_duration()
+
     def update_duration(self) -> None:
         total_seconds = self.recorder.total_duration
         hours = int(total_seconds // 3600)
@@ -320,6 +469,12 @@ class App:
     def update_level_meter(self) -> None:
         level = self.recorder.get_current_level()
 
+        if self.recorder.hands_free:
+            self.poll_hands_free()
+
+        if self.recorder.recording or self.recorder.is_hands_free_recording():
+            self.update_live_waveform()
+
         # Update level text
         self.level_text.set(f"Level: {level:.1f} dB")
 
@@ -395,13 +550,115 @@ class App:
         if not self.recorder.recording:
             self.recorder.start_recording()
             self.clear_waveform_canvas()
+            self.live_items.clear()
+            self.live_x = 0
             self.record_btn.config(
                 text="Stop Recording", bg_color="#8B0000", dot=False
             )  # Dark red
         else:
-            self.recorder.stop_recording()
-            self.record_btn.config(text="REC", bg_color="#000000", dot=True)  # Black
-            self.update_waveform()
+            with span("ui.stop_recording"):
+                future = self.recorder.stop_recording_async()
+                self.record_btn.config(
+                    text="REC", bg_color="#000000", dot=True
+                )  # Black
+            self.wait_for_take(future)
+
+    def wait_for_take(self, future, on_done=None) -> None:
+        """Show the processing state until the take's future resolves."""
+        if future is None:
+            return
+
+        # A new take was started meanwhile, the old one is dropped
+        if self.recorder.recording:
+            self.waveform_canvas_full.delete("processing")
+            return
+
+        if not future.done():
+            if not self.waveform_canvas_full.find_withtag("processing"):
+                canvas = self.waveform_canvas_full
+                canvas.create_text(
+                    canvas.winfo_width() // 2,
+                    canvas.winfo_height() // 2,
+                    text="Processing...",
+                    fill="white",
+                    font=app_font(10),
+                    tags="processing",
+                )
+            self.root.after(FINALIZE_POLL_MS, self.wait_for_take, future, on_done)
+            return
+
+        self.waveform_canvas_full.delete("processing")
+        error = future.exception()
+        if error is not None:
+            print(f"Error processing take: {error}")
+            return
+
+        self.update_waveform()
+        if on_done is not None:
+            on_done()
+
+    def poll_hands_free(self) -> None:
+        recording = self.recorder.is_hands_free_recording()
+        if recording and not self.hands_free_recording:
+            # Speech onset: start drawing the new take
+            self.clear_waveform_canvas()
+            self.live_items.clear()
+            self.live_x = 0
+            self.record_btn.config(text="Listening", bg_color="#8B0000", dot=False)
+        self.hands_free_recording = recording
+
+        blocks = self.recorder.pop_hands_free_take()
+        if blocks is None:
+            return
+
+        with span("ui.hands_free_take"):
+            future = self.recorder.finish_take_async(blocks)
+            self.record_btn.config(text="REC", bg_color="#000000", dot=True)
+
+        on_done = None
+        if self.recorder.auto_save:
+            on_done = self.auto_save
+        self.wait_for_take(future, on_done)
+
+    def auto_save(self) -> None:
+        if self.current_id is not None:
+            self.save()
+
+    def update_live_waveform(self) -> None:
+        peaks = self.recorder.pop_live_peaks()
+        if not peaks:
+            return
+
+        canvas = self.waveform_canvas_full
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        center_y = height // 2
+        half_height = height / 2 - 4
+        step = 2
+
+        # Append one line per new column, existing items are never redrawn
+        for low, high in peaks:
+            top = center_y - int(min(1.0, high) * half_height)
+            bottom = center_y - int(max(-1.0, low) * half_height)
+            item = canvas.create_line(
+                self.live_x,
+                top,
+                self.live_x,
+                max(bottom, top + 1),
+                fill="orange red",
+                width=step,
+                tags="live",
+            )
+            self.live_items.append(item)
+            self.live_x += step
+
+        # Scroll left once the take is wider than the canvas
+        overflow = self.live_x - width
+        if overflow > 0:
+            canvas.move("live", -overflow, 0)
+            self.live_x = width
+            while len(self.live_items) > width // step + 1:
+                canvas.delete(self.live_items.popleft())
 
     def clear_waveform_canvas(self) -> None:
         self.waveform_canvas_full.delete("all")
@@ -411,10 +668,16 @@ class App:
         self.waveform_canvas_trimmed.draw_canvas()
 
     def load_next_sample(self) -> None:
-        self.current_id = self.recorder.get_next_id()
-        if self.current_id is None:
+        id = self.recorder.get_next_id()
+        if id is None:
+            self.current_id = None
             return
 
+        self.load_sample(id)
+
+    def load_sample(self, id: str) -> None:
+        self.current_id = id
+
         sample = self.recorder.get_sample_by_id(self.current_id)
         text_de = sample["de"]
 
@@ -490,6 +753,67 @@ class App:
                     joinstyle=tk.ROUND,
                 )
 
+    def toggle_preview_full(self) -> None:
+        self.toggle_preview(trimmed=False)
+
+    def toggle_preview_trimmed(self) -> None:
+        self.toggle_preview(trimmed=True)
+
+    def toggle_preview(self, trimmed: bool) -> None:
+        if self.recorder.check_playback() and self.preview_trimmed == trimmed:
+            self.recorder.stop_playback()
+            return
+        self.start_preview(trimmed)
+
+    def start_preview(self, trimmed: bool, fraction: float = 0.0) -> None:
+        if self.recorder.full_audio is None:
+            return
+
+        if trimmed:
+            self.recorder.play_audio_data_trimmed_audio()
+        else:
+            self.recorder.play_audio_data_full_audio()
+
+        if fraction > 0:
+            player = self.recorder.get_player()
+            self.recorder.seek_playback(fraction * player.get_duration())
+
+        self.preview_trimmed = trimmed
+        if self.playhead_job is None:
+            self.update_playhead()
+
+    def seek_preview(self, event, trimmed: bool) -> None:
+        width = event.widget.winfo_width()
+        if width <= 0:
+            return
+        fraction = min(max(event.x / width, 0.0), 1.0)
+
+        if self.recorder.check_playback() and self.preview_trimmed == trimmed:
+            player = self.recorder.get_player()
+            self.recorder.seek_playback(fraction * player.get_duration())
+        else:
+            self.start_preview(trimmed, fraction)
+
+    def update_playhead(self) -> None:
+        for canvas in (self.waveform_canvas_full, self.waveform_canvas_trimmed):
+            canvas.delete("playhead")
+
+        if not self.recorder.check_playback():
+            self.playhead_job = None
+            return
+
+        canvas = (
+            self.waveform_canvas_trimmed
+            if self.preview_trimmed
+            else self.waveform_canvas_full
+        )
+        x = int(self.recorder.get_playback_position() * canvas.winfo_width())
+        canvas.create_line(
+            x, 0, x, canvas.winfo_height(), fill="white", width=2, tags="playhead"
+        )
+
+        self.playhead_job = self.root.after(PLAYHEAD_INTERVAL_MS, self.update_playhead)
+
     def configure_handler(self, event):
         self.update_waveform()
 
@@ -497,32 +821,36 @@ class App:
         if self.recorder.trimmed_audio is None:
             return
 
-        duration_s = self.recorder.save_audio(self.current_id)
-        self.recorder.add_sample(
-            id=self.current_id,
-            text_de=self.de_text_var.get(),
-            text_ch=self.ch_text_edit_var.get(),
-            dialect=self.recorder.speaker_dialect,
-            audio_path=f"{self.current_id}.flac",
-            duration_s=duration_s,
-        )
+        with span("ui.save"):
+            self.recorder.save_take(
+                self.current_id,
+                text_de=self.de_text_var.get(),
+                text_ch=self.ch_text_edit_var.get(),
+            )
 
-        self.recorder.audio_data = []
-        self.recorder.full_audio = None
-        self.recorder.trimmed_audio = None
+            self.recorder.release_take()
+            self.recorder.arm_hands_free()
 
-        self.clear_waveform_canvas()
+            self.clear_waveform_canvas()
 
-        self.update_duration()
-        self.load_next_sample()
+            self.update_duration()
+            with span("ui.load_next_sample"):
+                self.load_next_sample()
 
     def skip(self):
         self.recorder.add_skip(self.current_id)
+        self.recorder.arm_hands_free()
         self.load_next_sample()
 
     def on_closing(self) -> None:
         self.recorder.stop_monitoring()
         if self.recorder.recording:
             self.recorder.stop_recording()
-        self.root.destroy()
+        self.recorder.release_leases()
+        self.recorder.close_player()
+        self.recorder.shutdown_finalizer()
+        # Let pending FLAC conversions finish before exiting
+        self.recorder.shutdown_transcoder()
+        # Post-save jobs may take long, unfinished ones resume next start
+        self.recorder.shutdown_pipeline()
         self.root.destroy()
@@ -1,13 +1,345 @@
-import tkinter as tk
+import argparse
+import configparser
+import json
+import multiprocessing
+import sys
+from pathlib import Path
 
-from helvox.app import App
+from helvox.utils.layout import AUDIO_LAYOUTS, migrate_speaker
 
 
-def main():
+def run_gui() -> None:
+    import tkinter as tk
+
+    from helvox.app import App
+    from helvox.ui.profiler import UIProfiler
+
     root = tk.Tk()
+
+    # Opt-in event loop profiling (HELVOX_UI_PROFILE=<report.json>)
+    profiler = UIProfiler.from_env(root)
+
     _ = App(root)
     root.mainloop()
 
+    if profiler is not None:
+        profiler.dump()
+
+
+def migrate_layout(args: argparse.Namespace) -> int:
+    from helvox.utils.reconcile import find_speaker_dirs
+
+    output_folder = Path(args.output_folder)
+    if args.speaker:
+        speaker_dirs = [output_folder / speaker for speaker in args.speaker]
+    else:
+        speaker_dirs = find_speaker_dirs(output_folder)
+
+    if not speaker_dirs:
+        print(f"No speaker folders found in {output_folder}")
+        return 1
+
+    for speaker_dir in speaker_dirs:
+        try:
+            moved = migrate_speaker(speaker_dir, args.layout, args.workers)
+        except Exception as e:
+            print(f"Error migrating {speaker_dir.name}: {e}")
+            return 1
+        print(f"{speaker_dir.name}: moved {moved} files")
+
+    return 0
+
+
+def report(args: argparse.Namespace) -> int:
+    from helvox.utils.report import CACHE_FILENAME, build_report, format_corpus_report
+
+    output_folder = Path(args.output_folder)
+    cache_path = None if args.no_cache else output_folder / CACHE_FILENAME
+
+    try:
+        result = build_report(output_folder, args.input, cache_path, args.workers)
+    except Exception as e:
+        print(f"Error building report: {e}")
+        return 1
+
+    if args.json:
+        with open(args.json, mode="w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=4)
+
+    print(format_corpus_report(result))
+    print(f"\n({result['speakers_read']} of {len(result['speakers'])} speakers read)")
+    return 0
+
+
+def load_saved_settings() -> dict:
+    """Settings saved by the GUI, used as defaults for the commands."""
+    from helvox.utils.platform import settings_file
+
+    config = configparser.ConfigParser()
+    config.read(settings_file())
+    return dict(config["Settings"]) if config.has_section("Settings") else {}
+
+
+def import_audio(args: argparse.Namespace) -> int:
+    from helvox.utils.data import read_dataset
+    from helvox.utils.importer import ImportSettings, import_folder
+    from helvox.utils.prompts import PromptStore, prompt_columns
+
+    saved = load_saved_settings()
+    output_folder = args.output_folder or saved.get("output_folder")
+    speaker_id = args.speaker or saved.get("speaker_id")
+    dialect = args.dialect or saved.get("speaker_dialect", "AG")
+    input_file = args.input or saved.get("input_file")
+    if not (output_folder and speaker_id and input_file):
+        print("Output folder, speaker and input file are required")
+        return 1
+
+    prompts = PromptStore.from_samples(
+        read_dataset(Path(input_file), dialect_filter=dialect.lower()),
+        prompt_columns(dialect),
+    )
+    settings = ImportSettings(
+        sample_rate=int(saved.get("sample_rate", 48000)),
+        vad_backend=saved.get("vad_backend", "webrtc"),
+        encoding_profile=saved.get("encoding_profile", "flac"),
+        audio_layout=saved.get("audio_layout", "flat"),
+    )
+
+    def progress(done: int, total: int) -> None:
+        if done % 50 == 0 or done == total:
+            print(f"{done}/{total} files processed", flush=True)
+
+    result = import_folder(
+        args.folder,
+        Path(output_folder) / speaker_id,
+        prompts,
+        dialect,
+        settings,
+        max_workers=args.workers,
+        batch_size=args.batch_size,
+        overwrite=args.overwrite,
+        progress=progress,
+    )
+
+    print(
+        f"{len(result['imported'])} imported, "
+        f"{len(result['skipped'])} already recorded, "
+        f"{len(result['unmatched'])} without a matching prompt, "
+        f"{len(result['failed'])} failed"
+    )
+    for path in result["unmatched"][:20]:
+        print(f"  no prompt: {path}")
+    return 1 if result["failed"] else 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    import asyncio
+    import secrets
+
+    from helvox.utils.control import ControlServer
+    from helvox.utils.control import serve as serve_session
+    from helvox.utils.platform import default_recordings_dir, settings_file
+    from helvox.utils.recorder import Recorder
+    from helvox.utils.session import HeadlessSession
+
+    # Requests must name the bound address, which a wildcard bind has not
+    if args.host in ("", "0.0.0.0", "::"):
+        print("Give --host the address clients connect to, not a wildcard")
+        return 1
+
+    recorder = Recorder(output_folder=default_recordings_dir())
+    recorder.load_settings(settings_file())
+    recorder.refresh_audio_devices()
+    if recorder.selected_device not in recorder.device_map:
+        print(f"Input device not found: {recorder.selected_device or '(none)'}")
+        return 1
+
+    token = args.token or secrets.token_urlsafe(24)
+    session = HeadlessSession(recorder)
+    server = ControlServer(
+        session, token, args.host, args.port, allow_origin=args.allow_origin
+    )
+    print(f"Control server listening on http://{args.host}:{args.port}")
+    if not args.token:
+        print(f"Send requests with the header 'Authorization: Bearer {token}'")
+
+    try:
+        asyncio.run(serve_session(session, server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def jobs(args: argparse.Namespace) -> int:
+    from helvox.utils.hooks import (
+        FAILED,
+        JOBS_FILENAME,
+        HookPipeline,
+        JobStore,
+        get_post_save_hook,
+    )
+    from helvox.utils.platform import default_recordings_dir
+
+    saved = load_saved_settings()
+    output_folder = Path(
+        args.output_folder or saved.get("output_folder") or default_recordings_dir()
+    )
+    jobs_file = output_folder / JOBS_FILENAME
+    if not jobs_file.exists():
+        print(f"No post-save jobs in {output_folder}")
+        return 0
+
+    store = JobStore(jobs_file)
+    if args.retry_failed:
+        print(f"{store.retry_failed(args.hook)} failed jobs queued again")
+
+    if args.run:
+        hooks = {}
+        for name in args.hook or store.counts():
+            try:
+                hooks[name] = get_post_save_hook(
+                    name,
+                    copy_folder=args.copy_folder or saved.get("hook_copy_folder", ""),
+                )
+            except ValueError as e:
+                print(e)
+
+        workers = args.workers or int(saved.get("hook_workers", 2))
+        pipeline = HookPipeline(store, hooks, max_workers=workers)
+        pipeline.start()
+        try:
+            pipeline.wait_idle()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pipeline.shutdown()
+        store = JobStore(jobs_file)
+
+    counts = store.counts()
+    failures = store.failures()
+    store.close()
+
+    states = ("pending", "running", "done", FAILED)
+    print(f"{'hook':<16}" + "".join(f"{state:>10}" for state in states))
+    for hook, hook_counts in sorted(counts.items()):
+        print(
+            f"{hook:<16}"
+            + "".join(f"{hook_counts.get(state, 0):>10}" for state in states)
+        )
+    for hook, take, error in failures:
+        print(f"  {hook} {take}: {error}")
+
+    return 1 if failures else 0
+
+
+def main():
+    # Worker processes of frozen builds re-run main() to get here
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(
+        prog="helvox", description="Record Swiss German speech samples."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    migrate_parser = subparsers.add_parser(
+        "migrate-layout",
+        help="move the recordings of an output folder to another audio layout",
+    )
+    migrate_parser.add_argument("output_folder", help="Helvox output folder")
+    migrate_parser.add_argument("--layout", choices=AUDIO_LAYOUTS, default="sharded")
+    migrate_parser.add_argument(
+        "--speaker", action="append", help="only migrate this speaker (repeatable)"
+    )
+    migrate_parser.add_argument(
+        "--workers", type=int, default=None, help="parallel file moves"
+    )
+    migrate_parser.set_defaults(handler=migrate_layout)
+
+    report_parser = subparsers.add_parser(
+        "report", help="hours, coverage and skip rates across all speakers"
+    )
+    report_parser.add_argument("output_folder", help="Helvox output folder")
+    report_parser.add_argument("--input", help="input corpus to compute coverage")
+    report_parser.add_argument("--json", help="also write the full report here")
+    report_parser.add_argument(
+        "--workers", type=int, default=None, help="parallel manifest reads"
+    )
+    report_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="read every manifest instead of using the report cache",
+    )
+    report_parser.set_defaults(handler=report)
+
+    import_parser = subparsers.add_parser(
+        "import",
+        help="import audio files named by prompt id into a speaker folder",
+        description="Defaults are taken from the settings saved by the app.",
+    )
+    import_parser.add_argument("folder", help="folder with <prompt id>.wav files")
+    import_parser.add_argument("--speaker", help="speaker id")
+    import_parser.add_argument("--dialect", help="speaker dialect, e.g. AG")
+    import_parser.add_argument("--input", help="input corpus with the prompts")
+    import_parser.add_argument("--output-folder", help="Helvox output folder")
+    import_parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes"
+    )
+    import_parser.add_argument(
+        "--batch-size", type=int, default=100, help="takes per manifest write"
+    )
+    import_parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="re-import prompts the speaker already recorded",
+    )
+    import_parser.set_defaults(handler=import_audio)
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="record without the GUI, controlled over a local HTTP API",
+        description="Uses the settings saved by the app.",
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument(
+        "--token", help="bearer token to require, a random one is printed otherwise"
+    )
+    serve_parser.add_argument(
+        "--allow-origin",
+        help="origin of a browser UI allowed to call the API, e.g. "
+        "http://tablet.local:8080",
+    )
+    serve_parser.set_defaults(handler=serve)
+
+    jobs_parser = subparsers.add_parser(
+        "jobs",
+        help="show, retry or run the post-save processing jobs",
+        description="Best run while the app is closed. Defaults are taken "
+        "from the settings saved by the app.",
+    )
+    jobs_parser.add_argument("--output-folder", help="Helvox output folder")
+    jobs_parser.add_argument(
+        "--hook", action="append", help="only this hook (repeatable)"
+    )
+    jobs_parser.add_argument(
+        "--retry-failed", action="store_true", help="queue failed jobs again"
+    )
+    jobs_parser.add_argument(
+        "--run", action="store_true", help="run the queued jobs and wait for them"
+    )
+    jobs_parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes"
+    )
+    jobs_parser.add_argument("--copy-folder", help="destination of the copy hook")
+    jobs_parser.set_defaults(handler=jobs)
+
+    args = parser.parse_args()
+    if args.command is None:
+        run_gui()
+        return
+
+    sys.exit(args.handler(args))
+
 
 if __name__ == "__main__":
     main()
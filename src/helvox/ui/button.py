@@ -1,5 +1,7 @@
 import tkinter as tk
 
+from helvox.ui.shapes import lighten, rounded_rect_points
+
 
 class RoundedButton(tk.Canvas):
     def __init__(
@@ -30,6 +32,13 @@ class RoundedButton(tk.Canvas):
         self.text = text
         self.dot = dot
 
+        # Items are created once, hover and updates only reconfigure them
+        self.hover = False
+        self.drawn_size = None
+        self.shape_item = None
+        self.dot_item = None
+        self.text_item = None
+
         # Draw the button
         self.draw_button()
 
@@ -39,88 +48,76 @@ class RoundedButton(tk.Canvas):
         self.bind("<Leave>", self._on_leave)
 
     def draw_button(self, hover=False):
+        """Create the button's items from scratch"""
         self.delete("all")
+        self.hover = hover
 
-        # Slightly lighter color on hover
-        current_bg = self._adjust_color(self.bg_color, 30) if hover else self.bg_color
-
-        # Draw rounded rectangle
         width = self.winfo_reqwidth()
         height = self.winfo_reqheight()
-        radius = self.corner_radius
-
-        # Create rounded rectangle using polygon
-        points = [
-            radius,
-            0,
-            width - radius,
-            0,
-            width,
-            0,
-            width,
-            radius,
-            width,
-            height - radius,
-            width,
-            height,
-            width - radius,
-            height,
-            radius,
-            height,
-            0,
-            height,
-            0,
-            height - radius,
-            0,
-            radius,
-            0,
-            0,
-        ]
-
-        self.create_polygon(points, fill=current_bg, smooth=True, outline=current_bg)
-
-        # Draw red dot
-        if self.dot:
-            dot_x = width // 2 - 20
-            dot_y = height // 2
-            self.create_oval(
-                dot_x - 5,
-                dot_y - 5,
-                dot_x + 5,
-                dot_y + 5,
-                fill="#8B0000",
-                outline="#8B0000",
-            )
-
-        # Draw text
-        text_x = width // 2 + 5 if self.dot else width // 2
-        self.create_text(
-            text_x,
-            height // 2,
+        self.drawn_size = (width, height)
+
+        # Rounded rectangle using a smoothed polygon
+        current_bg = self._current_bg()
+        self.shape_item = self.create_polygon(
+            rounded_rect_points(width, height, self.corner_radius),
+            fill=current_bg,
+            smooth=True,
+            outline=current_bg,
+        )
+
+        # Red dot, hidden instead of deleted when not shown
+        dot_x = width // 2 - 20
+        dot_y = height // 2
+        self.dot_item = self.create_oval(
+            dot_x - 5,
+            dot_y - 5,
+            dot_x + 5,
+            dot_y + 5,
+            fill="#8B0000",
+            outline="#8B0000",
+            state="normal" if self.dot else "hidden",
+        )
+
+        self.text_item = self.create_text(
+            *self._text_position(),
             text=self.text,
             fill=self.fg_color,
             font=("Arial", 10, "bold"),
         )
 
+    def _current_bg(self):
+        # Slightly lighter color on hover
+        return self._adjust_color(self.bg_color, 30) if self.hover else self.bg_color
+
+    def _text_position(self):
+        width, height = self.drawn_size
+        return (width // 2 + 5 if self.dot else width // 2, height // 2)
+
     def _adjust_color(self, color, amount):
         """Lighten a hex color by amount"""
-        color = color.lstrip("#")
-        rgb = tuple(int(color[i : i + 2], 16) for i in (0, 2, 4))
-        rgb = tuple(min(255, c + amount) for c in rgb)
-        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+        return lighten(color, amount)
 
     def _on_click(self, event):
         if self.command:
             self.command()
 
     def _on_enter(self, event):
-        self.draw_button(hover=True)
+        self.set_hover(True)
 
     def _on_leave(self, event):
-        self.draw_button(hover=False)
+        self.set_hover(False)
+
+    def set_hover(self, hover):
+        """Swap the fill of the existing shape"""
+        if hover == self.hover:
+            return
+
+        self.hover = hover
+        current_bg = self._current_bg()
+        self.itemconfigure(self.shape_item, fill=current_bg, outline=current_bg)
 
     def update_button(self, **kwargs):
-        """Update button properties and redraw"""
+        """Update button properties and the affected items"""
         if "text" in kwargs:
             self.text = kwargs["text"]
         if "bg_color" in kwargs:
@@ -130,8 +127,16 @@ class RoundedButton(tk.Canvas):
         if "dot" in kwargs:
             self.dot = kwargs["dot"]
 
-        # Redraw the button with new settings
-        self.draw_button()
+        # A new size needs new geometry
+        if (self.winfo_reqwidth(), self.winfo_reqheight()) != self.drawn_size:
+            self.draw_button(self.hover)
+            return
+
+        current_bg = self._current_bg()
+        self.itemconfigure(self.shape_item, fill=current_bg, outline=current_bg)
+        self.itemconfigure(self.dot_item, state="normal" if self.dot else "hidden")
+        self.itemconfigure(self.text_item, text=self.text, fill=self.fg_color)
+        self.coords(self.text_item, *self._text_position())
 
     config = update_button
     configure = update_button
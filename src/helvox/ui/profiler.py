@@ -0,0 +1,188 @@
+import json
+import os
+import time
+import tkinter as tk
+from pathlib import Path
+from typing import Optional, Union
+
+from helvox.ui.button import RoundedButton
+
+# Upper bounds (ms) of the duration histogram buckets, the last one is open
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+
+def callback_name(func) -> str:
+    # Clicks on a RoundedButton all go through its _on_click handler, report
+    # the command behind it instead
+    owner = getattr(func, "__self__", None)
+    if isinstance(owner, RoundedButton) and func.__name__ == "_on_click":
+        func = owner.command or func
+
+    return getattr(func, "__qualname__", None) or type(func).__name__
+
+
+class UIProfiler:
+    """
+    Opt-in instrumentation of the Tk event loop.
+
+    Times every Python callback Tk runs (after() callbacks, bindings and
+    widget commands) and keeps a duration histogram per handler. A heartbeat
+    scheduled with after() detects main loop stalls above the threshold,
+    including ones not caused by a Python handler (e.g. geometry or redraw).
+    """
+
+    def __init__(
+        self,
+        root: tk.Tk,
+        output_path: Union[str, Path],
+        stall_threshold_ms: float = 100.0,
+        heartbeat_ms: int = 50,
+    ) -> None:
+        self.root = root
+        self.output_path = Path(output_path)
+        self.stall_threshold_ms = stall_threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+
+        self.handlers = {}
+        self.stalls = []
+        self.last_handler = None
+        self.started_at = time.perf_counter()
+
+        self.original_call = None
+        self.original_after = None
+        self.heartbeat_due = None
+
+    @classmethod
+    def from_env(cls, root: tk.Tk) -> Optional["UIProfiler"]:
+        """Create and install a profiler if HELVOX_UI_PROFILE names a file."""
+        output_path = os.environ.get("HELVOX_UI_PROFILE")
+        if not output_path:
+            return None
+
+        threshold = float(os.environ.get("HELVOX_UI_STALL_MS", "100"))
+        profiler = cls(root, output_path, stall_threshold_ms=threshold)
+        profiler.install()
+        return profiler
+
+    def install(self) -> None:
+        profiler = self
+        original_call = tk.CallWrapper.__call__
+        original_after = tk.Misc.after
+
+        def profiled_call(wrapper, *args):
+            # after() callbacks are timed by profiled_after under their own name
+            qualname = getattr(wrapper.func, "__qualname__", "")
+            if qualname.endswith("after.<locals>.callit"):
+                return original_call(wrapper, *args)
+
+            start = time.perf_counter()
+            try:
+                return original_call(wrapper, *args)
+            finally:
+                profiler.record(callback_name(wrapper.func), start)
+
+        def profiled_after(widget, ms, func=None, *args):
+            if func is None:
+                return original_after(widget, ms)
+
+            name = callback_name(func)
+
+            def timed(*timed_args):
+                start = time.perf_counter()
+                try:
+                    return func(*timed_args)
+                finally:
+                    profiler.record(name, start)
+
+            timed.__name__ = getattr(func, "__name__", name)
+            return original_after(widget, ms, timed, *args)
+
+        self.original_call = original_call
+        self.original_after = original_after
+        tk.CallWrapper.__call__ = profiled_call
+        tk.Misc.after = profiled_after
+
+        self.started_at = time.perf_counter()
+        self.schedule_heartbeat()
+
+    def uninstall(self) -> None:
+        if self.original_call is not None:
+            tk.CallWrapper.__call__ = self.original_call
+            tk.Misc.after = self.original_after
+            self.original_call = None
+            self.original_after = None
+
+    def schedule_heartbeat(self) -> None:
+        self.heartbeat_due = time.perf_counter() + self.heartbeat_ms / 1000
+        self.original_after(self.root, self.heartbeat_ms, self.heartbeat)
+
+    def heartbeat(self) -> None:
+        lateness_ms = (time.perf_counter() - self.heartbeat_due) * 1000
+        if lateness_ms > self.stall_threshold_ms:
+            self.stalls.append(
+                {
+                    "at_s": round(self.heartbeat_due - self.started_at, 3),
+                    "duration_ms": round(lateness_ms, 2),
+                    "last_handler": self.last_handler,
+                }
+            )
+
+        if self.original_call is not None:
+            self.schedule_heartbeat()
+
+    def record(self, name: str, start: float) -> None:
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = {
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "histogram": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+            }
+            self.handlers[name] = stats
+
+        stats["count"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+        bucket = len(HISTOGRAM_BUCKETS_MS)
+        for i, upper in enumerate(HISTOGRAM_BUCKETS_MS):
+            if duration_ms <= upper:
+                bucket = i
+                break
+        stats["histogram"][bucket] += 1
+
+        self.last_handler = name
+
+    def report(self) -> dict:
+        labels = [f"<={upper}ms" for upper in HISTOGRAM_BUCKETS_MS] + [
+            f">{HISTOGRAM_BUCKETS_MS[-1]}ms"
+        ]
+
+        handlers = {}
+        for name, stats in sorted(
+            self.handlers.items(), key=lambda item: item[1]["total_ms"], reverse=True
+        ):
+            handlers[name] = {
+                "count": stats["count"],
+                "total_ms": round(stats["total_ms"], 2),
+                "mean_ms": round(stats["total_ms"] / stats["count"], 3),
+                "max_ms": round(stats["max_ms"], 2),
+                "histogram": dict(zip(labels, stats["histogram"])),
+            }
+
+        return {
+            "session_s": round(time.perf_counter() - self.started_at, 3),
+            "stall_threshold_ms": self.stall_threshold_ms,
+            "handlers": handlers,
+            "stalls": self.stalls,
+        }
+
+    def dump(self) -> None:
+        if not self.output_path.parent.exists():
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.output_path, mode="w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=4)
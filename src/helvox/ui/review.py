@@ -0,0 +1,202 @@
+import tkinter as tk
+from pathlib import Path
+from tkinter import messagebox, ttk
+
+from helvox.ui.rounded_canvas import RoundedCanvas
+from helvox.utils.peaks import load_peaks
+from helvox.utils.playback import StreamingFilePlayer
+from helvox.utils.recorder import Recorder
+
+# Rows inserted per event loop iteration while filling the list
+INSERT_CHUNK_SIZE = 500
+
+
+class ReviewDialog:
+    """Browse and play back the samples already recorded for the speaker."""
+
+    def __init__(self, parent: tk.Tk, recorder: Recorder) -> None:
+        self.recorder = recorder
+        self.player = StreamingFilePlayer()
+        self.samples = list(recorder.output_data)
+        self.peaks = None
+
+        # Create modal dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Review - {recorder.speaker_id}")
+        self.dialog.geometry("800x550")
+
+        # Make it modal
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        # Set app icon
+        icon_path = Path(__file__).parent.parent / "resources" / "icons" / "app.png"
+        if icon_path.exists():
+            icon = tk.PhotoImage(file=icon_path)
+            self.dialog.iconphoto(False, icon)
+
+        self.setup_ui()
+
+        # Handle window close button
+        self.dialog.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.dialog.bind("<Escape>", lambda e: self.on_close())
+        self.dialog.bind("<space>", lambda e: self.toggle_playback())
+
+        # Fill the list in chunks so the dialog shows up immediately
+        self.insert_rows(0)
+
+    def setup_ui(self) -> None:
+        main_frame = ttk.Frame(self.dialog, padding="10")
+        main_frame.grid(row=0, column=0, sticky="nsew")
+
+        self.dialog.rowconfigure(0, weight=1)
+        self.dialog.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+
+        # Sample list
+        list_frame = ttk.Frame(main_frame)
+        list_frame.grid(row=0, column=0, sticky="nsew")
+        list_frame.rowconfigure(0, weight=1)
+        list_frame.columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(
+            list_frame,
+            columns=("id", "text", "duration"),
+            show="headings",
+            selectmode="browse",
+        )
+        self.tree.heading("id", text="ID")
+        self.tree.heading("text", text="CH")
+        self.tree.heading("duration", text="Duration")
+        self.tree.column("id", width=140, stretch=False)
+        self.tree.column("text", width=480)
+        self.tree.column("duration", width=80, stretch=False, anchor="e")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+
+        scrollbar = ttk.Scrollbar(
+            list_frame, orient="vertical", command=self.tree.yview
+        )
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Double-1>", lambda e: self.play_selected())
+
+        # Waveform thumbnail
+        self.waveform_canvas = RoundedCanvas(
+            main_frame, height=60, bg="black", corner_radius=20
+        )
+        self.waveform_canvas.grid(row=1, column=0, sticky="we", pady=(10, 0))
+        self.waveform_canvas.bind("<Configure>", lambda e: self.draw_peaks(), add="+")
+
+        # Controls
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=2, column=0, pady=(10, 0))
+
+        ttk.Button(
+            button_frame, text="Play", command=self.play_selected, width=15
+        ).grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text="Stop", command=self.player.stop, width=15).grid(
+            row=0, column=1, padx=5
+        )
+        ttk.Button(button_frame, text="Close", command=self.on_close, width=15).grid(
+            row=0, column=2, padx=5
+        )
+
+    def insert_rows(self, start: int) -> None:
+        if not self.dialog.winfo_exists():
+            return
+
+        end = min(start + INSERT_CHUNK_SIZE, len(self.samples))
+        for index in range(start, end):
+            sample = self.samples[index]
+            self.tree.insert(
+                "",
+                "end",
+                iid=str(index),
+                values=(
+                    sample.get("id", ""),
+                    sample.get("ch", ""),
+                    f"{sample.get('duration_s', 0.0):.1f} s",
+                ),
+            )
+
+        if end < len(self.samples):
+            self.dialog.after(1, self.insert_rows, end)
+
+    def get_selected_sample(self) -> dict | None:
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return self.samples[int(selection[0])]
+
+    def on_select(self, event=None) -> None:
+        sample = self.get_selected_sample()
+        if sample is None:
+            return
+
+        audio_path = self.recorder.get_sample_audio_path(sample)
+        try:
+            self.peaks = load_peaks(
+                audio_path,
+                self.recorder.get_peaks_folder(),
+                audio_dir=self.recorder.get_speaker_folder() / "audio",
+            )
+        except Exception as e:
+            print(f"Error loading peaks for {audio_path}: {e}")
+            self.peaks = None
+
+        self.draw_peaks()
+
+    def draw_peaks(self) -> None:
+        self.waveform_canvas.delete("all")
+        self.waveform_canvas.draw_canvas()
+
+        if self.peaks is None or len(self.peaks) == 0:
+            return
+
+        width = self.waveform_canvas.winfo_width()
+        height = self.waveform_canvas.winfo_height()
+        center_y = height // 2
+
+        # Normalize to the loudest peak of the file
+        scale = float(abs(self.peaks).max()) or 1.0
+
+        for i, (low, high) in enumerate(self.peaks):
+            x = int((i + 0.5) / len(self.peaks) * width)
+            top = center_y - int(high / scale * (height / 2 - 4))
+            bottom = center_y - int(low / scale * (height / 2 - 4))
+            if top != bottom:
+                self.waveform_canvas.create_line(
+                    x, top, x, bottom, fill="orange red", width=2
+                )
+
+    def play_selected(self) -> None:
+        sample = self.get_selected_sample()
+        if sample is None:
+            return
+
+        audio_path = self.recorder.get_sample_audio_path(sample)
+        try:
+            self.player.play(audio_path)
+        except Exception as e:
+            messagebox.showwarning(
+                "Playback Failed",
+                f"Could not play {audio_path.name}:\n{e}",
+                parent=self.dialog,
+            )
+
+    def toggle_playback(self) -> None:
+        if self.player.active:
+            self.player.stop()
+        else:
+            self.play_selected()
+
+    def on_close(self) -> None:
+        self.player.stop()
+        self.dialog.destroy()
+
+    def show(self) -> None:
+        """Show dialog and wait until it is closed."""
+        self.dialog.wait_window()
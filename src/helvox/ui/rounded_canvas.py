@@ -1,5 +1,7 @@
 import tkinter as tk
 
+from helvox.ui.shapes import rounded_rect_points
+
 
 class RoundedCanvas(tk.Canvas):
     def __init__(
@@ -19,46 +21,27 @@ class RoundedCanvas(tk.Canvas):
         self.bg = bg
         self.corner_radius = corner_radius
 
+        # The background polygon is kept and reshaped on resize
+        self.bg_item = None
+        self.drawn_size = None
+
         # Bind to Configure event to redraw when size changes
         self.bind("<Configure>", lambda e: self.draw_canvas())
 
     def draw_canvas(self):
-        # Clear previous drawings
-        self.delete("rounded_bg")
-
         # Get actual canvas dimensions
         width = self.winfo_width()
         height = self.winfo_height()
-        radius = self.corner_radius
-
-        # Create rounded rectangle using polygon
-        points = [
-            radius,
-            0,
-            width - radius,
-            0,
-            width,
-            0,
-            width,
-            radius,
-            width,
-            height - radius,
-            width,
-            height,
-            width - radius,
-            height,
-            radius,
-            height,
-            0,
-            height,
-            0,
-            height - radius,
-            0,
-            radius,
-            0,
-            0,
-        ]
-
-        self.create_polygon(
-            points, fill=self.bg, smooth=True, outline=self.bg, tags="rounded_bg"
-        )
+        points = rounded_rect_points(width, height, self.corner_radius)
+
+        # Recreate it if it was deleted (e.g. with delete("all"))
+        if self.bg_item is None or not self.find_withtag(self.bg_item):
+            self.bg_item = self.create_polygon(
+                points, fill=self.bg, smooth=True, outline=self.bg, tags="rounded_bg"
+            )
+            # Stay below whatever is drawn on the canvas
+            self.tag_lower(self.bg_item)
+        elif (width, height) != self.drawn_size:
+            self.coords(self.bg_item, points)
+
+        self.drawn_size = (width, height)
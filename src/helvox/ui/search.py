@@ -0,0 +1,186 @@
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+
+from helvox.utils.platform import app_font
+from helvox.utils.recorder import Recorder
+
+# Wait this long after the last key press before searching
+SEARCH_DELAY_MS = 150
+
+# Poll interval while the index is still being built
+INDEX_POLL_MS = 200
+
+MAX_RESULTS = 200
+
+
+class SearchDialog:
+    """Find a prompt by id or text and pick it as the next one to record."""
+
+    def __init__(self, parent: tk.Tk, recorder: Recorder) -> None:
+        self.recorder = recorder
+        self.result = None
+        self.search_job = None
+
+        # Create modal dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Search Prompts")
+        self.dialog.geometry("800x500")
+
+        # Make it modal
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        # Set app icon
+        icon_path = Path(__file__).parent.parent / "resources" / "icons" / "app.png"
+        if icon_path.exists():
+            icon = tk.PhotoImage(file=icon_path)
+            self.dialog.iconphoto(False, icon)
+
+        self.setup_ui()
+
+        # Handle window close button
+        self.dialog.protocol("WM_DELETE_WINDOW", self.on_cancel)
+        self.dialog.bind("<Escape>", lambda e: self.on_cancel())
+        self.dialog.bind("<Return>", lambda e: self.on_ok())
+
+        self.query_entry.focus_set()
+        self.wait_for_index()
+
+    def setup_ui(self) -> None:
+        main_frame = ttk.Frame(self.dialog, padding="10")
+        main_frame.grid(row=0, column=0, sticky="nsew")
+
+        self.dialog.rowconfigure(0, weight=1)
+        self.dialog.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+
+        # Query
+        self.query_var = tk.StringVar()
+        self.query_entry = ttk.Entry(
+            main_frame, textvariable=self.query_var, font=app_font(11)
+        )
+        self.query_entry.grid(row=0, column=0, sticky="ew")
+        self.query_var.trace_add("write", lambda *args: self.schedule_search())
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.status_var).grid(
+            row=1, column=0, sticky="w", pady=(5, 5)
+        )
+
+        # Results
+        list_frame = ttk.Frame(main_frame)
+        list_frame.grid(row=2, column=0, sticky="nsew")
+        list_frame.rowconfigure(0, weight=1)
+        list_frame.columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(
+            list_frame,
+            columns=("id", "de", "ch", "status"),
+            show="headings",
+            selectmode="browse",
+        )
+        self.tree.heading("id", text="ID")
+        self.tree.heading("de", text="DE")
+        self.tree.heading("ch", text="CH")
+        self.tree.heading("status", text="Status")
+        self.tree.column("id", width=120, stretch=False)
+        self.tree.column("de", width=260)
+        self.tree.column("ch", width=260)
+        self.tree.column("status", width=80, stretch=False)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+
+        scrollbar = ttk.Scrollbar(
+            list_frame, orient="vertical", command=self.tree.yview
+        )
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.tree.bind("<Double-1>", lambda e: self.on_ok())
+
+        # Controls
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=3, column=0, pady=(10, 0))
+
+        ttk.Button(button_frame, text="Cancel", command=self.on_cancel, width=15).grid(
+            row=0, column=0, padx=5
+        )
+        ttk.Button(button_frame, text="Record", command=self.on_ok, width=15).grid(
+            row=0, column=1, padx=5
+        )
+
+    def wait_for_index(self) -> None:
+        if not self.dialog.winfo_exists():
+            return
+
+        if self.recorder.get_search_index() is None:
+            self.status_var.set("Indexing prompts...")
+            self.dialog.after(INDEX_POLL_MS, self.wait_for_index)
+            return
+
+        self.status_var.set("")
+        self.search()
+
+    def schedule_search(self) -> None:
+        if self.search_job is not None:
+            self.dialog.after_cancel(self.search_job)
+        self.search_job = self.dialog.after(SEARCH_DELAY_MS, self.search)
+
+    def search(self) -> None:
+        self.search_job = None
+
+        index = self.recorder.get_search_index()
+        if index is None:
+            return
+
+        query = self.query_var.get()
+        ids = index.search(query, limit=MAX_RESULTS) if query.strip() else []
+
+        self.tree.delete(*self.tree.get_children())
+        for id in ids:
+            sample = self.recorder.get_sample_by_id(id)
+            self.tree.insert(
+                "",
+                "end",
+                iid=id,
+                values=(
+                    id,
+                    sample.get("de", ""),
+                    sample.get("ch") or self.recorder.get_prompt_text(id),
+                    self.get_status(id),
+                ),
+            )
+
+        if ids:
+            self.tree.selection_set(ids[0])
+
+        if query.strip():
+            more = "+" if len(ids) >= MAX_RESULTS else ""
+            self.status_var.set(f"{len(ids)}{more} matches")
+        else:
+            self.status_var.set(f"{len(index)} prompts indexed")
+
+    def get_status(self, id: str) -> str:
+        if id in self.recorder.output_index:
+            return "recorded"
+        if id in self.recorder.skipped_ids:
+            return "skipped"
+        return "open"
+
+    def on_ok(self) -> None:
+        selection = self.tree.selection()
+        if not selection:
+            return
+
+        self.result = selection[0]
+        self.dialog.destroy()
+
+    def on_cancel(self) -> None:
+        self.result = None
+        self.dialog.destroy()
+
+    def show(self) -> str | None:
+        """Show dialog and return the chosen prompt id."""
+        self.dialog.wait_window()
+        return self.result
@@ -2,8 +2,16 @@ import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
+from helvox.utils.encoding import ENCODING_PROFILES
+from helvox.utils.hooks import POST_SAVE_HOOKS, load_hook_plugins
+from helvox.utils.layout import AUDIO_LAYOUTS
 from helvox.utils.platform import app_font
 from helvox.utils.recorder import Recorder
+from helvox.utils.scheduler import SCHEDULERS
+from helvox.utils.vad import VAD_BACKENDS
+
+# Rates offered for the stored takes
+SAMPLE_RATES = ("16000", "22050", "32000", "44100", "48000")
 
 
 class SettingsDialog:
@@ -14,7 +22,7 @@ class SettingsDialog:
         # Create modal dialog
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Settings")
-        self.dialog.geometry("650x550")
+        self.dialog.geometry("650x680")
         self.dialog.resizable(False, False)
 
         # Make it modal
@@ -85,10 +93,12 @@ class SettingsDialog:
         tab_speaker = ttk.Frame(tab_control)
         tab_data = ttk.Frame(tab_control)
         tab_audio = ttk.Frame(tab_control)
+        tab_processing = ttk.Frame(tab_control)
 
         tab_control.add(tab_speaker, text="Speaker")
         tab_control.add(tab_data, text="Data")
         tab_control.add(tab_audio, text="Audio")
+        tab_control.add(tab_processing, text="Processing")
 
         tab_control.grid(row=0, column=0, sticky="ew")
 
@@ -207,6 +217,105 @@ class SettingsDialog:
         )
         info_label.grid(row=1, column=0, sticky="w", pady=(5, 0))
 
+        # Audio folder layout
+        layout_row = ttk.Frame(folder_frame)
+        layout_row.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+
+        ttk.Label(layout_row, text="Layout:").grid(
+            row=0, column=0, padx=(0, 5), sticky="w"
+        )
+        self.layout_var = tk.StringVar(value=self.recorder.audio_layout)
+        ttk.Combobox(
+            layout_row,
+            textvariable=self.layout_var,
+            values=AUDIO_LAYOUTS,
+            state="readonly",
+            width=10,
+            font=app_font(9),
+        ).grid(row=0, column=1, padx=(0, 10), sticky="w")
+        ttk.Label(
+            layout_row,
+            text="Sharded spreads takes over hashed subfolders (helvox migrate-layout)",
+            style="Info.TLabel",
+        ).grid(row=0, column=2, sticky="w")
+
+        # Coordination (optional)
+        coordinator_frame = ttk.LabelFrame(
+            tab_data, text="Multi-Station Coordination (optional)", padding="15"
+        )
+        coordinator_frame.grid(
+            row=2, column=0, sticky="ew", padx=(10, 10), pady=(10, 0)
+        )
+        coordinator_frame.columnconfigure(0, weight=1)
+
+        self.coordinator_var = tk.StringVar(value=self.recorder.coordinator_file)
+        coordinator_entry = ttk.Entry(
+            coordinator_frame, textvariable=self.coordinator_var, font=app_font(9)
+        )
+        coordinator_entry.grid(row=0, column=0, padx=(0, 10), sticky="ew")
+
+        browse_coordinator_btn = ttk.Button(
+            coordinator_frame,
+            text="Browse...",
+            command=self.select_coordinator_file,
+            width=12,
+        )
+        browse_coordinator_btn.grid(row=0, column=1, sticky="e")
+
+        ttk.Label(coordinator_frame, text="Station ID:", style="Title.TLabel").grid(
+            row=1, column=0, pady=(8, 0), sticky="w"
+        )
+        self.station_var = tk.StringVar(value=self.recorder.station_id)
+        ttk.Entry(
+            coordinator_frame, textvariable=self.station_var, font=app_font(9)
+        ).grid(row=2, column=0, padx=(0, 10), sticky="ew")
+
+        # Info label
+        info_label = ttk.Label(
+            coordinator_frame,
+            text="Shared file that hands out prompts so stations never record "
+            "the same one",
+            style="Info.TLabel",
+        )
+        info_label.grid(row=3, column=0, columnspan=2, sticky="w", pady=(5, 0))
+
+        # Prompt Order
+        order_frame = ttk.LabelFrame(tab_data, text="Prompt Order", padding="15")
+        order_frame.grid(row=3, column=0, sticky="ew", padx=(10, 10), pady=(10, 0))
+        order_frame.columnconfigure(0, weight=1)
+
+        self.order_var = tk.StringVar(value=self.recorder.prompt_order)
+        self.order_combo = ttk.Combobox(
+            order_frame,
+            textvariable=self.order_var,
+            state="readonly",
+            font=app_font(9),
+        )
+        self.order_combo["values"] = tuple(SCHEDULERS.keys())
+        self.order_combo.grid(row=0, column=0, padx=(0, 10), pady=5, sticky="ew")
+
+        ttk.Label(order_frame, text="Seed:", style="Title.TLabel").grid(
+            row=0, column=1, padx=(0, 5), pady=5, sticky="e"
+        )
+        self.seed_var = tk.IntVar(value=self.recorder.prompt_seed)
+        ttk.Spinbox(
+            order_frame,
+            textvariable=self.seed_var,
+            from_=0,
+            to=2**31 - 1,
+            width=8,
+            font=app_font(9),
+        ).grid(row=0, column=2, pady=5, sticky="e")
+
+        # Info label
+        info_label = ttk.Label(
+            order_frame,
+            text="coverage picks prompts with the most new letter sequences, "
+            "random is reproducible by seed",
+            style="Info.TLabel",
+        )
+        info_label.grid(row=1, column=0, columnspan=3, sticky="w", pady=(5, 0))
+
         # Audio Device Selection
         device_frame = ttk.LabelFrame(
             tab_audio, text="Audio Input Device", padding="15"
@@ -244,6 +353,194 @@ class SettingsDialog:
         # Populate devices
         self.refresh_devices()
 
+        # Sample Format Selection
+        format_frame = ttk.LabelFrame(tab_audio, text="Sample Format", padding="15")
+        format_frame.grid(row=3, column=0, sticky="ew", padx=(10, 10), pady=(10, 0))
+        format_frame.columnconfigure(0, weight=1)
+
+        self.format_var = tk.StringVar(value=self.recorder.dtype)
+        self.format_combo = ttk.Combobox(
+            format_frame,
+            textvariable=self.format_var,
+            state="readonly",
+            font=app_font(9),
+        )
+        self.format_combo["values"] = ("float32", "int16")
+        self.format_combo.grid(row=0, column=0, padx=(0, 10), pady=5, sticky="ew")
+
+        # Info label
+        info_label = ttk.Label(
+            format_frame,
+            text="int16 captures native 16-bit PCM and uses half the memory per take",
+            style="Info.TLabel",
+        )
+        info_label.grid(row=1, column=0, sticky="w", pady=(5, 0))
+
+        # Sample rate of the stored takes
+        rate_row = ttk.Frame(format_frame)
+        rate_row.grid(row=2, column=0, sticky="ew", pady=(8, 0))
+
+        ttk.Label(rate_row, text="Sample rate:").grid(
+            row=0, column=0, padx=(0, 5), sticky="w"
+        )
+        self.rate_var = tk.StringVar(value=str(self.recorder.sample_rate))
+        ttk.Combobox(
+            rate_row,
+            textvariable=self.rate_var,
+            values=SAMPLE_RATES,
+            state="readonly",
+            width=8,
+            font=app_font(9),
+        ).grid(row=0, column=1, padx=(0, 10), sticky="w")
+
+        self.native_rate_var = tk.BooleanVar(value=self.recorder.native_rate)
+        ttk.Checkbutton(
+            rate_row,
+            text="Capture at the device's native rate and resample",
+            variable=self.native_rate_var,
+        ).grid(row=0, column=2, sticky="w")
+
+        # Voice Activity Detection
+        vad_frame = ttk.LabelFrame(
+            tab_processing, text="Voice Activity Detection", padding="15"
+        )
+        vad_frame.grid(row=0, column=0, sticky="ew", padx=(10, 10), pady=(10, 0))
+        vad_frame.columnconfigure(0, weight=1)
+
+        self.vad_var = tk.StringVar(value=self.recorder.vad_backend)
+        self.vad_combo = ttk.Combobox(
+            vad_frame,
+            textvariable=self.vad_var,
+            state="readonly",
+            font=app_font(9),
+        )
+        self.vad_combo["values"] = tuple(VAD_BACKENDS.keys())
+        self.vad_combo.grid(row=0, column=0, padx=(0, 10), pady=5, sticky="ew")
+
+        # Info label
+        info_label = ttk.Label(
+            vad_frame,
+            text="Detector used to trim silence (energy is faster, webrtc more robust)",
+            style="Info.TLabel",
+        )
+        info_label.grid(row=1, column=0, sticky="w", pady=(5, 0))
+
+        # Output Encoding
+        encoding_frame = ttk.LabelFrame(
+            tab_processing, text="Output Encoding", padding="15"
+        )
+        encoding_frame.grid(row=1, column=0, sticky="ew", padx=(10, 10), pady=(10, 0))
+        encoding_frame.columnconfigure(0, weight=1)
+
+        self.encoding_var = tk.StringVar(value=self.recorder.encoding_profile)
+        self.encoding_combo = ttk.Combobox(
+            encoding_frame,
+            textvariable=self.encoding_var,
+            state="readonly",
+            font=app_font(9),
+        )
+        self.encoding_combo["values"] = tuple(ENCODING_PROFILES.keys())
+        self.encoding_combo.grid(row=0, column=0, padx=(0, 10), pady=5, sticky="ew")
+        self.encoding_combo.bind(
+            "<<ComboboxSelected>>", lambda e: self.update_encoding_info()
+        )
+
+        # Info label
+        self.encoding_info = tk.StringVar()
+        ttk.Label(
+            encoding_frame, textvariable=self.encoding_info, style="Info.TLabel"
+        ).grid(row=1, column=0, sticky="w", pady=(5, 0))
+        self.update_encoding_info()
+
+        # Hands-free Recording
+        hands_free_frame = ttk.LabelFrame(
+            tab_processing, text="Hands-free Recording", padding="15"
+        )
+        hands_free_frame.grid(row=2, column=0, sticky="ew", padx=(10, 10), pady=(10, 0))
+        hands_free_frame.columnconfigure(2, weight=1)
+
+        self.hands_free_var = tk.BooleanVar(value=self.recorder.hands_free)
+        ttk.Checkbutton(
+            hands_free_frame,
+            text="Start and stop takes on speech",
+            variable=self.hands_free_var,
+        ).grid(row=0, column=0, columnspan=3, sticky="w")
+
+        ttk.Label(hands_free_frame, text="Stop after silence (s)").grid(
+            row=1, column=0, padx=(0, 10), pady=5, sticky="w"
+        )
+        self.trailing_silence_var = tk.DoubleVar(value=self.recorder.trailing_silence_s)
+        ttk.Spinbox(
+            hands_free_frame,
+            textvariable=self.trailing_silence_var,
+            from_=0.3,
+            to=5.0,
+            increment=0.1,
+            width=6,
+            font=app_font(9),
+        ).grid(row=1, column=1, pady=5, sticky="w")
+
+        self.auto_save_var = tk.BooleanVar(value=self.recorder.auto_save)
+        ttk.Checkbutton(
+            hands_free_frame,
+            text="Save and advance automatically",
+            variable=self.auto_save_var,
+        ).grid(row=2, column=0, columnspan=3, sticky="w")
+
+        # Post-save Hooks
+        hooks_frame = ttk.LabelFrame(
+            tab_processing, text="Post-save Processing", padding="15"
+        )
+        hooks_frame.grid(row=3, column=0, sticky="ew", padx=(10, 10), pady=(10, 0))
+        hooks_frame.columnconfigure(1, weight=1)
+
+        load_hook_plugins()
+        checks_row = ttk.Frame(hooks_frame)
+        checks_row.grid(row=0, column=0, columnspan=3, sticky="w")
+        self.hook_vars = {}
+        for i, name in enumerate(POST_SAVE_HOOKS):
+            self.hook_vars[name] = tk.BooleanVar(
+                value=name in self.recorder.post_save_hooks
+            )
+            ttk.Checkbutton(checks_row, text=name, variable=self.hook_vars[name]).grid(
+                row=0, column=i, padx=(0, 15), sticky="w"
+            )
+
+        ttk.Label(hooks_frame, text="Copy to:").grid(
+            row=1, column=0, padx=(0, 10), pady=5, sticky="w"
+        )
+        self.copy_folder_var = tk.StringVar(value=self.recorder.hook_copy_folder)
+        ttk.Entry(
+            hooks_frame, textvariable=self.copy_folder_var, font=app_font(9)
+        ).grid(row=1, column=1, padx=(0, 10), pady=5, sticky="ew")
+        ttk.Button(
+            hooks_frame,
+            text="Browse...",
+            command=self.select_copy_folder,
+            width=12,
+        ).grid(row=1, column=2, sticky="e")
+
+        ttk.Label(hooks_frame, text="Workers:").grid(
+            row=2, column=0, padx=(0, 10), pady=5, sticky="w"
+        )
+        self.hook_workers_var = tk.IntVar(value=self.recorder.hook_workers)
+        ttk.Spinbox(
+            hooks_frame,
+            textvariable=self.hook_workers_var,
+            from_=1,
+            to=16,
+            width=6,
+            font=app_font(9),
+        ).grid(row=2, column=1, pady=5, sticky="w")
+
+        # Info label
+        ttk.Label(
+            hooks_frame,
+            text="Run in the background after each save, unfinished jobs "
+            "resume on the next start",
+            style="Info.TLabel",
+        ).grid(row=3, column=0, columnspan=3, sticky="w", pady=(5, 0))
+
         # Spacer
         ttk.Frame(main_frame).grid(row=3, column=0, sticky="nsew")
 
@@ -287,8 +584,49 @@ class SettingsDialog:
         )
 
         if file:
+            # Applied by the caller on OK, cancelling keeps the old file
             self.file_var.set(str(Path(file)))
-            self.recorder.input_file = file
+
+    def select_coordinator_file(self) -> None:
+        file = filedialog.asksaveasfilename(
+            title="Select Coordination File",
+            filetypes=[("SQLite files", "*.sqlite"), ("All files", "*.*")],
+            defaultextension=".sqlite",
+            confirmoverwrite=False,
+        )
+
+        if file:
+            self.coordinator_var.set(str(Path(file)))
+
+    def select_copy_folder(self) -> None:
+        folder = filedialog.askdirectory(
+            title="Select Copy Folder",
+            initialdir=self.copy_folder_var.get() or self.recorder.output_folder,
+        )
+        if folder:
+            self.copy_folder_var.set(str(Path(folder)))
+
+    def update_encoding_info(self) -> None:
+        profile = ENCODING_PROFILES.get(self.encoding_var.get())
+        self.encoding_info.set(profile.description if profile else "")
+
+    def get_seed(self) -> int:
+        try:
+            return self.seed_var.get()
+        except tk.TclError:
+            return self.recorder.prompt_seed
+
+    def get_trailing_silence(self) -> float:
+        try:
+            return min(max(self.trailing_silence_var.get(), 0.3), 5.0)
+        except tk.TclError:
+            return self.recorder.trailing_silence_s
+
+    def get_hook_workers(self) -> int:
+        try:
+            return min(max(self.hook_workers_var.get(), 1), 16)
+        except tk.TclError:
+            return self.recorder.hook_workers
 
     def refresh_devices(self) -> None:
         """Refresh available audio devices."""
@@ -323,6 +661,15 @@ class SettingsDialog:
             )
             return False
 
+        copy_var = self.hook_vars.get("copy")
+        if copy_var is not None and copy_var.get() and not self.copy_folder_var.get():
+            messagebox.showwarning(
+                "No Copy Folder",
+                "Please select the folder takes are copied to.",
+                parent=self.dialog,
+            )
+            return False
+
         if not self.device_var.get():
             messagebox.showwarning(
                 "No Device Selected",
@@ -345,6 +692,24 @@ class SettingsDialog:
             "output_folder": self.folder_var.get(),
             "device": self.device_var.get(),
             "input_file": self.file_var.get(),
+            "sample_format": self.format_var.get(),
+            "vad_backend": self.vad_var.get(),
+            "coordinator_file": self.coordinator_var.get().strip(),
+            "station_id": self.station_var.get().strip() or self.recorder.station_id,
+            "encoding_profile": self.encoding_var.get(),
+            "hands_free": self.hands_free_var.get(),
+            "trailing_silence_s": self.get_trailing_silence(),
+            "auto_save": self.auto_save_var.get(),
+            "prompt_order": self.order_var.get(),
+            "prompt_seed": self.get_seed(),
+            "audio_layout": self.layout_var.get(),
+            "sample_rate": int(self.rate_var.get()),
+            "native_rate": self.native_rate_var.get(),
+            "post_save_hooks": [
+                name for name, var in self.hook_vars.items() if var.get()
+            ],
+            "hook_workers": self.get_hook_workers(),
+            "hook_copy_folder": self.copy_folder_var.get().strip(),
         }
         self.dialog.destroy()
 
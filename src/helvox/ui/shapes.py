@@ -0,0 +1,50 @@
+from functools import lru_cache
+
+# Shapes are shared by all rounded widgets, sizes repeat a lot (the buttons
+# of a row, the waveform canvases) and resizes go back and forth
+SHAPE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def rounded_rect_points(width: int, height: int, radius: int) -> tuple[int, ...]:
+    """
+    Control points of a rounded rectangle drawn as a smoothed polygon.
+
+    Each corner point is repeated so Tk's spline smoothing rounds the
+    corners and keeps the edges straight.
+    """
+    return (
+        radius,
+        0,
+        width - radius,
+        0,
+        width,
+        0,
+        width,
+        radius,
+        width,
+        height - radius,
+        width,
+        height,
+        width - radius,
+        height,
+        radius,
+        height,
+        0,
+        height,
+        0,
+        height - radius,
+        0,
+        radius,
+        0,
+        0,
+    )
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def lighten(color: str, amount: int) -> str:
+    """Lighten a hex color by amount"""
+    color = color.lstrip("#")
+    rgb = tuple(int(color[i : i + 2], 16) for i in (0, 2, 4))
+    rgb = tuple(min(255, c + amount) for c in rgb)
+    return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
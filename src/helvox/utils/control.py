@@ -0,0 +1,279 @@
+import asyncio
+import hmac
+import json
+import math
+from typing import Optional
+from urllib.parse import urlsplit
+
+from helvox.utils.session import HeadlessSession
+
+MAX_BODY_BYTES = 64 * 1024
+
+# Names a browser may send in the Host header for a loopback bind
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str = "") -> None:
+        super().__init__(message or REASONS.get(status, ""))
+        self.status = status
+
+
+class ControlServer:
+    """
+    Local HTTP control server for a HeadlessSession.
+
+    Small JSON API on top of asyncio streams, so no web framework is
+    needed:
+
+        GET  /status          session state, prompt and take
+        POST /record/start
+        POST /record/stop     waits until the take is trimmed
+        POST /trim            {"start_s": float, "end_s": float}
+        POST /save            {"ch": "edited text"} (optional)
+        POST /skip
+        POST /next            next prompt without saving or skipping
+        GET  /waveform        ?points=N, full and trimmed peaks
+        GET  /levels          input level as server-sent events
+
+    Binds to localhost by default. Every request needs an
+    "Authorization: Bearer <token>" header and a Host header naming the
+    bound address, which turns away DNS rebinding. Browsers only get CORS
+    access for allow_origin, if given.
+    """
+
+    def __init__(
+        self,
+        session: HeadlessSession,
+        token: str,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        allow_origin: Optional[str] = None,
+    ) -> None:
+        self.session = session
+        self.token = token
+        self.host = host
+        self.port = port
+        self.allow_origin = allow_origin
+        self.allowed_hosts = allowed_host_headers(host, port)
+
+        self.routes = {
+            ("GET", "/status"): self.get_status,
+            ("POST", "/record/start"): self.start_recording,
+            ("POST", "/record/stop"): self.stop_recording,
+            ("POST", "/trim"): self.trim,
+            ("POST", "/save"): self.save,
+            ("POST", "/skip"): self.skip,
+            ("POST", "/next"): self.next_prompt,
+            ("GET", "/waveform"): self.get_waveform,
+        }
+
+    async def serve_forever(self) -> None:
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            method, path, query, headers, body = await self.read_request(reader)
+            self.check_host(headers)
+
+            # CORS preflight requests never carry the token
+            if method == "OPTIONS":
+                await self.respond(writer, 204)
+                return
+            self.check_token(headers)
+
+            if path == "/levels" and method == "GET":
+                await self.stream_levels(writer, query)
+            else:
+                route = self.routes.get((method, path))
+                if route is None:
+                    known = any(route_path == path for _, route_path in self.routes)
+                    raise HttpError(405 if known else 404)
+                await self.respond(writer, 200, await route(body, query))
+        except HttpError as e:
+            await self.respond(writer, e.status, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"Error handling control request: {e}")
+            await self.respond(writer, 500, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise HttpError(400)
+        method, target, _ = request_line
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413)
+
+        body = {}
+        if length:
+            # Plain text or form bodies would skip the CORS preflight
+            content_type = headers.get("content-type", "").partition(";")[0]
+            if content_type.strip().lower() != "application/json":
+                raise HttpError(415, "Body must be application/json")
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise HttpError(400, "Body is not valid JSON")
+            if not isinstance(body, dict):
+                raise HttpError(400, "Body must be a JSON object")
+
+        url = urlsplit(target)
+        query = dict(part.split("=", 1) for part in url.query.split("&") if "=" in part)
+        return method.upper(), url.path.rstrip("/") or "/", query, headers, body
+
+    def check_host(self, headers: dict) -> None:
+        if headers.get("host", "").lower() not in self.allowed_hosts:
+            raise HttpError(403, "Unexpected Host header")
+
+    def check_token(self, headers: dict) -> None:
+        expected = f"Bearer {self.token}"
+        if not hmac.compare_digest(headers.get("authorization", ""), expected):
+            raise HttpError(401)
+
+    def cors_headers(self) -> str:
+        # Only a UI served from the allowed origin may read the responses
+        if not self.allow_origin:
+            return ""
+        return (
+            f"Access-Control-Allow-Origin: {self.allow_origin}\r\n"
+            "Access-Control-Allow-Headers: Authorization, Content-Type\r\n"
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        )
+
+    async def respond(
+        self, writer: asyncio.StreamWriter, status: int, payload=None
+    ) -> None:
+        body = b"" if status == 204 else json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"{self.cors_headers()}"
+            "Connection: close\r\n\r\n"
+        )
+        try:
+            writer.write(head.encode("latin-1") + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def stream_levels(self, writer: asyncio.StreamWriter, query: dict) -> None:
+        try:
+            interval_ms = float(query.get("interval_ms", 50))
+        except ValueError:
+            interval_ms = math.nan
+        if not math.isfinite(interval_ms):
+            raise HttpError(400, "interval_ms must be a number")
+        interval_s = min(max(interval_ms / 1000, 0.02), 1.0)
+        writer.write(
+            (
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: text/event-stream\r\n"
+                "Cache-Control: no-cache\r\n"
+                f"{self.cors_headers()}"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+        )
+        async for level in self.session.levels(interval_s):
+            writer.write(f"data: {json.dumps(level)}\n\n".encode("utf-8"))
+            await writer.drain()
+
+    async def get_status(self, body: dict, query: dict):
+        return self.session.status()
+
+    async def start_recording(self, body: dict, query: dict):
+        await self.session.start_recording()
+        return self.session.status()
+
+    async def stop_recording(self, body: dict, query: dict):
+        return {"take": await self.session.stop_recording()}
+
+    async def trim(self, body: dict, query: dict):
+        try:
+            start_s = body.get("start_s")
+            end_s = body.get("end_s")
+            start_s = None if start_s is None else float(start_s)
+            end_s = None if end_s is None else float(end_s)
+        except (TypeError, ValueError):
+            raise HttpError(400, "start_s and end_s must be numbers")
+        return {"take": await self.session.trim(start_s, end_s)}
+
+    async def save(self, body: dict, query: dict):
+        text_ch = body.get("ch")
+        if text_ch is not None and not isinstance(text_ch, str):
+            raise HttpError(400, "ch must be a string")
+        return {"prompt": await self.session.save(text_ch)}
+
+    async def skip(self, body: dict, query: dict):
+        return {"prompt": await self.session.skip()}
+
+    async def next_prompt(self, body: dict, query: dict):
+        return {"prompt": await self.session.next_prompt()}
+
+    async def get_waveform(self, body: dict, query: dict):
+        try:
+            points = min(max(int(query.get("points", 200)), 2), 4000)
+        except ValueError:
+            raise HttpError(400, "points must be an integer")
+
+        recorder = self.session.recorder
+        if recorder.full_audio is None or recorder.trimmed_audio is None:
+            return {"full": [], "trimmed": []}
+        return {
+            "full": recorder.get_waveform_full_audio(points),
+            "trimmed": recorder.get_waveform_trimmed_audio(points),
+        }
+
+
+def allowed_host_headers(host: str, port: int) -> set[str]:
+    """Host header values that name the bound address, lower case."""
+    names = set(LOOPBACK_HOSTS) if host.lower() in LOOPBACK_HOSTS else {host.lower()}
+    # IPv6 literals are bracketed in the Host header
+    names = {f"[{name}]" if ":" in name else name for name in names}
+
+    allowed = {f"{name}:{port}" for name in names}
+    if port == 80:
+        allowed.update(names)
+    return allowed
+
+
+async def serve(session: HeadlessSession, server: ControlServer) -> None:
+    await session.start()
+    try:
+        await server.serve_forever()
+    finally:
+        await session.close()
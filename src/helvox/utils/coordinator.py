@@ -0,0 +1,172 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Union
+
+# SQLite limits the number of bound parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+
+class Coordinator:
+    """
+    Hands out prompt ids to recording stations as expiring leases.
+
+    A station asks for a batch of candidate ids and gets back the subset
+    that no other station holds or has completed. Leases expire after
+    lease_s seconds, so prompts held by a crashed station become available
+    again.
+
+    Prompts are scoped by dialect: the same id recorded in another dialect
+    is a separate prompt, so stations of different dialects can share the
+    coordinator.
+    """
+
+    def lease(self, station: str, dialect: str, ids: list[str]) -> list[str]:
+        raise NotImplementedError
+
+    def complete(self, station: str, dialect: str, ids: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def release(self, station: str, dialect: str, ids: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class LocalCoordinator(Coordinator):
+    """In-memory coordinator for a single process, e.g. for tests."""
+
+    def __init__(
+        self, lease_s: float = 1800.0, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.lease_s = lease_s
+        self.clock = clock
+        self.leases = {}  # (dialect, id) -> (station, expires)
+        self.completed = set()  # (dialect, id)
+        self.lock = threading.Lock()
+
+    def lease(self, station: str, dialect: str, ids: list[str]) -> list[str]:
+        now = self.clock()
+        granted = []
+
+        with self.lock:
+            for id in ids:
+                key = (dialect, id)
+                if key in self.completed:
+                    continue
+                holder, expires = self.leases.get(key, (station, 0.0))
+                if holder != station and expires > now:
+                    continue
+                self.leases[key] = (station, now + self.lease_s)
+                granted.append(id)
+
+        return granted
+
+    def complete(self, station: str, dialect: str, ids: Iterable[str]) -> None:
+        with self.lock:
+            for id in ids:
+                self.completed.add((dialect, id))
+                self.leases.pop((dialect, id), None)
+
+    def release(self, station: str, dialect: str, ids: Iterable[str]) -> None:
+        with self.lock:
+            for id in ids:
+                holder, _ = self.leases.get((dialect, id), (None, 0.0))
+                if holder == station:
+                    del self.leases[(dialect, id)]
+
+
+class SQLiteCoordinator(Coordinator):
+    """
+    Coordinator backed by a SQLite file that all stations can reach,
+    e.g. on a network share. Each lease call is one short write
+    transaction, so stations never hand out the same id twice.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        lease_s: float = 1800.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.lease_s = lease_s
+        self.clock = clock
+
+        # Autocommit mode, transactions are opened explicitly
+        self.connection = sqlite3.connect(
+            self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self.lock = threading.Lock()
+        # Keyed by dialect and id, the unscoped prompts table of older files
+        # is left alone since its rows cannot be assigned to a dialect
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " dialect TEXT NOT NULL,"
+            " id TEXT NOT NULL,"
+            " station TEXT,"
+            " expires REAL NOT NULL DEFAULT 0,"
+            " done INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (dialect, id))"
+        )
+
+    def lease(self, station: str, dialect: str, ids: list[str]) -> list[str]:
+        now = self.clock()
+        granted = []
+
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                for i in range(0, len(ids), QUERY_CHUNK_SIZE):
+                    chunk = ids[i : i + QUERY_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    taken = {
+                        row[0]
+                        for row in cursor.execute(
+                            "SELECT id FROM leases"
+                            f" WHERE dialect = ? AND id IN ({placeholders})"
+                            " AND (done = 1 OR (station != ? AND expires > ?))",
+                            (dialect, *chunk, station, now),
+                        )
+                    }
+                    chunk_granted = [id for id in chunk if id not in taken]
+                    cursor.executemany(
+                        "INSERT INTO leases (dialect, id, station, expires)"
+                        " VALUES (?, ?, ?, ?)"
+                        " ON CONFLICT(dialect, id) DO UPDATE SET"
+                        " station = excluded.station, expires = excluded.expires",
+                        [
+                            (dialect, id, station, now + self.lease_s)
+                            for id in chunk_granted
+                        ],
+                    )
+                    granted.extend(chunk_granted)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+        return granted
+
+    def complete(self, station: str, dialect: str, ids: Iterable[str]) -> None:
+        with self.lock:
+            self.connection.executemany(
+                "INSERT INTO leases (dialect, id, station, done) VALUES (?, ?, ?, 1)"
+                " ON CONFLICT(dialect, id) DO UPDATE SET"
+                " station = excluded.station, done = 1",
+                [(dialect, id, station) for id in ids],
+            )
+
+    def release(self, station: str, dialect: str, ids: Iterable[str]) -> None:
+        with self.lock:
+            self.connection.executemany(
+                "DELETE FROM leases"
+                " WHERE dialect = ? AND id = ? AND station = ? AND done = 0",
+                [(dialect, id, station) for id in ids],
+            )
+
+    def close(self) -> None:
+        self.connection.close()
@@ -1,6 +1,7 @@
 import json
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 
 def read_dataset(path: Path, dialect_filter: Optional[str] = None) -> list[dict]:
@@ -32,3 +33,21 @@ def read_dataset(path: Path, dialect_filter: Optional[str] = None) -> list[dict]
             return []
 
     return filtered_data
+
+
+def file_stamp(path: Union[str, Path]) -> Optional[tuple[int, int]]:
+    """
+    Return (mtime_ns, size) of a file, or None if it does not exist.
+
+    Used to tell whether a file changed since it was last read without
+    reading it again.
+    """
+    if not str(path):
+        return None
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
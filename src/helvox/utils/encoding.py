@@ -0,0 +1,214 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from helvox.utils.layout import iter_audio_files
+
+# Suffix of takes written as WAV and waiting to be converted to FLAC
+PENDING_SUFFIX = ".wav"
+
+
+class EncodingProfile:
+    """
+    How a take is written to disk.
+
+    FLAC is lossless at every compression level, the level only trades
+    encode time against file size. Deferred profiles write a WAV file first,
+    which is the cheapest possible write, and convert it to FLAC in the
+    background.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        subtype: str = "PCM_16",
+        compression_level: Optional[float] = None,
+        deferred: bool = False,
+        description: str = "",
+    ) -> None:
+        self.name = name
+        self.subtype = subtype
+        self.compression_level = compression_level
+        self.deferred = deferred
+        self.description = description
+
+    def write_flac(self, path: Union[str, Path], audio: np.ndarray, sample_rate: int):
+        sf.write(
+            path,
+            audio,
+            sample_rate,
+            subtype=self.subtype,
+            format="FLAC",
+            compression_level=self.compression_level,
+        )
+
+
+ENCODING_PROFILES = {
+    profile.name: profile
+    for profile in (
+        EncodingProfile("flac", description="FLAC 16-bit, default compression"),
+        EncodingProfile(
+            "flac-fast",
+            compression_level=0.0,
+            description="FLAC 16-bit, fastest encode for slow stations",
+        ),
+        EncodingProfile(
+            "flac-archive",
+            compression_level=1.0,
+            description="FLAC 16-bit, smallest files for archive storage",
+        ),
+        EncodingProfile(
+            "flac-24",
+            subtype="PCM_24",
+            description="FLAC 24-bit, larger files, no gain for 16-bit capture",
+        ),
+        EncodingProfile(
+            "wav-deferred",
+            deferred=True,
+            description="WAV on save, converted to FLAC in the background",
+        ),
+    )
+}
+
+DEFAULT_ENCODING_PROFILE = "flac"
+
+
+def get_encoding_profile(name: str) -> EncodingProfile:
+    try:
+        return ENCODING_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown encoding profile: {name}") from None
+
+
+def pending_path(flac_path: Union[str, Path]) -> Path:
+    return Path(flac_path).with_suffix(PENDING_SUFFIX)
+
+
+def transcode_to_flac(
+    wav_path: Union[str, Path], flac_path: Union[str, Path], profile: EncodingProfile
+) -> None:
+    """
+    Convert a pending WAV file to FLAC and remove the WAV.
+
+    The FLAC file is written under a temporary name and renamed into place,
+    so an existing FLAC file is always complete. If the FLAC file already
+    exists the conversion finished before a crash and only the WAV is left
+    to clean up.
+    """
+    wav_path = Path(wav_path)
+    flac_path = Path(flac_path)
+
+    if not flac_path.exists():
+        audio, sample_rate = sf.read(wav_path, dtype="int32", always_2d=True)
+        tmp_path = flac_path.with_suffix(".flac.tmp")
+        profile.write_flac(tmp_path, audio, sample_rate)
+        os.replace(tmp_path, flac_path)
+
+    wav_path.unlink(missing_ok=True)
+
+
+class BackgroundTranscoder:
+    """Converts deferred WAV takes to FLAC on a single worker thread."""
+
+    def __init__(self) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="helvox-transcode"
+        )
+        self.lock = threading.Lock()
+        self.pending: dict[Path, Future] = {}
+        # WAV files whose last conversion failed, resume() tries them again
+        self.failed: dict[Path, str] = {}
+
+    def submit(
+        self, wav_path: Path, flac_path: Path, profile: EncodingProfile
+    ) -> Future:
+        """Queue a conversion, the future resolves to whether it succeeded."""
+
+        def run() -> bool:
+            try:
+                transcode_to_flac(wav_path, flac_path, profile)
+            except Exception as e:
+                print(f"Error converting {wav_path.name} to FLAC: {e}")
+                with self.lock:
+                    self.failed[wav_path] = str(e)
+                return False
+            else:
+                with self.lock:
+                    self.failed.pop(wav_path, None)
+                return True
+            finally:
+                with self.lock:
+                    if self.pending.get(wav_path) is future:
+                        del self.pending[wav_path]
+
+        with self.lock:
+            future = self.executor.submit(run)
+            self.pending[wav_path] = future
+        return future
+
+    def wait(self, wav_path: Path) -> None:
+        """
+        Cancel the queued conversion of wav_path, or wait for it if it
+        already runs. Call before writing a new take to the same path, the
+        old job would otherwise read or delete the new file.
+        """
+        with self.lock:
+            future = self.pending.get(wav_path)
+        if future is None:
+            return
+
+        if future.cancel():
+            with self.lock:
+                if self.pending.get(wav_path) is future:
+                    del self.pending[wav_path]
+        else:
+            future.result()
+
+    def when_done(self, wav_path: Path, callback: Callable[[], None]) -> None:
+        """
+        Call callback once wav_path was converted, from the worker thread,
+        or right away if no conversion is pending. A cancelled or failed
+        conversion never calls it, the FLAC file is not there.
+        """
+        with self.lock:
+            future = self.pending.get(wav_path)
+            failed = wav_path in self.failed
+        if future is None:
+            if not failed:
+                callback()
+            return
+
+        def done(future: Future) -> None:
+            if not future.cancelled() and future.result():
+                callback()
+
+        future.add_done_callback(done)
+
+    def resume(self, audio_dir: Path, profile: EncodingProfile) -> list[Path]:
+        """
+        Queue WAV files left over from a previous session or from a failed
+        conversion.
+        """
+        queued = []
+        for _, entry in iter_audio_files(audio_dir, (PENDING_SUFFIX,)):
+            wav_path = Path(entry.path)
+            with self.lock:
+                if wav_path in self.pending:
+                    continue
+            self.submit(wav_path, wav_path.with_suffix(".flac"), profile)
+            queued.append(wav_path)
+
+        return queued
+
+    def pending_count(self) -> int:
+        with self.lock:
+            return len(self.pending)
+
+    def shutdown(self) -> None:
+        """Finish the queued conversions before returning."""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,176 @@
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from helvox.utils.vad import VadBackend
+
+# Endpointer states
+IDLE = "idle"
+RECORDING = "recording"
+HOLD = "hold"
+
+
+class Endpointer:
+    """
+    Streaming speech endpoint detection for hands-free recording.
+
+    Fed with the blocks of the monitor stream from the audio callback. While
+    idle it keeps the last pre_roll_s of audio; once onset_frames consecutive
+    frames are voiced a take starts with that pre-roll, and it ends after
+    trailing_silence_s without a voiced frame (or after max_take_s). The
+    finished take is queued as its list of blocks, concatenating is left to
+    the consumer so the callback only ever copies one block.
+
+    Detector decisions are ignored for the first warmup_frames after a
+    (re)start, while the detector adapts to the background noise.
+
+    After a take the endpointer holds until arm() is called, so a take that
+    is still being reviewed is never replaced by the next one.
+    """
+
+    def __init__(
+        self,
+        backend: VadBackend,
+        sample_rate: int,
+        frame_duration_ms: int = 30,
+        onset_frames: int = 3,
+        trailing_silence_s: float = 0.8,
+        pre_roll_s: float = 0.3,
+        max_take_s: float = 30.0,
+        warmup_frames: int = 10,
+    ) -> None:
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_duration_ms / 1000)
+        self.onset_frames = onset_frames
+        self.trailing_frames = max(
+            1, int(trailing_silence_s * 1000 / frame_duration_ms)
+        )
+        self.pre_roll_samples = int(pre_roll_s * sample_rate)
+        self.max_take_samples = int(max_take_s * sample_rate)
+        self.warmup_frames = warmup_frames
+
+        self.state = IDLE
+        self.remainder: Optional[np.ndarray] = None
+        self.context: Optional[np.ndarray] = None
+        self.frames_seen = 0
+        self.voiced_run = 0
+        self.silent_run = 0
+
+        self.pre_roll: deque = deque()
+        self.pre_roll_length = 0
+        self.blocks: list = []
+        self.take_length = 0
+
+        # Finished takes, appended by the audio thread and popped by the UI
+        self.takes: deque = deque()
+
+    def arm(self) -> None:
+        """Listen for the next take."""
+        if self.state == HOLD:
+            self.reset()
+            self.state = IDLE
+
+    def hold(self) -> None:
+        """Stop listening, dropping a take in progress."""
+        self.reset()
+        self.state = HOLD
+
+    def restart(self) -> None:
+        """Drop the audio of a take in progress, a held take stays held."""
+        self.reset()
+        if self.state == RECORDING:
+            self.state = IDLE
+
+    def reset(self) -> None:
+        self.remainder = None
+        self.context = None
+        self.frames_seen = 0
+        self.voiced_run = 0
+        self.silent_run = 0
+        self.pre_roll.clear()
+        self.pre_roll_length = 0
+        self.blocks = []
+        self.take_length = 0
+
+    def pop_take(self) -> Optional[list]:
+        try:
+            return self.takes.popleft()
+        except IndexError:
+            return None
+
+    def decide(self, indata: np.ndarray) -> np.ndarray:
+        """Voice decisions for the complete frames available after indata."""
+        data = indata[:, 0] if indata.ndim > 1 else indata
+        if self.remainder is not None and len(self.remainder) > 0:
+            data = np.concatenate((self.remainder, data))
+
+        num_frames = len(data) // self.frame_size
+        self.remainder = data[num_frames * self.frame_size :].copy()
+        if num_frames == 0:
+            return np.zeros(0, dtype=bool)
+
+        frames = data[: num_frames * self.frame_size].reshape(
+            num_frames, self.frame_size
+        )
+        if not self.backend.context_frames:
+            return self.backend.decide(frames, self.sample_rate)
+
+        # Decide together with the preceding frames and keep the new results
+        if self.context is not None:
+            frames = np.concatenate((self.context, frames))
+        self.context = frames[-self.backend.context_frames :]
+        return self.backend.decide(frames, self.sample_rate)[-num_frames:]
+
+    def process(self, indata: np.ndarray) -> None:
+        if self.state == HOLD:
+            return
+
+        block = indata.copy()
+        voiced = self.decide(block)
+
+        if self.state == IDLE:
+            self.pre_roll.append(block)
+            self.pre_roll_length += len(block)
+            while (
+                len(self.pre_roll) > 1
+                and self.pre_roll_length - len(self.pre_roll[0])
+                >= self.pre_roll_samples
+            ):
+                self.pre_roll_length -= len(self.pre_roll.popleft())
+
+            for is_voiced in voiced:
+                self.frames_seen += 1
+                if self.frames_seen <= self.warmup_frames:
+                    continue
+                self.voiced_run = self.voiced_run + 1 if is_voiced else 0
+                if self.voiced_run >= self.onset_frames:
+                    self.start_take()
+                    break
+            return
+
+        self.blocks.append(block)
+        self.take_length += len(block)
+
+        for is_voiced in voiced:
+            self.silent_run = 0 if is_voiced else self.silent_run + 1
+
+        if (
+            self.silent_run >= self.trailing_frames
+            or self.take_length >= self.max_take_samples
+        ):
+            self.end_take()
+
+    def start_take(self) -> None:
+        self.state = RECORDING
+        self.blocks = list(self.pre_roll)
+        self.take_length = self.pre_roll_length
+        self.pre_roll.clear()
+        self.pre_roll_length = 0
+        self.silent_run = 0
+
+    def end_take(self) -> None:
+        self.takes.append(self.blocks)
+        self.reset()
+        self.state = HOLD
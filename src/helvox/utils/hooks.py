@@ -0,0 +1,535 @@
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import soundfile as sf
+
+from helvox.utils.encoding import pending_path
+from helvox.utils.layout import resolve_audio_path
+from helvox.utils.metrics import integrated_loudness
+from helvox.utils.resample import resample
+
+# Entry point group third-party hooks register under
+HOOK_ENTRY_POINT_GROUP = "helvox.post_save_hooks"
+
+# Job database in the output folder, shared by all speakers
+JOBS_FILENAME = "post-save-jobs.sqlite"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# A pipeline refreshes its running jobs this often; jobs not refreshed for
+# JOB_STALE_S belong to a process that is gone and are run again
+HEARTBEAT_S = 30.0
+JOB_STALE_S = 120.0
+
+
+class PostSaveHook:
+    """
+    A processing step run for every saved take.
+
+    run() gets the take's manifest entry plus "speaker" and "speaker_dir"
+    and runs in a worker process, so hooks must be picklable (a module
+    level class whose attributes pickle) and should be idempotent: a job
+    interrupted by a restart is run again from the start.
+    """
+
+    name = ""
+    description = ""
+
+    def __init__(self, **options) -> None:
+        pass
+
+    def run(self, job: dict) -> None:
+        raise NotImplementedError
+
+
+def job_audio_path(job: dict) -> Path:
+    """Audio file of a job's take, the WAV file while it awaits conversion."""
+    audio_dir = Path(job["speaker_dir"]) / "audio"
+    audio_path = resolve_audio_path(audio_dir, job.get("audio") or f"{job['id']}.flac")
+    if not audio_path.exists() and pending_path(audio_path).exists():
+        return pending_path(audio_path)
+    return audio_path
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, mode="w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, path)
+
+
+class LoudnessHook(PostSaveHook):
+    """Writes the take's BS.1770 loudness to loudness/<id>.json."""
+
+    name = "loudness"
+    description = "Integrated loudness (LUFS) per take in loudness/"
+
+    def run(self, job: dict) -> None:
+        audio, sample_rate = sf.read(job_audio_path(job), dtype="float32")
+        write_json_atomic(
+            Path(job["speaker_dir"]) / "loudness" / f"{job['id']}.json",
+            {"id": job["id"], **integrated_loudness(audio, sample_rate)},
+        )
+
+
+class AlignmentHook(PostSaveHook):
+    """
+    Prepares the take for forced alignment: a 16 kHz WAV file and a .lab
+    transcript side by side in alignment/, the corpus layout aligners such
+    as the Montreal Forced Aligner expect.
+    """
+
+    name = "alignment"
+    description = "16 kHz WAV and .lab transcript per take in alignment/"
+
+    def __init__(self, alignment_rate: int = 16000, **options) -> None:
+        self.alignment_rate = alignment_rate
+
+    def run(self, job: dict) -> None:
+        folder = Path(job["speaker_dir"]) / "alignment"
+        folder.mkdir(parents=True, exist_ok=True)
+
+        audio, sample_rate = sf.read(job_audio_path(job), dtype="float32")
+        audio = resample(audio, sample_rate, self.alignment_rate)
+        tmp_path = folder / f"{job['id']}.wav.tmp"
+        sf.write(tmp_path, audio, self.alignment_rate, subtype="PCM_16", format="WAV")
+        os.replace(tmp_path, folder / f"{job['id']}.wav")
+
+        tmp_path = folder / f"{job['id']}.lab.tmp"
+        with open(tmp_path, mode="w", encoding="utf-8") as f:
+            f.write(job.get("ch", "").strip() + "\n")
+        os.replace(tmp_path, folder / f"{job['id']}.lab")
+
+
+class CopyHook(PostSaveHook):
+    """
+    Copies the take and its manifest entry to <copy_folder>/<speaker>/, e.g.
+    a mounted network share. Files are copied under a temporary name and
+    renamed, so the destination never holds a partial file.
+    """
+
+    name = "copy"
+    description = "Copy each take and its manifest entry to another folder"
+
+    def __init__(self, copy_folder: str = "", **options) -> None:
+        self.copy_folder = copy_folder
+
+    def run(self, job: dict) -> None:
+        if not self.copy_folder:
+            raise ValueError("No copy folder configured")
+
+        source = job_audio_path(job)
+        audio_relpath = source.relative_to(Path(job["speaker_dir"]))
+        target = Path(self.copy_folder) / job["speaker"] / audio_relpath
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+
+        sample = {
+            key: value
+            for key, value in job.items()
+            if key not in ("speaker", "speaker_dir")
+        }
+        write_json_atomic(
+            Path(self.copy_folder) / job["speaker"] / "samples" / f"{job['id']}.json",
+            sample,
+        )
+
+
+POST_SAVE_HOOKS: dict[str, type[PostSaveHook]] = {
+    hook.name: hook for hook in (LoudnessHook, AlignmentHook, CopyHook)
+}
+
+_plugins_loaded = False
+
+
+def load_hook_plugins() -> None:
+    """Register the hooks installed packages provide as entry points."""
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+
+    for entry_point in entry_points(group=HOOK_ENTRY_POINT_GROUP):
+        try:
+            hook = entry_point.load()
+        except Exception as e:
+            print(f"Error loading post-save hook {entry_point.name}: {e}")
+            continue
+        POST_SAVE_HOOKS.setdefault(hook.name or entry_point.name, hook)
+
+
+def get_post_save_hook(name: str, **options) -> PostSaveHook:
+    load_hook_plugins()
+    try:
+        return POST_SAVE_HOOKS[name](**options)
+    except KeyError:
+        raise ValueError(f"Unknown post-save hook: {name}") from None
+
+
+def run_hook(hook: PostSaveHook, job: dict) -> None:
+    """Worker process entry point."""
+    hook.run(job)
+
+
+class JobStore:
+    """
+    Post-save jobs in a SQLite file, one row per take and hook.
+
+    Saving a take again resets its jobs to pending. Running jobs carry the
+    owner (host, pid and store) that claimed them and are kept fresh by its
+    heartbeat, so a store opened by another station or by "helvox jobs"
+    leaves them alone. Only recover_stale() sets jobs whose owner stopped
+    beating back to pending.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        # Unique per store, a process may open the file more than once
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.connection = sqlite3.connect(
+            self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self.lock = threading.Lock()
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " hook TEXT NOT NULL,"
+            " take TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " updated REAL NOT NULL,"
+            " owner TEXT,"
+            " UNIQUE (hook, take))"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, job_id)"
+        )
+        # Job files written before jobs had an owner
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            self.connection.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    def add(self, hooks: Iterable[str], job: dict) -> None:
+        take = f"{job['speaker_dir']}|{job['id']}"
+        payload = json.dumps(job, ensure_ascii=False)
+        now = time.time()
+        with self.lock:
+            self.connection.executemany(
+                "INSERT INTO jobs (hook, take, payload, state, updated)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(hook, take) DO UPDATE SET"
+                " payload = excluded.payload, state = excluded.state,"
+                " attempts = 0, error = NULL, updated = excluded.updated,"
+                " owner = NULL",
+                [(hook, take, payload, PENDING, now) for hook in hooks],
+            )
+
+    def claim(self, hooks: Iterable[str], limit: int) -> list[tuple[int, str, dict]]:
+        """Mark up to limit pending jobs of the given hooks as running."""
+        hooks = list(hooks)
+        if not hooks or limit <= 0:
+            return []
+
+        placeholders = ",".join("?" * len(hooks))
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                rows = cursor.execute(
+                    "SELECT job_id, hook, payload FROM jobs"
+                    f" WHERE state = ? AND hook IN ({placeholders})"
+                    " ORDER BY job_id LIMIT ?",
+                    (PENDING, *hooks, limit),
+                ).fetchall()
+                cursor.executemany(
+                    "UPDATE jobs SET state = ?, attempts = attempts + 1,"
+                    " updated = ?, owner = ? WHERE job_id = ?",
+                    [(RUNNING, time.time(), self.owner, row[0]) for row in rows],
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+        return [(job_id, hook, json.loads(payload)) for job_id, hook, payload in rows]
+
+    def finish(self, job_id: int, error: Optional[str] = None) -> None:
+        with self.lock:
+            self.connection.execute(
+                # A take saved again meanwhile is pending and runs once more
+                "UPDATE jobs SET state = ?, error = ?, updated = ?, owner = NULL"
+                " WHERE job_id = ? AND state = ? AND owner = ?",
+                (
+                    DONE if error is None else FAILED,
+                    error,
+                    time.time(),
+                    job_id,
+                    RUNNING,
+                    self.owner,
+                ),
+            )
+
+    def requeue(self, job_id: int) -> None:
+        """Put a claimed job that could not be started back in the queue."""
+        with self.lock:
+            self.connection.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts - 1, owner = NULL"
+                " WHERE job_id = ? AND state = ? AND owner = ?",
+                (PENDING, job_id, RUNNING, self.owner),
+            )
+
+    def heartbeat(self) -> None:
+        """Mark the jobs this store runs as still alive."""
+        with self.lock:
+            self.connection.execute(
+                "UPDATE jobs SET updated = ? WHERE state = ? AND owner = ?",
+                (time.time(), RUNNING, self.owner),
+            )
+
+    def recover_stale(self, stale_s: float = JOB_STALE_S) -> int:
+        """Set running jobs without a recent heartbeat back to pending."""
+        with self.lock:
+            return self.connection.execute(
+                "UPDATE jobs SET state = ?, owner = NULL"
+                " WHERE state = ? AND updated < ?",
+                (PENDING, RUNNING, time.time() - stale_s),
+            ).rowcount
+
+    def release_running(self) -> None:
+        """Set the jobs this store runs back to pending, e.g. on shutdown."""
+        with self.lock:
+            self.connection.execute(
+                "UPDATE jobs SET state = ?, owner = NULL WHERE state = ? AND owner = ?",
+                (PENDING, RUNNING, self.owner),
+            )
+
+    def retry_failed(self, hooks: Optional[Iterable[str]] = None) -> int:
+        """Set failed jobs back to pending, returns how many."""
+        query = "UPDATE jobs SET state = ?, error = NULL, updated = ? WHERE state = ?"
+        params = [PENDING, time.time(), FAILED]
+        if hooks is not None:
+            hooks = list(hooks)
+            query += f" AND hook IN ({','.join('?' * len(hooks))})"
+            params.extend(hooks)
+
+        with self.lock:
+            return self.connection.execute(query, params).rowcount
+
+    def counts(self) -> dict[str, dict[str, int]]:
+        """Number of jobs by hook and state."""
+        counts: dict[str, dict[str, int]] = {}
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT hook, state, COUNT(*) FROM jobs GROUP BY hook, state"
+            ).fetchall()
+        for hook, state, count in rows:
+            counts.setdefault(hook, {})[state] = count
+        return counts
+
+    def failures(self, limit: int = 20) -> list[tuple[str, str, str]]:
+        """(hook, take, error) of the most recent failed jobs."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT hook, take, error FROM jobs WHERE state = ?"
+                " ORDER BY updated DESC LIMIT ?",
+                (FAILED, limit),
+            ).fetchall()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class HookPipeline:
+    """
+    Runs post-save hooks in a process pool, fed from a JobStore.
+
+    enqueue() only writes the jobs to the store, a dispatcher thread hands
+    them to the pool with at most max_workers jobs in flight. Since every
+    job goes through the store first, jobs left over from a previous run
+    are picked up when the pipeline starts. The dispatcher also sends the
+    heartbeat of the running jobs and recovers those of dead processes.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        hooks: dict[str, PostSaveHook],
+        max_workers: int = 2,
+        on_error: Callable[[str, dict, str], None] = lambda hook, job, error: None,
+    ) -> None:
+        self.store = store
+        self.hooks = hooks
+        self.max_workers = max(1, max_workers)
+        self.on_error = on_error
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        self.stopping = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+
+        self.executor = self.create_executor()
+        self.thread = threading.Thread(
+            target=self.dispatch, name="helvox-post-save", daemon=True
+        )
+        self.thread.start()
+
+    def create_executor(self) -> ProcessPoolExecutor:
+        # Spawned workers do not inherit the audio streams and Tk state of
+        # the app, forking a process with those threads running is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def enqueue(self, job: dict) -> None:
+        self.store.add(self.hooks, job)
+        with self.condition:
+            self.condition.notify()
+
+    def retry_failed(self) -> int:
+        count = self.store.retry_failed(self.hooks)
+        with self.condition:
+            self.condition.notify()
+        return count
+
+    def keep_alive(self) -> None:
+        try:
+            self.store.heartbeat()
+            recovered = self.store.recover_stale()
+        except Exception as e:
+            print(f"Error updating post-save jobs: {e}")
+            return
+        if recovered:
+            print(f"{recovered} interrupted post-save jobs queued again")
+
+    def dispatch(self) -> None:
+        last_heartbeat = None
+        while True:
+            now = time.monotonic()
+            if last_heartbeat is None or now - last_heartbeat >= HEARTBEAT_S:
+                self.keep_alive()
+                last_heartbeat = now
+
+            with self.condition:
+                if self.stopping:
+                    return
+                if self.in_flight >= self.max_workers:
+                    # Woken up by a finished job, or for the heartbeat
+                    self.condition.wait(timeout=HEARTBEAT_S)
+                    continue
+                free = self.max_workers - self.in_flight
+
+            try:
+                jobs = self.store.claim(self.hooks, free)
+            except Exception as e:
+                print(f"Error reading post-save jobs: {e}")
+                jobs = []
+
+            with self.condition:
+                if not jobs:
+                    # Woken up by enqueue, or polls for jobs added elsewhere
+                    self.condition.wait(timeout=5.0)
+                    continue
+                self.in_flight += len(jobs)
+
+            for job_id, hook, job in jobs:
+                try:
+                    future = self.executor.submit(run_hook, self.hooks[hook], job)
+                except Exception as e:
+                    self.requeue(job_id)
+                    if isinstance(e, BrokenProcessPool) and not self.stopping:
+                        # A worker died, the jobs it ran are marked failed
+                        print("Restarting the post-save worker processes")
+                        self.executor.shutdown(wait=False)
+                        self.executor = self.create_executor()
+                    continue
+                future.add_done_callback(
+                    lambda future, job_id=job_id, hook=hook, job=job: self.done(
+                        future, job_id, hook, job
+                    )
+                )
+
+    def requeue(self, job_id: int) -> None:
+        try:
+            self.store.requeue(job_id)
+        except Exception as e:
+            print(f"Error updating post-save job: {e}")
+        with self.condition:
+            self.in_flight -= 1
+
+    def done(self, future: Future, job_id: int, hook: str, job: dict) -> None:
+        # Jobs cut off by a shutdown were released by it
+        if not future.cancelled() and not self.stopping:
+            exception = future.exception()
+            error = None if exception is None else f"{exception}"
+            try:
+                self.store.finish(job_id, error)
+            except Exception as e:
+                print(f"Error updating post-save job: {e}")
+            if error is not None:
+                print(f"Error running {hook} hook for {job.get('id')}: {error}")
+                self.on_error(hook, job, error)
+
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def wait_idle(self, poll_s: float = 0.5) -> None:
+        """Block until no job of the pipeline's hooks is pending or running."""
+        while True:
+            counts = self.store.counts()
+            open_jobs = sum(
+                counts.get(hook, {}).get(state, 0)
+                for hook in self.hooks
+                for state in (PENDING, RUNNING)
+            )
+            if open_jobs == 0:
+                return
+            time.sleep(poll_s)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop the pipeline. Without wait, queued jobs are cancelled and
+        running ones are abandoned, both are set back to pending and run
+        again on the next start.
+        """
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=not wait)
+            self.executor = None
+        try:
+            self.store.release_running()
+        except Exception as e:
+            print(f"Error updating post-save jobs: {e}")
+        self.store.close()
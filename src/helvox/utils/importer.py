@@ -0,0 +1,223 @@
+import json
+import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from helvox.utils.encoding import DEFAULT_ENCODING_PROFILE, get_encoding_profile
+from helvox.utils.layout import audio_relpath
+from helvox.utils.metrics import compute_quality_metrics
+from helvox.utils.reconcile import write_manifest
+from helvox.utils.resample import resample
+from helvox.utils.trim import find_speech_bounds
+from helvox.utils.vad import get_vad_backend
+
+IMPORT_SUFFIXES = (".wav", ".flac")
+
+
+class ImportSettings:
+    """
+    How imported files are trimmed and written, the same defaults the
+    recorder uses for its own takes.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 48000,
+        vad_backend: str = "webrtc",
+        vad_aggressiveness: int = 2,
+        frame_duration_ms: int = 30,
+        padding_duration_s: float = 0.1,
+        encoding_profile: str = DEFAULT_ENCODING_PROFILE,
+        audio_layout: str = "flat",
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.vad_backend = vad_backend
+        self.vad_aggressiveness = vad_aggressiveness
+        self.frame_duration_ms = frame_duration_ms
+        self.padding_duration_s = padding_duration_s
+        self.encoding_profile = encoding_profile
+        self.audio_layout = audio_layout
+
+
+def find_import_files(
+    folder: Union[str, Path], ids: set[str]
+) -> tuple[list[tuple[str, Path]], list[Path]]:
+    """
+    Match the audio files below folder to prompt ids by file name.
+
+    Returns:
+        (id, path) pairs sorted by id, and the files matching no id
+    """
+    matched = {}
+    unmatched = []
+
+    for root, _, filenames in os.walk(folder):
+        for filename in filenames:
+            path = Path(root) / filename
+            if path.suffix.lower() not in IMPORT_SUFFIXES:
+                continue
+            if path.stem in ids and path.stem not in matched:
+                matched[path.stem] = path
+            else:
+                unmatched.append(path)
+
+    return sorted(matched.items()), sorted(unmatched)
+
+
+def import_file(id: str, source: Path, audio_dir: Path, settings: ImportSettings):
+    """
+    Decode, resample, trim and encode one file. Runs in a worker process.
+
+    Returns:
+        The manifest fields of the take (without the prompt texts)
+    """
+    audio, file_rate = sf.read(source, dtype="float32", always_2d=True)
+
+    # Takes are mono, like the recorder's
+    audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+    audio = resample(audio, file_rate, settings.sample_rate)
+
+    backend = get_vad_backend(settings.vad_backend, settings.vad_aggressiveness)
+    bounds = find_speech_bounds(
+        audio,
+        sample_rate=settings.sample_rate,
+        aggressiveness=settings.vad_aggressiveness,
+        frame_duration_ms=settings.frame_duration_ms,
+        padding_duration_s=settings.padding_duration_s,
+        backend=backend,
+    ) or (0, len(audio))
+    trimmed = np.ascontiguousarray(audio[bounds[0] : bounds[1]])
+
+    # Imports are converted right away, deferring would not save any time
+    profile = get_encoding_profile(settings.encoding_profile)
+    if profile.deferred:
+        profile = get_encoding_profile(DEFAULT_ENCODING_PROFILE)
+
+    relpath = audio_relpath(id, settings.audio_layout)
+    audio_path = audio_dir / relpath
+    audio_path.parent.mkdir(parents=True, exist_ok=True)
+    profile.write_flac(audio_path, trimmed, settings.sample_rate)
+
+    return {
+        "audio": relpath,
+        "duration_s": len(trimmed) / settings.sample_rate,
+        "sample_rate": settings.sample_rate,
+        "quality": compute_quality_metrics(
+            trimmed,
+            sample_rate=settings.sample_rate,
+            aggressiveness=settings.vad_aggressiveness,
+            frame_duration_ms=settings.frame_duration_ms,
+            backend=backend,
+        ),
+    }
+
+
+def import_folder(
+    folder: Union[str, Path],
+    speaker_dir: Union[str, Path],
+    prompts: Mapping[str, Mapping],
+    dialect: str,
+    settings: ImportSettings,
+    max_workers: Optional[int] = None,
+    batch_size: int = 100,
+    overwrite: bool = False,
+    progress: Callable[[int, int], None] = lambda done, total: None,
+) -> dict:
+    """
+    Import externally recorded files named by prompt id into a speaker
+    folder.
+
+    Files are processed in a process pool, so decoding, trimming and FLAC
+    encoding use every core. Finished takes are added to the manifest
+    batch_size at a time with one atomic write per batch.
+
+    Args:
+        folder: folder with the files to import, searched recursively
+        speaker_dir: speaker folder receiving audio/ and output.json
+        prompts: input prompts by id, like Recorder.input_index
+        dialect: speaker dialect, selects the ch_<dialect> text
+        settings: trimming and encoding settings
+        overwrite: re-import prompts the speaker already recorded
+
+    Returns:
+        Summary dict with the imported ids, the skipped (already recorded)
+        ids, the unmatched files and the files that failed
+    """
+    speaker_dir = Path(speaker_dir)
+    audio_dir = speaker_dir / "audio"
+    manifest_path = speaker_dir / "output.json"
+    dialect = dialect.lower()
+
+    samples = []
+    if manifest_path.exists():
+        with open(manifest_path, mode="r", encoding="utf-8") as f:
+            samples = json.load(f)
+    positions = {str(sample.get("id")): i for i, sample in enumerate(samples)}
+
+    matched, unmatched = find_import_files(folder, set(prompts))
+    skipped = [id for id, _ in matched if id in positions and not overwrite]
+    jobs = [(id, path) for id, path in matched if overwrite or id not in positions]
+
+    imported = []
+    failed = []
+    batch = []
+
+    def flush() -> None:
+        for sample in batch:
+            position = positions.get(sample["id"])
+            if position is None:
+                positions[sample["id"]] = len(samples)
+                samples.append(sample)
+            else:
+                samples[position] = sample
+        batch.clear()
+
+        speaker_dir.mkdir(parents=True, exist_ok=True)
+        write_manifest(manifest_path, samples)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(import_file, id, path, audio_dir, settings): (id, path)
+            for id, path in jobs
+        }
+
+        for future in as_completed(futures):
+            id, path = futures[future]
+            try:
+                fields = future.result()
+            except Exception as e:
+                print(f"Error importing {path}: {e}")
+                failed.append(str(path))
+                continue
+
+            prompt = prompts[id]
+            text_ch = prompt.get(f"ch_{dialect}", prompt.get("ch", ""))
+            batch.append(
+                {
+                    "id": id,
+                    "de": prompt.get("de", ""),
+                    "ch": text_ch,
+                    "dialect": dialect,
+                    **fields,
+                }
+            )
+            imported.append(id)
+
+            if len(batch) >= batch_size:
+                flush()
+            progress(len(imported) + len(failed), len(jobs))
+
+    if batch:
+        flush()
+
+    return {
+        "imported": imported,
+        "skipped": skipped,
+        "unmatched": [str(path) for path in unmatched],
+        "failed": failed,
+    }
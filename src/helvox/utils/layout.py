@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Optional, Union
+
+# flat: audio/<id>.flac
+# sharded: audio/<xx>/<id>.flac, xx being the first hex digits of sha1(id)
+AUDIO_LAYOUTS = ("flat", "sharded")
+DEFAULT_AUDIO_LAYOUT = "flat"
+
+# 256 shards keep ~400 files per folder at 100k takes per speaker
+SHARD_WIDTH = 2
+
+
+def shard_prefix(id: str) -> str:
+    return hashlib.sha1(str(id).encode("utf-8")).hexdigest()[:SHARD_WIDTH]
+
+
+def is_shard_name(name: str) -> bool:
+    return len(name) == SHARD_WIDTH and all(c in "0123456789abcdef" for c in name)
+
+
+def audio_relpath(id: str, layout: str = DEFAULT_AUDIO_LAYOUT, suffix=".flac") -> str:
+    """
+    Path of a take relative to the speaker's audio folder, as stored in the
+    manifest's audio field. Always uses forward slashes.
+    """
+    filename = f"{id}{suffix}"
+    if layout == "sharded":
+        return f"{shard_prefix(id)}/{filename}"
+    return filename
+
+
+def resolve_audio_path(audio_dir: Path, relpath: str) -> Path:
+    """
+    Return where the file named by a manifest entry actually is.
+
+    The path from the manifest is tried first; if it does not exist the
+    same file name is looked up in the other layout, so folders that are
+    being migrated (or manifests written before it) keep working.
+    """
+    path = audio_dir / relpath
+    if path.exists():
+        return path
+
+    name = PurePosixPath(relpath).name
+    stem = PurePosixPath(name).stem
+    for candidate in (audio_dir / name, audio_dir / shard_prefix(stem) / name):
+        if candidate != path and candidate.exists():
+            return candidate
+
+    return path
+
+
+def iter_audio_files(
+    audio_dir: Union[str, Path], suffixes: tuple[str, ...]
+) -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yield (relative path, entry) for the files in audio_dir and its shard
+    folders that end with one of suffixes. Only scandir is used, no stat
+    calls beyond what the directory listing already provides.
+    """
+    try:
+        with os.scandir(audio_dir) as entries:
+            shards = []
+            for entry in entries:
+                if entry.is_file():
+                    if entry.name.endswith(suffixes):
+                        yield entry.name, entry
+                elif entry.is_dir() and is_shard_name(entry.name):
+                    shards.append(entry)
+    except FileNotFoundError:
+        return
+
+    for shard in shards:
+        with os.scandir(shard.path) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(suffixes):
+                    yield f"{shard.name}/{entry.name}", entry
+
+
+def migrate_speaker(
+    speaker_dir: Union[str, Path],
+    layout: str,
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Move a speaker's takes to the given layout and update its manifest.
+
+    Files are renamed first, in parallel, and the manifest is rewritten
+    atomically afterwards. An interrupted migration leaves a manifest that
+    still resolves through resolve_audio_path and can simply be run again.
+    Cached peaks in <speaker>/peaks/ are moved along, keeping their mtime,
+    so they stay valid.
+
+    Returns:
+        Number of files moved
+    """
+    # reconcile imports this module, so not at the top
+    from helvox.utils.reconcile import write_manifest
+
+    if layout not in AUDIO_LAYOUTS:
+        raise ValueError(f"Unknown audio layout: {layout}")
+
+    speaker_dir = Path(speaker_dir)
+    audio_dir = speaker_dir / "audio"
+    peaks_dir = speaker_dir / "peaks"
+
+    moves = []
+    for relpath, entry in iter_audio_files(audio_dir, (".flac", ".wav")):
+        name = PurePosixPath(relpath)
+        target = audio_relpath(name.stem, layout, suffix=name.suffix)
+        if target != relpath:
+            moves.append((audio_dir, relpath, target))
+    audio_moves = len(moves)
+
+    for relpath, entry in iter_audio_files(peaks_dir, (".npy",)):
+        name = PurePosixPath(relpath)
+        target = audio_relpath(name.stem, layout, suffix=name.suffix)
+        if target != relpath:
+            moves.append((peaks_dir, relpath, target))
+
+    # Create the shard folders once instead of from every worker
+    for folder in {base / PurePosixPath(target).parent for base, _, target in moves}:
+        folder.mkdir(parents=True, exist_ok=True)
+
+    def move(paths: tuple[Path, str, str]) -> None:
+        base, source, target = paths
+        os.replace(base / source, base / target)
+
+    # Renames are cheap locally but slow on network shares, where parallel
+    # requests hide the round trip latency
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(move, moves))
+
+    manifest_path = speaker_dir / "output.json"
+    if manifest_path.exists():
+        with open(manifest_path, mode="r", encoding="utf-8") as f:
+            samples = json.load(f)
+
+        for sample in samples:
+            if not isinstance(sample, dict) or "id" not in sample:
+                continue
+            name = PurePosixPath(sample.get("audio") or f"{sample['id']}.flac")
+            sample["audio"] = audio_relpath(name.stem, layout, suffix=name.suffix)
+
+        write_manifest(manifest_path, samples)
+
+    # Remove shard folders left empty by a migration back to flat
+    if layout == "flat":
+        for folder in (audio_dir, peaks_dir):
+            if not folder.exists():
+                continue
+            for entry in os.scandir(folder):
+                if entry.is_dir() and is_shard_name(entry.name):
+                    try:
+                        os.rmdir(entry.path)
+                    except OSError:
+                        pass
+
+    return audio_moves
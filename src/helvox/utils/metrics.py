@@ -0,0 +1,189 @@
+from typing import Optional
+
+import numpy as np
+
+from helvox.utils.trim import detect_voiced_frames
+from helvox.utils.vad import VadBackend
+
+# Level reported for digital silence instead of -inf
+DB_FLOOR = -120.0
+
+
+def to_db(value: float) -> float:
+    if value <= 0:
+        return DB_FLOOR
+    return max(DB_FLOOR, float(20 * np.log10(value)))
+
+
+def compute_quality_metrics(
+    audio: np.ndarray,
+    sample_rate: int = 48000,
+    aggressiveness: int = 2,
+    frame_duration_ms: int = 30,
+    clip_threshold: float = 0.999,
+    backend: Optional[VadBackend] = None,
+) -> dict:
+    """
+    Compute quality metrics of a take in a few vectorized passes.
+
+    Args:
+        audio: numpy array of audio samples (float32 or int16)
+        sample_rate: sample rate in Hz, resampled for the VAD if needed
+        aggressiveness: VAD aggressiveness (0-3) used to split voiced/silent frames
+        frame_duration_ms: VAD frame size in ms (10, 20, or 30)
+        clip_threshold: fraction of full scale counted as clipped
+        backend: VAD backend deciding the frames (default: WebRTC VAD)
+
+    Returns:
+        Dict with peak_dbfs, rms_dbfs, clipping_ratio, snr_db,
+        leading_silence_s and trailing_silence_s. snr_db is None when the
+        take has no voiced or no silent frames.
+    """
+    # Metrics are computed on the first channel (takes are recorded mono)
+    data = audio[:, 0] if audio.ndim > 1 else audio
+    full_scale = 32768.0 if data.dtype == np.int16 else 1.0
+
+    if len(data) == 0:
+        return {
+            "peak_dbfs": DB_FLOOR,
+            "rms_dbfs": DB_FLOOR,
+            "clipping_ratio": 0.0,
+            "snr_db": None,
+            "leading_silence_s": 0.0,
+            "trailing_silence_s": 0.0,
+        }
+
+    # Peak and clipping, computed on the native dtype
+    peak = max(abs(float(data.max())), abs(float(data.min()))) / full_scale
+    clip_level = clip_threshold * full_scale
+    clipped = int(np.count_nonzero((data >= clip_level) | (data <= -clip_level)))
+
+    # Per-frame energies (sum of squares, accumulated in float64)
+    frame_size = int(sample_rate * frame_duration_ms / 1000)
+    num_frames = len(data) // frame_size
+    frames = data[: num_frames * frame_size].reshape(num_frames, frame_size)
+    frame_energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+
+    # Overall RMS includes the samples after the last complete frame
+    tail = data[num_frames * frame_size :].astype(np.float64)
+    total_energy = float(frame_energy.sum() + np.dot(tail, tail))
+    rms = np.sqrt(total_energy / len(data)) / full_scale
+
+    voiced = detect_voiced_frames(
+        data,
+        sample_rate=sample_rate,
+        aggressiveness=aggressiveness,
+        frame_duration_ms=frame_duration_ms,
+        backend=backend,
+    )
+
+    # SNR estimate: mean energy of voiced frames over mean energy of the rest
+    snr_db = None
+    if voiced.any() and not voiced.all():
+        speech_power = frame_energy[voiced].mean()
+        noise_power = frame_energy[~voiced].mean()
+        if noise_power > 0:
+            snr_db = round(float(10 * np.log10(speech_power / noise_power)), 2)
+
+    # Leading/trailing silence (the whole take counts if nothing is voiced)
+    frame_s = frame_size / sample_rate
+    voiced_idx = np.flatnonzero(voiced)
+    if len(voiced_idx) > 0:
+        leading_silence_s = int(voiced_idx[0]) * frame_s
+        last_voiced_end = (int(voiced_idx[-1]) + 1) * frame_size
+        trailing_silence_s = (len(data) - last_voiced_end) / sample_rate
+    else:
+        leading_silence_s = len(data) / sample_rate
+        trailing_silence_s = len(data) / sample_rate
+
+    return {
+        "peak_dbfs": round(to_db(peak), 2),
+        "rms_dbfs": round(to_db(rms), 2),
+        "clipping_ratio": round(clipped / len(data), 6),
+        "snr_db": snr_db,
+        "leading_silence_s": round(leading_silence_s, 3),
+        "trailing_silence_s": round(trailing_silence_s, 3),
+    }
+
+
+def k_weighting_response(num_bins: int, n_fft: int, sample_rate: int) -> np.ndarray:
+    """
+    Frequency response of the ITU-R BS.1770 K-weighting filter (high shelf
+    followed by a high pass) at the rfft bins of an n_fft point transform.
+    """
+
+    def biquad(b, a):
+        z = np.exp(-2j * np.pi * np.arange(num_bins) / n_fft)
+        return np.polyval(b[::-1], z) / np.polyval(a[::-1], z)
+
+    # Parameters of the bilinear designs that reproduce the 48 kHz
+    # coefficients of the standard at any sample rate
+    k = np.tan(np.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh**0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = biquad(
+        [(vh + vb * k / q + k * k), 2 * (k * k - vh), (vh - vb * k / q + k * k)],
+        [a0, 2 * (k * k - 1), 1 - k / q + k * k],
+    )
+
+    # The high pass keeps unnormalized numerator coefficients, as specified
+    k = np.tan(np.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    high_pass = biquad(
+        [1.0, -2.0, 1.0],
+        [1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0],
+    )
+
+    return shelf * high_pass
+
+
+def integrated_loudness(audio: np.ndarray, sample_rate: int = 48000) -> dict:
+    """
+    Gated loudness of a take after ITU-R BS.1770 (mono).
+
+    The K-weighting is applied in the frequency domain, the take is zero
+    padded so the filter's tail does not wrap around.
+
+    Returns:
+        Dict with integrated_lufs and max_momentary_lufs (400 ms blocks),
+        both None if the take is silent
+    """
+    data = audio[:, 0] if audio.ndim > 1 else audio
+    full_scale = 32768.0 if data.dtype == np.int16 else 1.0
+    data = data.astype(np.float64) / full_scale
+    if len(data) == 0:
+        return {"integrated_lufs": None, "max_momentary_lufs": None}
+
+    n_fft = len(data) + sample_rate // 10
+    spectrum = np.fft.rfft(data, n_fft)
+    response = k_weighting_response(len(spectrum), n_fft, sample_rate)
+    weighted = np.fft.irfft(spectrum * response, n_fft)[: len(data)]
+
+    # Mean square of 400 ms blocks with 75 % overlap
+    block = int(0.4 * sample_rate)
+    step = block // 4
+    power = np.concatenate(([0.0], np.cumsum(weighted**2)))
+    if len(data) < block:
+        starts = np.array([0])
+        block = len(data)
+    else:
+        starts = np.arange(0, len(data) - block + 1, step)
+    block_power = (power[starts + block] - power[starts]) / block
+
+    with np.errstate(divide="ignore"):
+        block_lufs = -0.691 + 10 * np.log10(block_power)
+
+    # Absolute gate at -70 LUFS, then relative gate 10 LU below
+    gated = block_power[block_lufs > -70.0]
+    if len(gated) == 0:
+        return {"integrated_lufs": None, "max_momentary_lufs": None}
+    relative_gate = -0.691 + 10 * np.log10(gated.mean()) - 10.0
+    gated = gated[-0.691 + 10 * np.log10(gated) > relative_gate]
+
+    return {
+        "integrated_lufs": round(float(-0.691 + 10 * np.log10(gated.mean())), 2),
+        "max_momentary_lufs": round(float(block_lufs.max()), 2),
+    }
@@ -0,0 +1,94 @@
+import math
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+# Number of (min, max) pairs stored per file, enough for a thumbnail
+PEAKS_RESOLUTION = 200
+
+
+def compute_peaks(
+    audio_path: Union[str, Path], num_pairs: int = PEAKS_RESOLUTION
+) -> np.ndarray:
+    """
+    Compute (min, max) pairs of an audio file, reading it block by block.
+
+    Only one block of samples is in memory at a time, so the cost does not
+    depend on the length of the file.
+
+    Returns:
+        float32 array of shape (num_pairs, 2) in full-scale units [-1, 1]
+    """
+    peaks = np.zeros((num_pairs, 2), dtype=np.float32)
+
+    with sf.SoundFile(audio_path) as f:
+        if f.frames == 0:
+            return peaks
+
+        samples_per_pair = max(1, math.ceil(f.frames / num_pairs))
+        for i, block in enumerate(
+            f.blocks(blocksize=samples_per_pair, dtype="float32", always_2d=True)
+        ):
+            if i >= num_pairs:
+                break
+            channel = block[:, 0]
+            peaks[i] = (channel.min(), channel.max())
+
+    return peaks
+
+
+def peaks_cache_path(
+    audio_path: Union[str, Path],
+    cache_dir: Path,
+    audio_dir: Optional[Union[str, Path]] = None,
+) -> Path:
+    # Mirrors where the file is within audio_dir, shard folder included
+    audio_path = Path(audio_path)
+    relpath = Path(audio_path.name)
+    if audio_dir is not None:
+        try:
+            relpath = audio_path.relative_to(audio_dir)
+        except ValueError:
+            pass
+    return cache_dir / relpath.with_suffix(".npy")
+
+
+def load_peaks(
+    audio_path: Union[str, Path],
+    cache_dir: Union[str, Path],
+    num_pairs: int = PEAKS_RESOLUTION,
+    audio_dir: Optional[Union[str, Path]] = None,
+) -> np.ndarray:
+    """
+    Return the peaks of an audio file from the on-disk cache, computing and
+    storing them on first use or when the audio file is newer than the cache.
+
+    With audio_dir, the cache file sits at the audio file's path relative
+    to it, so a sharded audio folder gives a sharded cache.
+    """
+    audio_path = Path(audio_path)
+    cache_dir = Path(cache_dir)
+    cache_path = peaks_cache_path(audio_path, cache_dir, audio_dir)
+
+    try:
+        if cache_path.stat().st_mtime_ns >= audio_path.stat().st_mtime_ns:
+            peaks = np.load(cache_path)
+            if peaks.shape == (num_pairs, 2):
+                return peaks
+    except (OSError, ValueError):
+        pass
+
+    peaks = compute_peaks(audio_path, num_pairs=num_pairs)
+
+    if not cache_path.parent.exists():
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write atomically so a concurrent reader never sees a partial file
+    tmp_path = cache_path.with_suffix(".tmp.npy")
+    np.save(tmp_path, peaks)
+    os.replace(tmp_path, cache_path)
+
+    return peaks
@@ -1,7 +1,7 @@
 import platform
 from pathlib import Path
 
-from platformdirs import user_data_path
+from platformdirs import user_config_path, user_data_path
 
 
 def app_font(size: int, *, bold: bool = False) -> tuple[str, int] | tuple[str, int, str]:
@@ -22,3 +22,7 @@ def app_font(size: int, *, bold: bool = False) -> tuple[str, int] | tuple[str, i
 
 def default_recordings_dir() -> Path:
     return user_data_path(appname="helvox", appauthor="noxenum") / "recordings"
+
+
+def settings_file() -> Path:
+    return user_config_path(appname="helvox", appauthor="noxenum") / "config.ini"
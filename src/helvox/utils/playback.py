@@ -0,0 +1,232 @@
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+import sounddevice as sd
+import soundfile as sf
+
+
+class StreamingFilePlayer:
+    """
+    Plays an audio file block by block instead of loading it whole.
+
+    A reader thread decodes blocks into a small bounded queue and the output
+    stream callback drains it, so memory stays flat regardless of file length.
+    """
+
+    def __init__(self, blocksize: int = 2048, buffer_blocks: int = 16) -> None:
+        self.blocksize = blocksize
+        self.buffer_blocks = buffer_blocks
+
+        self.stream: Optional[sd.OutputStream] = None
+        self.reader: Optional[threading.Thread] = None
+        self.blocks: queue.Queue = queue.Queue(maxsize=buffer_blocks)
+        self.stop_event = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.stream is not None and self.stream.active
+
+    def play(self, audio_path: Union[str, Path]) -> None:
+        self.stop()
+
+        audio_file = sf.SoundFile(audio_path)
+        self.blocks = queue.Queue(maxsize=self.buffer_blocks)
+        self.stop_event = threading.Event()
+
+        blocks = self.blocks
+        stop_event = self.stop_event
+
+        def read_blocks():
+            try:
+                for block in audio_file.blocks(
+                    blocksize=self.blocksize, dtype="float32", always_2d=True
+                ):
+                    while not stop_event.is_set():
+                        try:
+                            blocks.put(block, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop_event.is_set():
+                        break
+            finally:
+                audio_file.close()
+                # End of file marker
+                if not stop_event.is_set():
+                    blocks.put(None)
+
+        def callback(outdata, frames, time, status):
+            if status:
+                print(status)
+
+            try:
+                block = blocks.get_nowait()
+            except queue.Empty:
+                # Reader fell behind, play silence instead of blocking
+                outdata.fill(0)
+                return
+
+            if block is None:
+                outdata.fill(0)
+                raise sd.CallbackStop
+
+            outdata[: len(block)] = block
+            outdata[len(block) :] = 0
+
+        self.stream = sd.OutputStream(
+            samplerate=audio_file.samplerate,
+            channels=audio_file.channels,
+            dtype="float32",
+            blocksize=self.blocksize,
+            callback=callback,
+        )
+
+        self.reader = threading.Thread(target=read_blocks, daemon=True)
+        self.reader.start()
+        self.stream.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Error stopping playback stream: {e}")
+            finally:
+                self.stream = None
+
+        if self.reader is not None:
+            self.reader.join(timeout=1.0)
+            self.reader = None
+
+
+class PlaybackEngine:
+    """
+    Low-latency playback through one persistent output stream.
+
+    The stream is opened once and keeps running; its callback copies frames
+    from the current buffer (or silence when idle). Starting, stopping and
+    seeking only swap a few attributes under a short lock, so they take
+    effect within one audio block. A region of a buffer is played by
+    offsets, the buffer itself is never copied.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 1,
+        dtype: str = "float32",
+        device: Optional[int] = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.dtype = dtype
+        self.device = device
+
+        self.stream: Optional[sd.OutputStream] = None
+        self.lock = threading.Lock()
+
+        self.buffer = None
+        self.start = 0
+        self.end = 0
+        self.position = 0
+        self.playing = False
+
+    @property
+    def config(self) -> tuple:
+        return (self.sample_rate, self.channels, self.dtype, self.device)
+
+    @property
+    def active(self) -> bool:
+        return self.playing
+
+    def ensure_stream(self) -> None:
+        if self.stream is not None:
+            return
+
+        self.stream = sd.OutputStream(
+            device=self.device,
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype=self.dtype,
+            latency="low",
+            callback=self.callback,
+        )
+        self.stream.start()
+
+    def callback(self, outdata, frames, time, status) -> None:
+        if status:
+            print(status)
+
+        with self.lock:
+            if not self.playing or self.buffer is None:
+                outdata.fill(0)
+                return
+
+            count = min(frames, self.end - self.position)
+            # Mono buffers are 1D, outdata is always (frames, channels)
+            chunk = self.buffer[self.position : self.position + count]
+            outdata[:count] = chunk.reshape(count, -1)
+            outdata[count:] = 0
+
+            self.position += count
+            if self.position >= self.end:
+                self.playing = False
+
+    def play(self, audio, start: int = 0, end: Optional[int] = None) -> None:
+        """Play audio[start:end] without copying it."""
+        if audio is None:
+            return
+
+        self.ensure_stream()
+
+        with self.lock:
+            self.buffer = audio
+            self.start = max(0, start)
+            self.end = len(audio) if end is None else min(end, len(audio))
+            self.position = self.start
+            self.playing = self.start < self.end
+
+    def stop(self) -> None:
+        with self.lock:
+            self.playing = False
+
+    def release(self) -> None:
+        """Stop and drop the reference to the current buffer."""
+        with self.lock:
+            self.playing = False
+            self.buffer = None
+            self.start = self.end = self.position = 0
+
+    def seek(self, seconds: float) -> None:
+        """Move the playhead to seconds from the start of the current region."""
+        with self.lock:
+            if self.buffer is None:
+                return
+            position = self.start + int(seconds * self.sample_rate)
+            self.position = min(max(self.start, position), self.end)
+
+    def get_position(self) -> float:
+        """Playhead position in seconds from the start of the current region."""
+        return (self.position - self.start) / self.sample_rate
+
+    def get_duration(self) -> float:
+        return (self.end - self.start) / self.sample_rate
+
+    def close(self) -> None:
+        self.stop()
+
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception as e:
+                print(f"Error closing playback stream: {e}")
+            finally:
+                self.stream = None
+
+        self.buffer = None
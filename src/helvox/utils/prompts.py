@@ -0,0 +1,154 @@
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import accumulate
+from typing import Optional
+
+
+class PromptRecord(Mapping):
+    """
+    Read-only view of one prompt in a PromptStore.
+
+    Behaves like the prompt's dict, restricted to the stored columns, and
+    decodes a text only when it is looked up.
+    """
+
+    __slots__ = ("store", "id", "row")
+
+    def __init__(self, store: "PromptStore", id: str, row: int) -> None:
+        self.store = store
+        self.id = id
+        self.row = row
+
+    def __getitem__(self, key: str) -> str:
+        if key == "id":
+            return self.id
+
+        column = self.store.column_index.get(key)
+        value = None if column is None else self.store.text(self.row, column)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        # Skips the KeyError round trip of Mapping.get, this is the hot path
+        if key == "id":
+            return self.id
+
+        column = self.store.column_index.get(key)
+        value = None if column is None else self.store.text(self.row, column)
+        return default if value is None else value
+
+    def __iter__(self) -> Iterator[str]:
+        yield "id"
+        for column, name in enumerate(self.store.columns):
+            if self.store.present[column][self.row]:
+                yield name
+
+    def __len__(self) -> int:
+        return 1 + sum(present[self.row] for present in self.store.present)
+
+    def __repr__(self) -> str:
+        return f"PromptRecord({dict(self)!r})"
+
+
+class PromptStore:
+    """
+    Compact in-memory store of the input prompts.
+
+    Keeps only the given text columns. Each column is one UTF-8 buffer with
+    an array of offsets into it, so a prompt costs a few bytes of overhead
+    instead of a dict and a str object per field. Ids are interned and map
+    to row numbers; lookups return PromptRecord views.
+
+    Supports the parts of the dict interface the recorder uses: get, in,
+    len, indexing and iterating over the ids in input order.
+    """
+
+    def __init__(self, columns: Iterable[str]) -> None:
+        self.columns = tuple(columns)
+        self.column_index = {name: i for i, name in enumerate(self.columns)}
+        self.rows: dict[str, int] = {}
+        self.row_count = 0
+        self.buffers = [bytearray() for _ in self.columns]
+        self.offsets = [array("Q", [0]) for _ in self.columns]
+        self.present = [bytearray() for _ in self.columns]
+
+    @classmethod
+    def from_samples(
+        cls, samples: Iterable[dict], columns: Iterable[str]
+    ) -> "PromptStore":
+        """Build a store from parsed samples, one column at a time."""
+        store = cls(columns)
+        samples = list(samples)
+
+        for sample in samples:
+            store.rows[sys.intern(str(sample["id"]))] = store.row_count
+            store.row_count += 1
+
+        for column, name in enumerate(store.columns):
+            values = [sample.get(name) for sample in samples]
+            encoded = [
+                b"" if value is None else str(value).encode("utf-8") for value in values
+            ]
+            store.buffers[column] = bytearray(b"".join(encoded))
+            store.offsets[column].extend(accumulate(map(len, encoded)))
+            store.present[column] = bytearray(value is not None for value in values)
+
+        return store
+
+    def append(self, sample: dict) -> None:
+        # Rows are never rewritten, a duplicate id points to its latest row
+        row = self.row_count
+        self.rows[sys.intern(str(sample["id"]))] = row
+        self.row_count += 1
+
+        for column, name in enumerate(self.columns):
+            value = sample.get(name)
+            if value is not None:
+                self.buffers[column] += str(value).encode("utf-8")
+            self.offsets[column].append(len(self.buffers[column]))
+            self.present[column].append(value is not None)
+
+    def text(self, row: int, column: int) -> Optional[str]:
+        if not self.present[column][row]:
+            return None
+
+        offsets = self.offsets[column]
+        start, end = offsets[row], offsets[row + 1]
+        return self.buffers[column][start:end].decode("utf-8")
+
+    def get(self, id: str, default=None):
+        row = self.rows.get(id)
+        if row is None:
+            return default
+        return PromptRecord(self, id, row)
+
+    def __getitem__(self, id: str) -> PromptRecord:
+        return PromptRecord(self, id, self.rows[id])
+
+    def __contains__(self, id: object) -> bool:
+        return id in self.rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def keys(self):
+        return self.rows.keys()
+
+    def nbytes(self) -> int:
+        """Size of the text buffers, offsets and presence flags."""
+        return sum(
+            len(buffer) + offsets.itemsize * len(offsets) + len(present)
+            for buffer, offsets, present in zip(
+                self.buffers, self.offsets, self.present
+            )
+        )
+
+
+def prompt_columns(dialect: str) -> tuple[str, ...]:
+    """The input columns the recorder reads for a speaker of dialect."""
+    return ("de", "ch", f"ch_{dialect.lower()}")
@@ -0,0 +1,285 @@
+import json
+import math
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Optional, Union
+
+from helvox.utils.encoding import PENDING_SUFFIX
+from helvox.utils.layout import iter_audio_files, resolve_audio_path
+
+# Manifest entries written before the sample rate was stored used this rate
+DEFAULT_SAMPLE_RATE = 48000
+
+# Upper bound used for the size plausibility check: 24-bit PCM never
+# compresses to more than its raw size, plus some slack for metadata
+MAX_BYTES_PER_SAMPLE = 3
+HEADER_SLACK_BYTES = 8192
+
+# Lower bound: every FLAC frame takes at least a frame header, a subframe
+# header, one sample and a CRC, even for digital silence. libFLAC frames
+# hold at most 4608 samples at the levels the encoding profiles use.
+MAX_SAMPLES_PER_FRAME = 4608
+MIN_BYTES_PER_FRAME = 10
+
+# "fLaC" marker + metadata block header + STREAMINFO block
+FLAC_HEADER_BYTES = 42
+
+
+def read_flac_duration(path: Union[str, Path]) -> Optional[float]:
+    """
+    Read the duration of a FLAC file from its STREAMINFO block.
+
+    Only the first 42 bytes are read, no audio is decoded. Returns None if
+    the file is not a valid FLAC file or does not declare its length.
+    """
+    try:
+        with open(path, mode="rb") as f:
+            header = f.read(FLAC_HEADER_BYTES)
+    except OSError:
+        return None
+
+    if len(header) < FLAC_HEADER_BYTES or header[:4] != b"fLaC":
+        return None
+
+    # STREAMINFO starts after the 4 byte marker and 4 byte block header.
+    # Bytes 10-17 hold: sample rate (20 bits), channels (3), bits per
+    # sample (5) and total samples (36).
+    (packed,) = struct.unpack(">Q", header[18:26])
+    sample_rate = packed >> 44
+    total_samples = packed & 0xFFFFFFFFF
+
+    if sample_rate == 0 or total_samples == 0:
+        return None
+
+    return total_samples / sample_rate
+
+
+def scan_audio_folder(audio_dir: Path) -> dict[str, int]:
+    """
+    Map file paths relative to audio_dir to their size using scandir/stat
+    only. Shard folders of the sharded layout are included.
+
+    Includes WAV files still waiting for their FLAC conversion.
+    """
+    return {
+        relpath: entry.stat().st_size
+        for relpath, entry in iter_audio_files(audio_dir, (".flac", PENDING_SUFFIX))
+    }
+
+
+def is_plausible_size(size: int, duration_s: float, sample_rate: int) -> bool:
+    if duration_s <= 0:
+        return size >= FLAC_HEADER_BYTES
+
+    # A file that holds audio has at least one frame after the header
+    if size <= FLAC_HEADER_BYTES:
+        return False
+
+    # Too small for the duration means the manifest claims too much
+    frames = math.ceil(duration_s * sample_rate / MAX_SAMPLES_PER_FRAME)
+    min_size = FLAC_HEADER_BYTES + frames * MIN_BYTES_PER_FRAME
+
+    max_size = duration_s * sample_rate * MAX_BYTES_PER_SAMPLE + HEADER_SLACK_BYTES
+    return min_size <= size <= max_size
+
+
+def reconcile_speaker(speaker_dir: Union[str, Path], exact: bool = False) -> dict:
+    """
+    Compare a speaker's output.json with the files in its audio folder.
+
+    Args:
+        speaker_dir: folder containing output.json and audio/
+        exact: read each FLAC header to compare durations exactly instead
+            of checking file sizes for plausibility
+
+    Returns:
+        Report dict with the orphaned file names, the ids with missing
+        audio and the ids whose duration does not match their file. If the
+        manifest cannot be read, error holds the reason and nothing else
+        is checked.
+    """
+    speaker_dir = Path(speaker_dir)
+    audio_dir = speaker_dir / "audio"
+    manifest_path = speaker_dir / "output.json"
+
+    samples = []
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # e.g. truncated by a crash, every file would look orphaned
+            return {
+                "speaker": speaker_dir.name,
+                "speaker_dir": str(speaker_dir),
+                "orphaned": [],
+                "missing": [],
+                "mismatched": [],
+                "error": f"output.json unreadable ({e})",
+            }
+        if isinstance(data, list):
+            samples = [sample for sample in data if isinstance(sample, dict)]
+
+    files = scan_audio_folder(audio_dir)
+
+    missing = []
+    mismatched = []
+    referenced = set()
+
+    # Manifests may still name the files of the other layout
+    by_name = {PurePosixPath(relpath).name: relpath for relpath in files}
+
+    def locate(relpath: str) -> str:
+        if relpath in files:
+            return relpath
+        return by_name.get(PurePosixPath(relpath).name, relpath)
+
+    for sample in samples:
+        filename = locate(sample.get("audio") or f"{sample.get('id')}.flac")
+        pending = locate(str(PurePosixPath(filename).with_suffix(PENDING_SUFFIX)))
+        referenced.add(filename)
+        referenced.add(pending)
+
+        size = files.get(filename)
+        if size is None:
+            # Not converted yet, the WAV file is checked once it is FLAC
+            if pending not in files:
+                missing.append(str(sample.get("id")))
+            continue
+
+        duration_s = float(sample.get("duration_s", 0.0))
+        if exact:
+            file_duration = read_flac_duration(audio_dir / filename)
+            if file_duration is None or abs(file_duration - duration_s) > 0.01:
+                mismatched.append(str(sample.get("id")))
+        else:
+            sample_rate = int(sample.get("sample_rate", DEFAULT_SAMPLE_RATE))
+            if not is_plausible_size(size, duration_s, sample_rate):
+                mismatched.append(str(sample.get("id")))
+
+    orphaned = sorted(name for name in files if name not in referenced)
+
+    return {
+        "speaker": speaker_dir.name,
+        "speaker_dir": str(speaker_dir),
+        "orphaned": orphaned,
+        "missing": missing,
+        "mismatched": mismatched,
+        "error": None,
+    }
+
+
+def find_speaker_dirs(output_folder: Union[str, Path]) -> list[Path]:
+    speaker_dirs = []
+
+    try:
+        with os.scandir(output_folder) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                path = Path(entry.path)
+                if (path / "output.json").exists() or (path / "audio").is_dir():
+                    speaker_dirs.append(path)
+    except FileNotFoundError:
+        pass
+
+    return sorted(speaker_dirs)
+
+
+def reconcile_output_folder(
+    output_folder: Union[str, Path],
+    exact: bool = False,
+    max_workers: Optional[int] = None,
+) -> list[dict]:
+    """Reconcile every speaker folder below output_folder in parallel."""
+    speaker_dirs = find_speaker_dirs(output_folder)
+    if not speaker_dirs:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(lambda path: reconcile_speaker(path, exact), speaker_dirs)
+        )
+
+
+def has_issues(report: dict) -> bool:
+    return bool(
+        report["orphaned"]
+        or report["missing"]
+        or report["mismatched"]
+        or report.get("error")
+    )
+
+
+def format_report(report: dict) -> str:
+    if report.get("error"):
+        return f"{report['speaker']}: {report['error']}, fix it by hand"
+    return (
+        f"{report['speaker']}: {len(report['orphaned'])} orphaned, "
+        f"{len(report['missing'])} missing, "
+        f"{len(report['mismatched'])} mismatched"
+    )
+
+
+def write_manifest(manifest_path: Path, samples: list[dict]) -> None:
+    """Write a manifest atomically so a crash never leaves it half written."""
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    with open(tmp_path, mode="w", encoding="utf-8") as f:
+        json.dump(samples, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, manifest_path)
+
+
+def repair_speaker(report: dict) -> None:
+    """
+    Repair the issues found by reconcile_speaker.
+
+    Orphaned files are moved to <speaker>/orphaned/ and entries without
+    audio are removed from the manifest, so their prompts are recorded
+    again. Mismatched durations are corrected from the FLAC header; files
+    without a readable header are treated like missing audio.
+    """
+    # An unreadable manifest needs a person, not a repair
+    if report.get("error"):
+        return
+
+    speaker_dir = Path(report["speaker_dir"])
+    audio_dir = speaker_dir / "audio"
+    orphaned_dir = speaker_dir / "orphaned"
+    manifest_path = speaker_dir / "output.json"
+
+    def move_to_orphaned(filename: str) -> None:
+        orphaned_dir.mkdir(parents=True, exist_ok=True)
+        path = resolve_audio_path(audio_dir, filename)
+        os.replace(path, orphaned_dir / path.name)
+
+    for filename in report["orphaned"]:
+        move_to_orphaned(filename)
+
+    if not (report["missing"] or report["mismatched"]):
+        return
+
+    with open(manifest_path, mode="r", encoding="utf-8") as f:
+        samples = json.load(f)
+
+    drop_ids = set(report["missing"])
+    mismatched_ids = set(report["mismatched"])
+    repaired = []
+
+    for sample in samples:
+        sample_id = str(sample.get("id"))
+        if sample_id in drop_ids:
+            continue
+
+        if sample_id in mismatched_ids:
+            filename = sample.get("audio") or f"{sample_id}.flac"
+            duration_s = read_flac_duration(resolve_audio_path(audio_dir, filename))
+            if duration_s is None:
+                move_to_orphaned(filename)
+                continue
+            sample["duration_s"] = duration_s
+
+        repaired.append(sample)
+
+    write_manifest(manifest_path, repaired)
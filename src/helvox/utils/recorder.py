@@ -1,5 +1,8 @@
 import configparser
-import json
+import socket
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Union
 
@@ -8,8 +11,42 @@ import sounddevice as sd
 import soundfile as sf
 from sounddevice import CallbackFlags
 
-from helvox.utils.data import read_dataset
-from helvox.utils.trim import trim_silence
+from helvox.utils.coordinator import Coordinator, SQLiteCoordinator
+from helvox.utils.data import file_stamp, read_dataset
+from helvox.utils.encoding import (
+    DEFAULT_ENCODING_PROFILE,
+    BackgroundTranscoder,
+    EncodingProfile,
+    get_encoding_profile,
+    pending_path,
+)
+from helvox.utils.endpointing import RECORDING, Endpointer
+from helvox.utils.hooks import (
+    JOBS_FILENAME,
+    HookPipeline,
+    JobStore,
+    get_post_save_hook,
+)
+from helvox.utils.layout import (
+    AUDIO_LAYOUTS,
+    DEFAULT_AUDIO_LAYOUT,
+    audio_relpath,
+    resolve_audio_path,
+)
+from helvox.utils.metrics import compute_quality_metrics
+from helvox.utils.playback import PlaybackEngine
+from helvox.utils.prompts import PromptStore, prompt_columns
+from helvox.utils.reconcile import write_manifest
+from helvox.utils.resample import resample
+from helvox.utils.scheduler import (
+    PromptScheduler,
+    SequentialScheduler,
+    get_scheduler,
+)
+from helvox.utils.search import PromptIndex, build_prompt_index
+from helvox.utils.tracing import span, tracer
+from helvox.utils.trim import find_speech_bounds
+from helvox.utils.vad import VadBackend, adapt_vad_backend, get_vad_backend
 
 
 class Recorder:
@@ -18,37 +55,116 @@ class Recorder:
         output_folder: Union[str, Path],
         sample_rate: int = 48000,
         channels: int = 1,
+        dtype: str = "float32",
     ) -> None:
         self.recording = False
         self.monitoring = False
         self.output_folder = Path(output_folder)
+        # Takes are stored at sample_rate. With native_rate the streams run
+        # at the device's default rate instead and each take is resampled
+        # once, which avoids on the fly resampling by PortAudio or the OS.
         self.sample_rate = sample_rate
+        self.native_rate = True
+        self.capture_rate = sample_rate
         self.channels = channels
+        self.dtype = dtype
 
         self.device_map = {}
         self.current_level = -60.0  # dB
+        self.audio_data = []
         self.full_audio = None
         self.trimmed_audio = None
+        self.trim_bounds = None
+        self.last_metrics = None
+
+        # Concatenating, resampling and trimming a take runs on this worker
+        # so the UI stays responsive. take_serial changes whenever the take
+        # is released, a finalize job for an older take then drops its result.
+        self.finalizer: Optional[ThreadPoolExecutor] = None
+        self.finalize_future: Optional[Future] = None
+        self.take_serial = 0
+        self.take_lock = threading.Lock()
+
+        # Persistent output stream for previews, created on first use
+        self.player: Optional[PlaybackEngine] = None
+
+        # Live waveform: the recording callback appends one (min, max) column
+        # per live_column_s of audio, the UI pops them. deque append/popleft
+        # are atomic, so no lock is needed between the two threads.
+        self.live_column_s = 0.025
+        self.live_peaks = deque(maxlen=4096)
+
+        # Voice activity detection settings used for trimming and metrics
+        self.vad_backend = "webrtc"
+        self.vad_aggressiveness = 2
+        self.frame_duration_ms = 30
+        self.padding_duration_s = 0.1
+
+        # Hands-free mode: the monitor stream starts and ends takes on its own
+        self.hands_free = False
+        self.trailing_silence_s = 0.8
+        self.auto_save = False
+        self.endpointer: Optional[Endpointer] = None
+        self.endpointer_config = None
+
+        # How takes are written, deferred profiles convert to FLAC later
+        self.encoding_profile = DEFAULT_ENCODING_PROFILE
+        self.transcoder: Optional[BackgroundTranscoder] = None
+
+        # Flat or sharded (hashed subfolders) audio folder
+        self.audio_layout = DEFAULT_AUDIO_LAYOUT
+
+        # Processing steps run for every saved take in worker processes
+        self.post_save_hooks: list[str] = []
+        self.hook_workers = 2
+        self.hook_copy_folder = ""
+        self.pipeline: Optional[HookPipeline] = None
+        self.pipeline_config = None
 
         self.monitor_stream = None
         self.stream = None
 
         self.selected_device = ""
+        self.trace_file = ""
         self.speaker_id = "unknown"
         self.speaker_dialect = "AG"
         self.input_file = ""
         self.output_file = ""
         self.skipped_file = ""
 
-        self.input_data = []
-        self.input_index = {}
+        self.input_index = PromptStore(prompt_columns(self.speaker_dialect))
         self.output_data = []
         self.output_index = {}
         self.skipped_ids = []
 
-        self.open_ids = []
         self.total_duration = 0
 
+        # Order in which the open prompts are handed out
+        self.prompt_order = "sequential"
+        self.prompt_seed = 0
+        self.scheduler: PromptScheduler = SequentialScheduler()
+
+        # Search over the session's prompts, built in the background
+        self.search_index: Optional[PromptIndex] = None
+        self.search_key = None
+        self.search_pending_ids: list[str] = []
+
+        # Change detection: what the loaded input corpus was read from, and
+        # the most recently used speaker sessions (manifest and skip list)
+        self.input_key = None
+        self.session_cache_size = 8
+        self.sessions: OrderedDict[tuple, dict] = OrderedDict()
+
+        # Optional multi-station coordination: ids are leased in batches
+        self.coordinator: Optional[Coordinator] = None
+        self.coordinator_file = ""
+        self.station_id = socket.gethostname()
+        self.lease_batch_size = 8
+        self.pending_ids = []
+        self.leased_ids = set()
+        # Dialect the leases were taken for, the setting may change since
+        self.leased_dialect = self.speaker_dialect
+
     def get_audio_devices(self) -> dict:
         devices = sd.query_devices()
         device_map = {}
@@ -66,7 +182,9 @@ class Recorder:
         if len(audio_data) == 0:
             return -60.0
 
-        # Calculate RMS
+        # Calculate RMS (int16 samples are scaled to [-1, 1] first)
+        if audio_data.dtype == np.int16:
+            audio_data = audio_data.astype(np.float32) / 32768.0
         rms = np.sqrt(np.mean(audio_data**2))
 
         # Convert to dB (with floor to avoid log(0))
@@ -86,6 +204,9 @@ class Recorder:
             return
 
         self.monitoring = True
+        self.capture_rate = self.get_capture_rate(device_idx)
+        endpointer = self.configure_endpointer()
+        fold_live_peaks = self.make_live_peaks_folder()
 
         def monitor_callback(indata: np.ndarray, frames, time, status: CallbackFlags):
             if status:
@@ -94,14 +215,21 @@ class Recorder:
             # Calculate level
             self.current_level = self.calculate_rms_db(indata)
 
+            if endpointer is not None:
+                endpointer.process(indata)
+                if endpointer.state == RECORDING:
+                    fold_live_peaks(indata, frames)
+
         try:
-            self.monitor_stream = sd.InputStream(
-                device=device_idx,
-                channels=self.channels,
-                samplerate=self.sample_rate,
-                callback=monitor_callback,
-            )
-            self.monitor_stream.start()
+            with span("stream.open", stream="monitor"):
+                self.monitor_stream = sd.InputStream(
+                    device=device_idx,
+                    channels=self.channels,
+                    samplerate=self.capture_rate,
+                    dtype=self.dtype,
+                    callback=monitor_callback,
+                )
+                self.monitor_stream.start()
         except Exception as e:
             print(f"Error starting monitor stream: {e}")
             self.monitoring = False
@@ -109,8 +237,9 @@ class Recorder:
     def stop_monitoring(self) -> None:
         if self.monitoring and self.monitor_stream:
             try:
-                self.monitor_stream.stop()
-                self.monitor_stream.close()
+                with span("stream.close", stream="monitor"):
+                    self.monitor_stream.stop()
+                    self.monitor_stream.close()
             except Exception as e:
                 print(f"Error stopping monitor stream: {e}")
             finally:
@@ -121,6 +250,79 @@ class Recorder:
     def get_current_level(self) -> float:
         return self.current_level
 
+    def make_live_peaks_folder(self):
+        """Return a function folding audio blocks into live waveform columns."""
+        column_samples = max(1, int(self.capture_rate * self.live_column_s))
+        full_scale = 32768.0 if self.dtype == "int16" else 1.0
+        column = {"min": 0.0, "max": 0.0, "samples": 0}
+
+        def fold(indata: np.ndarray, frames: int) -> None:
+            if frames > 0:
+                column["min"] = min(column["min"], float(indata.min()))
+                column["max"] = max(column["max"], float(indata.max()))
+                column["samples"] += frames
+            if column["samples"] >= column_samples:
+                self.live_peaks.append(
+                    (column["min"] / full_scale, column["max"] / full_scale)
+                )
+                column.update(min=0.0, max=0.0, samples=0)
+
+        return fold
+
+    def configure_endpointer(self) -> Optional[Endpointer]:
+        if not self.hands_free:
+            self.endpointer = None
+            return None
+
+        # Keep the current one so a held take stays held across restarts
+        config = (
+            self.capture_rate,
+            self.vad_backend,
+            self.frame_duration_ms,
+            self.trailing_silence_s,
+        )
+        if self.endpointer is not None and self.endpointer_config == config:
+            self.endpointer.restart()
+            return self.endpointer
+
+        backend = adapt_vad_backend(
+            self.get_vad(), self.capture_rate, self.frame_duration_ms
+        )
+        if not backend.supports(self.capture_rate, self.frame_duration_ms):
+            print(
+                f"{backend.name} VAD does not support {self.capture_rate} Hz, "
+                "hands-free recording disabled"
+            )
+            self.endpointer = None
+            return None
+
+        self.endpointer_config = config
+        self.endpointer = Endpointer(
+            backend,
+            sample_rate=self.capture_rate,
+            frame_duration_ms=self.frame_duration_ms,
+            trailing_silence_s=self.trailing_silence_s,
+        )
+        return self.endpointer
+
+    def is_hands_free_recording(self) -> bool:
+        return self.endpointer is not None and self.endpointer.state == RECORDING
+
+    def pop_hands_free_take(self) -> Optional[list]:
+        if self.endpointer is None:
+            return None
+        return self.endpointer.pop_take()
+
+    def arm_hands_free(self) -> None:
+        if self.endpointer is not None:
+            self.endpointer.arm()
+
+    def pop_live_peaks(self) -> list[tuple[float, float]]:
+        peaks = []
+        while self.live_peaks:
+            peaks.append(self.live_peaks.popleft())
+        return peaks
+
     def start_recording(self):
         if not self.selected_device:
             return
@@ -134,6 +336,17 @@ class Recorder:
         self.recording = True
         self.audio_data = []
 
+        # Release the previous take before capturing the next one
+        self.release_take()
+
+        # A manual take is reviewed like a hands-free one
+        if self.endpointer is not None:
+            self.endpointer.hold()
+
+        self.live_peaks.clear()
+        self.capture_rate = self.get_capture_rate(device_idx)
+        fold_live_peaks = self.make_live_peaks_folder()
+
         def callback(indata: np.ndarray, frames, time, status: CallbackFlags):
             if status:
                 print(status)
@@ -142,57 +355,292 @@ class Recorder:
             # Update level during recording
             self.current_level = self.calculate_rms_db(indata)
 
-        self.stream = sd.InputStream(
-            device=device_idx,
-            channels=self.channels,
-            samplerate=self.sample_rate,
-            callback=callback,
-        )
+            # Fold this block's peaks into the current live waveform column
+            fold_live_peaks(indata, frames)
 
-        self.stream.start()
+        with span("stream.open", stream="recording"):
+            self.stream = sd.InputStream(
+                device=device_idx,
+                channels=self.channels,
+                samplerate=self.capture_rate,
+                dtype=self.dtype,
+                callback=callback,
+            )
+
+            self.stream.start()
 
     def stop_recording(self) -> None:
-        if self.recording and self.stream:
+        """Stop recording and wait until the take is finalized."""
+        future = self.stop_recording_async()
+        if future is not None:
+            future.result()
+
+    def stop_recording_async(self) -> Optional[Future]:
+        """
+        Stop recording and finalize the take on the worker thread.
+
+        Returns:
+            Future resolved once full_audio and trimmed_audio are set, or
+            None if nothing was recorded
+        """
+        if not (self.recording and self.stream):
+            return None
+
+        with span("stream.close", stream="recording"):
             self.stream.stop()
             self.stream.close()
-            self.recording = False
+        self.recording = False
 
-            if self.audio_data:
-                self.full_audio = np.concatenate(self.audio_data, axis=0)
+        future = None
+        if self.audio_data:
+            blocks = self.audio_data
+            # Release the block list right away, the take will live in
+            # full_audio only
+            self.audio_data = []
+            future = self.finish_take_async(blocks)
 
-                self.trimmed_audio = trim_silence(
-                    self.full_audio,
-                    sample_rate=self.sample_rate,
-                    aggressiveness=2,
-                    frame_duration_ms=30,
-                    padding_duration_s=0.1,
-                )
+        # Restart monitoring after recording stops
+        self.start_monitoring()
+        return future
 
-            # Restart monitoring after recording stops
-            self.start_monitoring()
+    def finish_take(self, blocks: list) -> None:
+        """Join the captured blocks into full_audio and find the speech."""
+        self.finish_take_async(blocks).result()
 
-    def save_audio(self, filename: str) -> float:
-        audio_path = self.output_folder / self.speaker_id / "audio" / f"{filename}.flac"
+    def finish_take_async(self, blocks: list) -> Future:
+        if self.finalizer is None:
+            self.finalizer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="finalize"
+            )
+
+        # The settings are read now, the worker must not see later changes
+        serial = self.take_serial
+        capture_rate = self.capture_rate
+        sample_rate = self.sample_rate
+        backend = self.get_vad()
+
+        def finalize() -> None:
+            with span("concatenate", blocks=len(blocks)):
+                full_audio = np.concatenate(blocks, axis=0)
+
+            # Blocks arrive at the capture rate, everything after this point
+            # (trimming, previews, saving) works at the stored rate
+            if capture_rate != sample_rate:
+                with span("resample", samples=len(full_audio)):
+                    full_audio = resample(full_audio, capture_rate, sample_rate)
+
+            with span("trim_silence", samples=len(full_audio)):
+                bounds = find_speech_bounds(
+                    full_audio,
+                    sample_rate=sample_rate,
+                    aggressiveness=self.vad_aggressiveness,
+                    frame_duration_ms=self.frame_duration_ms,
+                    padding_duration_s=self.padding_duration_s,
+                    backend=backend,
+                ) or (0, len(full_audio))
+
+            with self.take_lock:
+                if serial != self.take_serial:
+                    return
+                # Keep the trimmed take as a view into full_audio, not a copy
+                start, end = bounds
+                self.trim_bounds = bounds
+                self.trimmed_audio = full_audio[start:end]
+                self.full_audio = full_audio
+
+        self.finalize_future = self.finalizer.submit(finalize)
+        return self.finalize_future
+
+    def set_trim_bounds(self, start: int, end: int) -> None:
+        """Override the detected speech bounds of the current take."""
+        with self.take_lock:
+            if self.full_audio is None:
+                return
+            start = min(max(0, start), len(self.full_audio))
+            end = min(max(start, end), len(self.full_audio))
+            self.trim_bounds = (start, end)
+            self.trimmed_audio = self.full_audio[start:end]
+
+    def is_finalizing(self) -> bool:
+        return self.finalize_future is not None and not self.finalize_future.done()
+
+    def shutdown_finalizer(self) -> None:
+        if self.finalizer is not None:
+            self.finalizer.shutdown(wait=True)
+            self.finalizer = None
+
+    def get_capture_rate(self, device_idx: Optional[int]) -> int:
+        """Rate to open the input streams with."""
+        if not self.native_rate or device_idx is None:
+            return self.sample_rate
+
+        try:
+            rate = sd.query_devices(device_idx).get("default_samplerate")
+        except Exception as e:
+            print(f"Error querying device sample rate: {e}")
+            return self.sample_rate
+
+        return int(rate) if rate else self.sample_rate
+
+    def get_vad(self) -> VadBackend:
+        try:
+            return get_vad_backend(self.vad_backend, self.vad_aggressiveness)
+        except ValueError as e:
+            print(f"{e}, falling back to webrtc")
+            return get_vad_backend("webrtc", self.vad_aggressiveness)
+
+    def save_audio(self, id: str) -> float:
+        audio_path = self.get_speaker_folder() / "audio" / self.audio_relpath(id)
 
         if not audio_path.parent.exists():
             audio_path.parent.mkdir(parents=True, exist_ok=True)
 
-        sf.write(audio_path, self.trimmed_audio, self.sample_rate, format="FLAC")
+        profile = self.get_encoding()
+        wav_path = pending_path(audio_path)
+
+        # A re-take must not race the conversion of the previous one
+        if self.transcoder is not None:
+            self.transcoder.wait(wav_path)
+
+        if profile.deferred:
+            # A finished FLAC file would make the converter skip this take
+            audio_path.unlink(missing_ok=True)
+            with span("wav.write", samples=len(self.trimmed_audio)):
+                sf.write(
+                    wav_path,
+                    self.trimmed_audio,
+                    self.sample_rate,
+                    subtype=profile.subtype,
+                    format="WAV",
+                )
+            self.get_transcoder().submit(wav_path, audio_path, profile)
+        else:
+            with span("flac.encode", samples=len(self.trimmed_audio)):
+                profile.write_flac(audio_path, self.trimmed_audio, self.sample_rate)
+            wav_path.unlink(missing_ok=True)
+
+        # The take is still in memory, so measure it now instead of
+        # re-decoding the file later
+        with span("quality_metrics"):
+            self.last_metrics = compute_quality_metrics(
+                self.trimmed_audio,
+                sample_rate=self.sample_rate,
+                aggressiveness=self.vad_aggressiveness,
+                frame_duration_ms=self.frame_duration_ms,
+                backend=self.get_vad(),
+            )
 
         return self.get_duration_trimmed_audio()
 
+    def audio_relpath(self, id: str) -> str:
+        """Path of a take within the audio folder, as stored in the manifest."""
+        layout = self.audio_layout
+        if layout not in AUDIO_LAYOUTS:
+            print(f"Unknown audio layout: {layout}, falling back to flat")
+            layout = DEFAULT_AUDIO_LAYOUT
+        return audio_relpath(id, layout)
+
+    def save_take(self, id: str, text_de: str, text_ch: str) -> float:
+        """Save the trimmed take for a prompt and add it to the manifest."""
+        duration_s = self.save_audio(id)
+        self.add_sample(
+            id=id,
+            text_de=text_de,
+            text_ch=text_ch,
+            dialect=self.speaker_dialect,
+            audio_path=self.audio_relpath(id),
+            duration_s=duration_s,
+            quality=self.last_metrics,
+        )
+        return duration_s
+
+    def get_encoding(self) -> EncodingProfile:
+        try:
+            return get_encoding_profile(self.encoding_profile)
+        except ValueError as e:
+            print(f"{e}, falling back to {DEFAULT_ENCODING_PROFILE}")
+            return get_encoding_profile(DEFAULT_ENCODING_PROFILE)
+
+    def get_transcoder(self) -> BackgroundTranscoder:
+        if self.transcoder is None:
+            self.transcoder = BackgroundTranscoder()
+        return self.transcoder
+
+    def resume_transcoding(self) -> None:
+        # Convert WAV takes a previous session did not get to
+        wav_paths = self.get_transcoder().resume(
+            self.get_speaker_folder() / "audio", self.get_encoding()
+        )
+        if wav_paths:
+            print(f"Resuming FLAC conversion of {len(wav_paths)} recordings")
+
+        # Their post-save jobs were not queued if the app quit before
+        for wav_path in wav_paths:
+            sample = self.output_index.get(wav_path.stem)
+            if sample is not None:
+                self.queue_post_save_jobs(sample)
+
+    def shutdown_transcoder(self) -> None:
+        if self.transcoder is not None:
+            self.transcoder.shutdown()
+            self.transcoder = None
+
+    def release_take(self) -> None:
+        self.audio_data = []
+        with self.take_lock:
+            self.take_serial += 1
+            self.full_audio = None
+            self.trimmed_audio = None
+            self.trim_bounds = None
+
+        if self.player is not None:
+            self.player.release()
+
+    def get_player(self) -> PlaybackEngine:
+        # Reopen the output stream only if the audio format changed
+        config = (self.sample_rate, self.channels, self.dtype, None)
+        if self.player is None or self.player.config != config:
+            self.close_player()
+            self.player = PlaybackEngine(
+                sample_rate=self.sample_rate, channels=self.channels, dtype=self.dtype
+            )
+        return self.player
+
+    def close_player(self) -> None:
+        if self.player is not None:
+            self.player.close()
+            self.player = None
+
     def play_audio_data_full_audio(self):
         self.play_audio_data(self.full_audio)
 
     def play_audio_data_trimmed_audio(self):
-        self.play_audio_data(self.trimmed_audio)
+        # Play the trimmed region of the full take by offsets, without a copy
+        if self.full_audio is None or self.trim_bounds is None:
+            return
+        start, end = self.trim_bounds
+        self.get_player().play(self.full_audio, start, end)
 
     def play_audio_data(self, audio):
         if audio is not None:
-            sd.play(audio, self.sample_rate)
+            self.get_player().play(audio)
+
+    def stop_playback(self) -> None:
+        if self.player is not None:
+            self.player.stop()
+
+    def seek_playback(self, seconds: float) -> None:
+        if self.player is not None:
+            self.player.seek(seconds)
 
     def check_playback(self) -> bool:
-        return sd.get_stream().active
+        return self.player is not None and self.player.active
+
+    def get_playback_position(self) -> float:
+        """Fraction (0-1) of the playing region that has been played."""
+        if self.player is None or self.player.get_duration() == 0:
+            return 0.0
+        return self.player.get_position() / self.player.get_duration()
 
     def get_duration_full_audio(self) -> float:
         return self.get_duration(self.full_audio)
@@ -215,31 +663,41 @@ class Recorder:
         if audio is None:
             return [0] * num_points
 
-        # Flatten audio data and normalize to [-1, 1]
-        data = audio.flatten()
-        max_val = np.max(np.abs(data))
-        if max_val > 0:
-            data = data / max_val
+        with span("waveform", samples=len(audio)):
+            return self.compute_waveform(audio, num_points)
+
+    def compute_waveform(self, audio, num_points: int) -> list[float]:
+        # Flatten audio data (a view for mono takes)
+        data = audio.reshape(-1)
+        # Peak magnitude without a full-size abs()/float copy of the take
+        scale = 0.0
+        if len(data) > 0:
+            scale = max(abs(float(data.max())), abs(float(data.min())))
+        if scale == 0:
+            scale = 1.0
 
         # Downsample by taking max and min in segments
         samples_per_point = len(data) // (
             num_points // 2
         )  # We'll get 2 points per segment
         if samples_per_point < 1:
-            return list(data) + [0] * (num_points - len(data))
-
-        waveform = []
-        for i in range(num_points // 2):
-            start = i * samples_per_point
-            end = start + samples_per_point
-            if start < len(data):
-                segment = data[start : min(end, len(data))]
-                # Get both max and min for symmetric display
-                waveform.extend([float(np.max(segment)), float(np.min(segment))])
-            else:
-                waveform.extend([0.0, 0.0])
+            normalized = [float(v) / scale for v in data]
+            return normalized + [0] * (num_points - len(data))
+
+        # Reduce whole segments at once instead of looping over them; only
+        # the small per-segment results are converted to float
+        num_segments = min(num_points // 2, len(data) // samples_per_point)
+        segments = data[: num_segments * samples_per_point].reshape(
+            num_segments, samples_per_point
+        )
+        maxima = segments.max(axis=1).astype(np.float32) / scale
+        minima = segments.min(axis=1).astype(np.float32) / scale
+
+        waveform = np.zeros(num_points, dtype=np.float32)
+        waveform[0 : 2 * num_segments : 2] = maxima
+        waveform[1 : 2 * num_segments : 2] = minima
 
-        return waveform[:num_points]  # Ensure we return exactly num_points
+        return [float(v) for v in waveform]
 
     def update_output_folder(self, folder: Union[str, Path]) -> None:
         self.output_folder = Path(folder)
@@ -262,6 +720,23 @@ class Recorder:
             "speaker_id": self.speaker_id,
             "speaker_dialect": self.speaker_dialect,
             "input_file": self.input_file,
+            "sample_format": self.dtype,
+            "trace_file": self.trace_file,
+            "vad_backend": self.vad_backend,
+            "coordinator_file": self.coordinator_file,
+            "station_id": self.station_id,
+            "encoding_profile": self.encoding_profile,
+            "hands_free": str(self.hands_free),
+            "trailing_silence_s": str(self.trailing_silence_s),
+            "auto_save": str(self.auto_save),
+            "prompt_order": self.prompt_order,
+            "prompt_seed": str(self.prompt_seed),
+            "audio_layout": self.audio_layout,
+            "sample_rate": str(self.sample_rate),
+            "native_rate": str(self.native_rate),
+            "post_save_hooks": ",".join(self.post_save_hooks),
+            "hook_workers": str(self.hook_workers),
+            "hook_copy_folder": self.hook_copy_folder,
         }
 
         with open(config_path, "w") as configfile:
@@ -282,27 +757,292 @@ class Recorder:
         self.speaker_id = settings.get("speaker_id", self.speaker_id)
         self.speaker_dialect = settings.get("speaker_dialect", self.speaker_dialect)
         self.input_file = settings.get("input_file", self.input_file)
+        self.trace_file = settings.get("trace_file", self.trace_file)
+        self.vad_backend = settings.get("vad_backend", self.vad_backend)
+        self.dtype = settings.get("sample_format", self.dtype)
+        self.coordinator_file = settings.get("coordinator_file", self.coordinator_file)
+        self.station_id = settings.get("station_id", self.station_id)
+        self.encoding_profile = settings.get("encoding_profile", self.encoding_profile)
+        self.hands_free = settings.getboolean("hands_free", self.hands_free)
+        self.trailing_silence_s = settings.getfloat(
+            "trailing_silence_s", self.trailing_silence_s
+        )
+        self.auto_save = settings.getboolean("auto_save", self.auto_save)
+        self.prompt_order = settings.get("prompt_order", self.prompt_order)
+        self.prompt_seed = settings.getint("prompt_seed", self.prompt_seed)
+        self.audio_layout = settings.get("audio_layout", self.audio_layout)
+        self.sample_rate = settings.getint("sample_rate", self.sample_rate)
+        self.native_rate = settings.getboolean("native_rate", self.native_rate)
+        self.post_save_hooks = [
+            name.strip()
+            for name in settings.get("post_save_hooks", "").split(",")
+            if name.strip()
+        ]
+        self.hook_workers = settings.getint("hook_workers", self.hook_workers)
+        self.hook_copy_folder = settings.get("hook_copy_folder", self.hook_copy_folder)
 
         self.output_file = self.output_folder / self.speaker_id / "output.json"
         self.skipped_file = self.output_folder / self.speaker_id / "skipped.txt"
 
+        # Span tracing can also be enabled with the HELVOX_TRACE variable
+        if self.trace_file:
+            tracer.enable(self.trace_file)
+
+        self.configure_coordinator()
+        self.configure_pipeline()
         self.load_data()
 
+    def configure_coordinator(self) -> None:
+        # Keep the open connection if the shared file did not change
+        if isinstance(
+            self.coordinator, SQLiteCoordinator
+        ) and self.coordinator.path == Path(self.coordinator_file):
+            return
+
+        if self.coordinator is not None:
+            self.release_leases()
+            self.coordinator.close()
+            self.coordinator = None
+
+        if self.coordinator_file:
+            try:
+                self.coordinator = SQLiteCoordinator(self.coordinator_file)
+            except Exception as e:
+                print(f"Error opening coordinator file: {e}")
+
+    def configure_pipeline(self) -> None:
+        config = (
+            str(self.output_folder),
+            tuple(self.post_save_hooks),
+            self.hook_workers,
+            self.hook_copy_folder,
+        )
+        if config == self.pipeline_config:
+            return
+
+        self.shutdown_pipeline()
+        self.pipeline_config = config
+        if not self.post_save_hooks:
+            return
+
+        hooks = {}
+        for name in self.post_save_hooks:
+            try:
+                hooks[name] = get_post_save_hook(
+                    name, copy_folder=self.hook_copy_folder
+                )
+            except ValueError as e:
+                print(e)
+
+        try:
+            self.output_folder.mkdir(parents=True, exist_ok=True)
+            store = JobStore(self.output_folder / JOBS_FILENAME)
+        except Exception as e:
+            print(f"Error opening post-save job file: {e}")
+            return
+
+        self.pipeline = HookPipeline(store, hooks, max_workers=self.hook_workers)
+        self.pipeline.start()
+
+    def shutdown_pipeline(self) -> None:
+        # Unfinished jobs stay in the job file and resume on the next start
+        if self.pipeline is not None:
+            self.pipeline.shutdown()
+            self.pipeline = None
+        self.pipeline_config = None
+
+    def release_leases(self) -> None:
+        if self.coordinator is not None and self.leased_ids:
+            try:
+                self.coordinator.release(
+                    self.station_id, self.leased_dialect, list(self.leased_ids)
+                )
+            except Exception as e:
+                print(f"Error releasing leases: {e}")
+
+        self.pending_ids = []
+        self.leased_ids = set()
+
     def load_data(self) -> None:
-        self.load_input_data()
-        self.load_output_data()
-        self.load_skipped_ids()
-
-        self.open_ids = [
-            idx
-            for idx in list(self.input_index.keys())
-            if (
-                idx not in list(self.output_index.keys())
-                and (idx not in self.skipped_ids)
+        with span("load_data"):
+            # Ids leased for the previous session are no longer needed
+            self.release_leases()
+
+            # Only files that changed since they were last read are parsed
+            input_key = (
+                self.input_file,
+                self.speaker_dialect.lower(),
+                file_stamp(self.input_file),
             )
+            if input_key != self.input_key:
+                with span("load_input_data"):
+                    self.load_input_data()
+                self.input_key = input_key
+
+            self.load_session()
+            self.resume_transcoding()
+
+            done = self.output_index.keys() | set(self.skipped_ids)
+            open_ids = [idx for idx in self.input_index if idx not in done]
+
+            self.scheduler = self.get_prompt_scheduler()
+            with span("scheduler.reset", prompts=len(open_ids)):
+                self.scheduler.reset(
+                    open_ids,
+                    self.get_prompt_text,
+                    (sample.get("ch", "") for sample in self.output_data),
+                )
+
+            self.start_search_index()
+
+    def start_search_index(self) -> None:
+        """Build the search index in a background thread if the data changed."""
+        key = (self.input_key, self.get_session_key())
+        if key == self.search_key:
+            return
+
+        self.search_key = key
+        self.search_index = None
+        self.search_pending_ids = []
+
+        ids = list(self.input_index)
+        ids.extend(id for id in self.output_index if id not in self.input_index)
+
+        def build():
+            with span("search_index.build", prompts=len(ids)):
+                index = build_prompt_index(ids, self.get_search_texts)
+            # Drop the result if the session changed in the meantime
+            if self.search_key == key:
+                self.search_index = index
+
+        threading.Thread(target=build, name="helvox-search-index", daemon=True).start()
+
+    def get_search_index(self) -> Optional[PromptIndex]:
+        """The search index, or None while it is still being built."""
+        index = self.search_index
+        if index is None:
+            return None
+
+        # Samples saved after the build started
+        for id in self.search_pending_ids:
+            index.add(id)
+        self.search_pending_ids = []
+
+        return index
+
+    def get_search_texts(self, id: str) -> list[str]:
+        texts = [
+            self.input_index.get(id, {}).get("de", ""),
+            self.get_prompt_text(id),
         ]
+        recorded = self.output_index.get(id)
+        if recorded is not None:
+            texts.append(recorded.get("de", ""))
+            texts.append(recorded.get("ch", ""))
+        return texts
+
+    def jump_to(self, id: str, current_id: Optional[str]) -> bool:
+        """
+        Make id the next prompt, putting the current one back in the queue.
+
+        Returns False if another station holds the prompt.
+        """
+        if self.coordinator is not None and id not in self.leased_ids:
+            try:
+                granted = self.coordinator.lease(
+                    self.station_id, self.speaker_dialect, [id]
+                )
+            except Exception as e:
+                print(f"Error leasing prompt {id}: {e}")
+                granted = [id]
+            if id not in granted:
+                return False
+            self.leased_ids.add(id)
+            self.leased_dialect = self.speaker_dialect
+
+        if current_id is not None and current_id != id:
+            self.put_back(current_id)
+
+        if id in self.pending_ids:
+            self.pending_ids.remove(id)
+        elif (
+            id in self.input_index
+            and id not in self.output_index
+            and id not in self.skipped_ids
+        ):
+            self.scheduler.discard(id)
+
+        return True
+
+    def put_back(self, id: str) -> None:
+        """Hand out a prompt again next, unless it was saved or skipped."""
+        if id in self.output_index or id in self.skipped_ids:
+            return
 
-        self.total_duration = self.calc_total_duration()
+        # A leased prompt stays leased, it is recorded by this station
+        if self.coordinator is not None:
+            self.pending_ids.insert(0, id)
+        else:
+            self.scheduler.requeue(id)
+
+    def get_prompt_scheduler(self) -> PromptScheduler:
+        try:
+            return get_scheduler(self.prompt_order, self.prompt_seed)
+        except ValueError as e:
+            print(f"{e}, falling back to sequential")
+            return get_scheduler("sequential")
+
+    def get_prompt_text(self, id: str) -> str:
+        sample = self.input_index.get(id, {})
+        return (
+            sample.get("ch")
+            or sample.get(f"ch_{self.speaker_dialect.lower()}")
+            or sample.get("de", "")
+        )
+
+    def get_session_key(self) -> tuple:
+        return (str(self.output_file), str(self.skipped_file))
+
+    def get_session_stamps(self) -> tuple:
+        return (file_stamp(self.output_file), file_stamp(self.skipped_file))
+
+    def load_session(self) -> None:
+        """
+        Load the speaker's manifest and skip list, reusing the cached session
+        if neither file changed since it was read or last written by us.
+        """
+        key = self.get_session_key()
+        stamps = self.get_session_stamps()
+        session = self.sessions.get(key)
+
+        if session is not None and session["stamps"] == stamps:
+            self.sessions.move_to_end(key)
+        else:
+            with span("load_output_data"):
+                self.load_output_data()
+            self.load_skipped_ids()
+            session = {"stamps": stamps}
+            self.sessions[key] = session
+            if len(self.sessions) > self.session_cache_size:
+                self.sessions.popitem(last=False)
+
+            session["output_data"] = self.output_data
+            session["output_index"] = self.output_index
+            session["skipped_ids"] = self.skipped_ids
+            session["total_duration"] = self.calc_total_duration()
+
+        # The lists are shared with the cache, so appends keep it current
+        self.output_data = session["output_data"]
+        self.output_index = session["output_index"]
+        self.skipped_ids = session["skipped_ids"]
+        self.total_duration = session["total_duration"]
+
+    def update_session(self) -> None:
+        # Our own writes must not make the cached session look stale
+        session = self.sessions.get(self.get_session_key())
+        if session is not None:
+            session["stamps"] = self.get_session_stamps()
+            session["total_duration"] = self.total_duration
 
     def calc_total_duration(self) -> float:
         return sum(
@@ -314,13 +1054,18 @@ class Recorder:
         )
 
     def load_input_data(self) -> None:
+        # Only the columns this speaker needs are kept, the parsed dicts
+        # are dropped right away
+        columns = prompt_columns(self.speaker_dialect)
         if len(self.input_file) > 0 and Path(self.input_file).exists():
-            self.input_data = read_dataset(
-                Path(self.input_file), dialect_filter=self.speaker_dialect.lower()
+            self.input_index = PromptStore.from_samples(
+                read_dataset(
+                    Path(self.input_file), dialect_filter=self.speaker_dialect.lower()
+                ),
+                columns,
             )
-            self.input_index = {str(d["id"]): d for d in self.input_data}
         else:
-            self.input_data = []
+            self.input_index = PromptStore(columns)
 
     def load_output_data(self) -> None:
         if len(str(self.output_file)) > 0 and Path(self.output_file).exists():
@@ -328,6 +1073,7 @@ class Recorder:
             self.output_index = {str(d["id"]): d for d in self.output_data}
         else:
             self.output_data = []
+            self.output_index = {}
 
     def load_skipped_ids(self) -> None:
         if len(str(self.skipped_file)) > 0 and Path(self.skipped_file).exists():
@@ -336,6 +1082,21 @@ class Recorder:
         else:
             self.skipped_ids = []
 
+    def get_speaker_folder(self) -> Path:
+        return self.output_folder / self.speaker_id
+
+    def get_sample_audio_path(self, sample: dict) -> Path:
+        filename = sample.get("audio") or f"{sample['id']}.flac"
+        audio_path = resolve_audio_path(self.get_speaker_folder() / "audio", filename)
+
+        # The take may still be waiting for its FLAC conversion
+        if not audio_path.exists() and pending_path(audio_path).exists():
+            return pending_path(audio_path)
+        return audio_path
+
+    def get_peaks_folder(self) -> Path:
+        return self.get_speaker_folder() / "peaks"
+
     def get_sample_by_id(self, id: Union[int, str]) -> dict:
         id_str = str(id)
         return self.output_index.get(id_str) or self.input_index.get(id_str) or {}
@@ -351,6 +1112,11 @@ class Recorder:
         with open(self.skipped_file, mode="a", encoding="utf-8") as f:
             f.write(f"{id}\n")
 
+        self.update_session()
+
+        # Another station may still record a prompt this speaker skipped
+        self.return_lease(str(id), completed=False)
+
     def add_sample(
         self,
         id: str,
@@ -359,6 +1125,7 @@ class Recorder:
         dialect: str,
         audio_path: str,
         duration_s: float,
+        quality: Optional[dict] = None,
     ) -> None:
         sample = {
             "id": id,
@@ -367,19 +1134,95 @@ class Recorder:
             "dialect": dialect.lower(),
             "audio": audio_path,
             "duration_s": duration_s,
+            "sample_rate": self.sample_rate,
         }
 
-        self.output_data.append(sample)
+        if quality is not None:
+            sample["quality"] = quality
+
+        # Re-recording a prompt replaces its entry
+        existing = self.output_index.get(str(id))
+        if existing is not None:
+            self.output_data[self.output_data.index(existing)] = sample
+        else:
+            self.output_data.append(sample)
+        self.output_index[str(id)] = sample
+        self.search_pending_ids.append(str(id))
 
         if not Path(self.skipped_file).parent.exists():
             Path(self.skipped_file).parent.mkdir(parents=True, exist_ok=True)
 
-        with open(self.output_file, mode="w", encoding="utf-8") as f:
-            json.dump(self.output_data, f, ensure_ascii=False, indent=4)
+        with span("manifest.write", samples=len(self.output_data)):
+            # Atomic, a crash mid-write must not truncate the manifest
+            write_manifest(Path(self.output_file), self.output_data)
 
         self.total_duration = self.calc_total_duration()
+        self.update_session()
+
+        self.return_lease(id, completed=True)
+        self.queue_post_save_jobs(sample)
+
+    def queue_post_save_jobs(self, sample: dict) -> None:
+        if self.pipeline is None:
+            return
+
+        job = {
+            **sample,
+            "speaker": self.speaker_id,
+            "speaker_dir": str(self.get_speaker_folder()),
+        }
+
+        def enqueue() -> None:
+            # The pipeline may have been reconfigured meanwhile
+            pipeline = self.pipeline
+            if pipeline is None:
+                return
+            try:
+                pipeline.enqueue(job)
+            except Exception as e:
+                print(f"Error queueing post-save jobs: {e}")
+
+        # A deferred take is processed once its FLAC file exists, the hooks
+        # would otherwise read or copy the WAV while it is converted
+        if self.transcoder is not None:
+            relpath = sample.get("audio") or f"{sample['id']}.flac"
+            audio_path = self.get_speaker_folder() / "audio" / relpath
+            self.transcoder.when_done(pending_path(audio_path), enqueue)
+        else:
+            enqueue()
+
+    def return_lease(self, id: str, completed: bool) -> None:
+        if self.coordinator is None or id not in self.leased_ids:
+            return
+
+        self.leased_ids.discard(id)
+        try:
+            if completed:
+                self.coordinator.complete(self.station_id, self.leased_dialect, [id])
+            else:
+                self.coordinator.release(self.station_id, self.leased_dialect, [id])
+        except Exception as e:
+            print(f"Error updating coordinator: {e}")
 
     def get_next_id(self) -> Optional[str]:
-        if not self.open_ids:
+        if self.coordinator is None:
+            return self.scheduler.next_id()
+
+        # Lease a batch at a time so the coordinator is only asked every
+        # lease_batch_size prompts; ids held by other stations are dropped
+        while not self.pending_ids and len(self.scheduler) > 0:
+            candidates = self.scheduler.take(self.lease_batch_size)
+            try:
+                granted = self.coordinator.lease(
+                    self.station_id, self.speaker_dialect, candidates
+                )
+            except Exception as e:
+                print(f"Error leasing prompts: {e}")
+                granted = candidates
+            self.pending_ids.extend(granted)
+            self.leased_ids.update(granted)
+            self.leased_dialect = self.speaker_dialect
+
+        if not self.pending_ids:
             return None
-        return self.open_ids.pop(0)
+        return self.pending_ids.pop(0)
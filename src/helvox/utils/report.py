@@ -0,0 +1,304 @@
+import json
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+from helvox.utils.data import file_stamp, read_dataset
+from helvox.utils.reconcile import find_speaker_dirs
+
+# Bumped whenever the layout of a cached speaker summary changes
+CACHE_VERSION = 1
+CACHE_FILENAME = "report-cache.json"
+
+
+def get_speaker_stamps(speaker_dir: Path) -> list:
+    # Lists, since that is what the stamps look like after a JSON round trip
+    return [
+        list(stamp) if stamp is not None else None
+        for stamp in (
+            file_stamp(speaker_dir / "output.json"),
+            file_stamp(speaker_dir / "skipped.txt"),
+        )
+    ]
+
+
+def summarize_speaker(speaker_dir: Union[str, Path]) -> dict:
+    """
+    Partial aggregates of a single speaker, the unit that is cached.
+
+    Returns:
+        Summary dict with the recorded seconds per dialect and per prompt
+        id, the number of takes and the skipped prompt ids
+    """
+    speaker_dir = Path(speaker_dir)
+    stamps = get_speaker_stamps(speaker_dir)
+
+    samples = []
+    manifest_path = speaker_dir / "output.json"
+    if stamps[0] is not None:
+        try:
+            with open(manifest_path, mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                samples = [sample for sample in data if isinstance(sample, dict)]
+        except (OSError, ValueError) as e:
+            print(f"Error reading {manifest_path}: {e}")
+
+    skipped = []
+    skipped_path = speaker_dir / "skipped.txt"
+    if stamps[1] is not None:
+        with open(skipped_path, mode="r", encoding="utf-8") as f:
+            skipped = sorted({line.strip() for line in f if line.strip()})
+
+    dialects = Counter()
+    prompts = {}
+    for sample in samples:
+        if "id" not in sample:
+            continue
+        duration_s = float(sample.get("duration_s", 0.0))
+        dialects[str(sample.get("dialect", "")).lower()] += duration_s
+        id = str(sample["id"])
+        prompts[id] = prompts.get(id, 0.0) + duration_s
+
+    return {
+        "speaker": speaker_dir.name,
+        "stamps": stamps,
+        # The speaker's dialect is the one most of the takes were made in
+        "dialect": dialects.most_common(1)[0][0] if dialects else "",
+        "dialects": dict(dialects),
+        "takes": sum(1 for sample in samples if "id" in sample),
+        "seconds": sum(dialects.values()),
+        "prompts": prompts,
+        "skipped": skipped,
+    }
+
+
+def load_cache(cache_path: Path) -> dict:
+    try:
+        with open(cache_path, mode="r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("speakers", {})
+
+
+def save_cache(cache_path: Path, summaries: list[dict]) -> None:
+    tmp_path = cache_path.with_suffix(".json.tmp")
+    with open(tmp_path, mode="w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": CACHE_VERSION,
+                "speakers": {summary["speaker"]: summary for summary in summaries},
+            },
+            f,
+            ensure_ascii=False,
+        )
+    os.replace(tmp_path, cache_path)
+
+
+def collect_summaries(
+    output_folder: Union[str, Path],
+    cache_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> tuple[list[dict], int]:
+    """
+    Summaries of every speaker below output_folder.
+
+    A cached summary is reused while the stamps (mtime and size) of the
+    speaker's output.json and skipped.txt are unchanged, so only speakers
+    that recorded since the last run are read again, in parallel.
+
+    Returns:
+        The summaries sorted by speaker and the number of speakers read
+    """
+    speaker_dirs = find_speaker_dirs(output_folder)
+    cache = load_cache(cache_path) if cache_path is not None else {}
+
+    summaries = {}
+    stale = []
+    for speaker_dir in speaker_dirs:
+        cached = cache.get(speaker_dir.name)
+        if cached is not None and cached["stamps"] == get_speaker_stamps(speaker_dir):
+            summaries[speaker_dir.name] = cached
+        else:
+            stale.append(speaker_dir)
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for summary in executor.map(summarize_speaker, stale):
+                summaries[summary["speaker"]] = summary
+
+    result = [summaries[name] for name in sorted(summaries)]
+
+    if cache_path is not None and (stale or len(cache) != len(result)):
+        try:
+            save_cache(cache_path, result)
+        except OSError as e:
+            print(f"Error writing report cache: {e}")
+
+    return result, len(stale)
+
+
+def build_report(
+    output_folder: Union[str, Path],
+    input_file: Optional[Union[str, Path]] = None,
+    cache_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> dict:
+    """
+    Aggregate the recordings of all speakers below output_folder.
+
+    Args:
+        output_folder: Helvox output folder with one folder per speaker
+        input_file: input corpus to compute the prompt coverage against
+        cache_path: file to keep the per-speaker summaries in, None to
+            read every manifest
+        max_workers: parallel manifest reads
+
+    Returns:
+        Report dict with hours per dialect, per speaker and per prompt,
+        skip rates and, with an input file, corpus coverage
+    """
+    summaries, read = collect_summaries(output_folder, cache_path, max_workers)
+
+    dialects = Counter()
+    speakers = []
+    prompts: dict[str, dict] = {}
+    dialect_ids: dict[str, set] = {}
+
+    for summary in summaries:
+        dialects.update(summary["dialects"])
+        ids = dialect_ids.setdefault(summary["dialect"], set())
+
+        for id, seconds in summary["prompts"].items():
+            prompt = prompts.setdefault(id, {"takes": 0, "hours": 0.0, "skips": 0})
+            prompt["takes"] += 1
+            prompt["hours"] += seconds / 3600
+            ids.add(id)
+
+        for id in summary["skipped"]:
+            prompt = prompts.setdefault(id, {"takes": 0, "hours": 0.0, "skips": 0})
+            prompt["skips"] += 1
+
+        seen = summary["takes"] + len(summary["skipped"])
+        speakers.append(
+            {
+                "speaker": summary["speaker"],
+                "dialect": summary["dialect"],
+                "hours": summary["seconds"] / 3600,
+                "takes": summary["takes"],
+                "skipped": len(summary["skipped"]),
+                "skip_rate": len(summary["skipped"]) / seen if seen else 0.0,
+            }
+        )
+
+    takes = sum(speaker["takes"] for speaker in speakers)
+    skipped = sum(speaker["skipped"] for speaker in speakers)
+
+    report = {
+        "speakers": speakers,
+        "dialects": {dialect: seconds / 3600 for dialect, seconds in dialects.items()},
+        "prompts": prompts,
+        "hours": sum(dialects.values()) / 3600,
+        "takes": takes,
+        "skipped": skipped,
+        "skip_rate": skipped / (takes + skipped) if takes + skipped else 0.0,
+        "speakers_read": read,
+    }
+
+    if input_file:
+        report["coverage"] = compute_coverage(Path(input_file), prompts, dialect_ids)
+
+    return report
+
+
+def compute_coverage(
+    input_file: Path, prompts: dict[str, dict], dialect_ids: dict[str, set]
+) -> dict:
+    """
+    Share of the input prompts recorded at least once, overall and for
+    each dialect against the prompts that have a text in that dialect.
+    """
+    corpus = read_dataset(input_file)
+    corpus_ids = {str(sample["id"]) for sample in corpus}
+    recorded = {id for id, prompt in prompts.items() if prompt["takes"]}
+
+    coverage = {
+        "prompts": len(corpus_ids),
+        "recorded": len(corpus_ids & recorded),
+        "dialects": {},
+    }
+
+    for dialect, ids in sorted(dialect_ids.items()):
+        column = f"ch_{dialect}"
+        dialect_corpus = {
+            str(sample["id"]) for sample in corpus if column in sample
+        } or corpus_ids
+        coverage["dialects"][dialect] = {
+            "prompts": len(dialect_corpus),
+            "recorded": len(dialect_corpus & ids),
+        }
+
+    return coverage
+
+
+def format_hours(hours: float) -> str:
+    return f"{hours:8.2f} h"
+
+
+def format_corpus_report(report: dict, top: int = 10) -> str:
+    lines = [
+        f"Total: {format_hours(report['hours'])}, {report['takes']} takes, "
+        f"{len(report['speakers'])} speakers, "
+        f"skip rate {report['skip_rate']:.1%}",
+        "",
+        "Dialects:",
+    ]
+    for dialect, hours in sorted(report["dialects"].items()):
+        lines.append(f"  {dialect or '?':<8}{format_hours(hours)}")
+
+    coverage = report.get("coverage")
+    if coverage is not None:
+        lines += ["", "Coverage:"]
+        lines.append(f"  {'all':<8}{format_share(coverage)}")
+        for dialect, counts in coverage["dialects"].items():
+            lines.append(f"  {dialect or '?':<8}{format_share(counts)}")
+
+    lines += ["", "Speakers:"]
+    for speaker in report["speakers"]:
+        lines.append(
+            f"  {speaker['speaker']:<20}{speaker['dialect'] or '?':<6}"
+            f"{format_hours(speaker['hours'])}  {speaker['takes']:>6} takes  "
+            f"skip rate {speaker['skip_rate']:.1%}"
+        )
+
+    prompts = report["prompts"]
+    recorded = [prompt for prompt in prompts.values() if prompt["takes"]]
+    lines += [
+        "",
+        f"Prompts: {len(recorded)} recorded, "
+        f"{sum(1 for prompt in recorded if prompt['takes'] > 1)} by several speakers",
+    ]
+
+    most_skipped = sorted(
+        (item for item in prompts.items() if item[1]["skips"]),
+        key=lambda item: (-item[1]["skips"], item[0]),
+    )[:top]
+    if most_skipped:
+        lines.append("Most skipped:")
+        for id, prompt in most_skipped:
+            lines.append(
+                f"  {id:<20}{prompt['skips']:>4} skips {prompt['takes']:>4} takes"
+            )
+
+    return "\n".join(lines)
+
+
+def format_share(counts: dict) -> str:
+    share = counts["recorded"] / counts["prompts"] if counts["prompts"] else 0.0
+    return f"{counts['recorded']:>8} / {counts['prompts']:<8} {share:.1%}"
@@ -0,0 +1,91 @@
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+
+# Upper bound for the samples gathered at once (output samples x taps x
+# channels), keeps the temporary arrays at a few MB for long takes
+MAX_GATHER_ELEMENTS = 1 << 22
+
+# Filter length in zero crossings of the sinc on each side, and the Kaiser
+# window shape; the same defaults as scipy.signal.resample_poly
+ZERO_CROSSINGS = 10
+KAISER_BETA = 5.0
+
+
+@lru_cache(maxsize=16)
+def polyphase_filter(up: int, down: int) -> np.ndarray:
+    """
+    Kaiser windowed sinc low-pass for resampling by up/down, split into its
+    polyphase components.
+
+    Returns:
+        Array of shape (up, taps) with row p holding the coefficients
+        h[p], h[p + up], h[p + 2 * up], ...
+    """
+    max_rate = max(up, down)
+    half_len = ZERO_CROSSINGS * max_rate
+    n = np.arange(-half_len, half_len + 1)
+
+    # Cut off at the lower of the two Nyquist frequencies; the gain of up
+    # makes up for the zeros inserted when upsampling
+    h = np.sinc(n / max_rate) * np.kaiser(len(n), KAISER_BETA) * (up / max_rate)
+
+    taps = -(-len(h) // up)
+    h = np.pad(h, (0, taps * up - len(h)))
+    return h.reshape(taps, up).T.astype(np.float32)
+
+
+def resample_poly(audio: np.ndarray, up: int, down: int, axis: int = 0) -> np.ndarray:
+    """
+    Resample audio by the rational factor up/down along axis.
+
+    Polyphase filtering: each output sample is the dot product of one
+    polyphase row with the input samples around it, so the upsampled signal
+    is never built. Output samples are computed in chunks with a single
+    gather and einsum each. Integer input is rounded and clipped back to
+    its dtype.
+    """
+    divisor = gcd(up, down)
+    up, down = up // divisor, down // divisor
+    if up == down:
+        return audio
+
+    data = np.moveaxis(audio, axis, 0)
+    shape = data.shape
+    data = data.reshape(shape[0], -1).astype(np.float32)
+    n_in, channels = data.shape
+
+    bank = polyphase_filter(up, down)
+    taps = bank.shape[1]
+    # The filter is centered, its delay in upsampled samples is half_len
+    delay = ZERO_CROSSINGS * max(up, down)
+
+    n_out = -(-n_in * up // down)
+    padded = np.zeros((n_in + 2 * taps, channels), dtype=np.float32)
+    padded[taps : taps + n_in] = data
+
+    out = np.empty((n_out, channels), dtype=np.float32)
+    offsets = np.arange(taps)
+    chunk = max(1, MAX_GATHER_ELEMENTS // (taps * channels))
+
+    for start in range(0, n_out, chunk):
+        # Position of each output sample in the (virtual) upsampled signal
+        t = np.arange(start, min(start + chunk, n_out)) * down + delay
+        phase = t % up
+        base = t // up + taps
+        window = padded[base[:, None] - offsets[None, :]]
+        out[start : start + len(t)] = np.einsum("mk,mkc->mc", bank[phase], window)
+
+    out = out.reshape((n_out,) + shape[1:])
+    if np.issubdtype(audio.dtype, np.integer):
+        info = np.iinfo(audio.dtype)
+        out = np.clip(np.rint(out), info.min, info.max)
+    return np.moveaxis(out.astype(audio.dtype, copy=False), 0, axis)
+
+
+def resample(audio: np.ndarray, from_rate: int, to_rate: int, axis: int = 0):
+    """Resample audio from from_rate to to_rate, a no-op if they are equal."""
+    if from_rate == to_rate:
+        return audio
+    return resample_poly(audio, to_rate, from_rate, axis=axis)
@@ -0,0 +1,217 @@
+import heapq
+import random
+from collections import deque
+from typing import Callable, Iterable, Optional
+
+
+class PromptScheduler:
+    """
+    Decides the order in which the open prompts of a session are recorded.
+
+    reset() receives the open ids in corpus order together with the texts
+    already recorded by the speaker; next_id() removes and returns the next
+    prompt, or None once every prompt was handed out. Prompts the operator
+    jumped to are discarded, and a prompt put back with requeue() is handed
+    out before any other.
+    """
+
+    name = ""
+
+    def __init__(self) -> None:
+        self.front: deque = deque()
+        # Ids not handed out or discarded yet
+        self.held: set[str] = set()
+
+    def reset(
+        self,
+        open_ids: list[str],
+        get_text: Callable[[str], str],
+        recorded_texts: Iterable[str] = (),
+    ) -> None:
+        self.front.clear()
+        self.held = set(open_ids)
+
+    def pop_next(self) -> Optional[str]:
+        raise NotImplementedError
+
+    def next_id(self) -> Optional[str]:
+        if self.front:
+            id = self.front.popleft()
+            self.held.discard(id)
+            return id
+
+        # Discarded ids, or ids already handed out from the front, are
+        # skipped lazily instead of searched for
+        while True:
+            id = self.pop_next()
+            if id is None or id in self.held:
+                self.held.discard(id)
+                return id
+
+    def requeue(self, id: str) -> None:
+        self.held.add(id)
+        self.front.appendleft(id)
+
+    def discard(self, id: str) -> None:
+        # An id already handed out is not held anymore
+        if id not in self.held:
+            return
+
+        self.held.discard(id)
+        if id in self.front:
+            self.front.remove(id)
+
+    def take(self, count: int) -> list[str]:
+        ids = []
+        while len(ids) < count:
+            id = self.next_id()
+            if id is None:
+                break
+            ids.append(id)
+        return ids
+
+    def __len__(self) -> int:
+        return len(self.held)
+
+
+class SequentialScheduler(PromptScheduler):
+    """Prompts in corpus order."""
+
+    name = "sequential"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.ids: deque = deque()
+
+    def reset(self, open_ids, get_text, recorded_texts=()) -> None:
+        super().reset(open_ids, get_text, recorded_texts)
+        self.ids = deque(open_ids)
+
+    def pop_next(self) -> Optional[str]:
+        return self.ids.popleft() if self.ids else None
+
+
+class RandomScheduler(PromptScheduler):
+    """
+    Prompts in a random order that only depends on the seed and the open
+    ids, so sessions can be reproduced for A/B comparisons.
+    """
+
+    name = "random"
+
+    def __init__(self, seed: int = 0) -> None:
+        super().__init__()
+        self.seed = seed
+        self.ids: list[str] = []
+
+    def reset(self, open_ids, get_text, recorded_texts=()) -> None:
+        super().reset(open_ids, get_text, recorded_texts)
+        self.ids = list(open_ids)
+        random.Random(self.seed).shuffle(self.ids)
+        # Pop from the end, so the shuffled order is read backwards
+        self.ids.reverse()
+
+    def pop_next(self) -> Optional[str]:
+        return self.ids.pop() if self.ids else None
+
+
+def text_ngrams(text: str, n: int) -> set[str]:
+    """Distinct character n-grams of a text, case and spacing normalized."""
+    text = f" {' '.join(text.lower().split())} "
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+class CoverageScheduler(PromptScheduler):
+    """
+    Greedy coverage of character n-grams: each prompt handed out is the one
+    adding the most n-grams not yet covered by the recorded (or already
+    handed out) prompts.
+
+    Uses lazy greedy evaluation. The gain of a prompt can only shrink as
+    coverage grows, so the heap holds an upper bound per prompt: the top is
+    re-evaluated and returned if it still beats the next bound, otherwise
+    pushed back with its real gain. Prompts start with their length as the
+    bound, so reset() is O(n) without looking at any n-gram.
+
+    When many prompts have similar gains, strict lazy greedy can re-evaluate
+    a large part of the corpus for a single call. At most max_evaluations
+    prompts are therefore evaluated per call and the best of them is
+    returned, which keeps next_id() at O(max_evaluations * log n).
+    """
+
+    name = "coverage"
+
+    def __init__(self, n: int = 3, max_evaluations: int = 64) -> None:
+        super().__init__()
+        self.n = n
+        self.max_evaluations = max_evaluations
+        self.heap: list[tuple[int, int, str]] = []
+        self.covered: set[str] = set()
+        self.get_text: Callable[[str], str] = str
+
+    def reset(self, open_ids, get_text, recorded_texts=()) -> None:
+        super().reset(open_ids, get_text, recorded_texts)
+        self.get_text = get_text
+        self.covered = set()
+        for text in recorded_texts:
+            self.covered.update(text_ngrams(text, self.n))
+
+        # (-gain bound, corpus position, id); ties keep corpus order
+        self.heap = [
+            (-(len(get_text(id)) + 2), position, id)
+            for position, id in enumerate(open_ids)
+        ]
+        heapq.heapify(self.heap)
+
+    def gain(self, id: str) -> tuple[int, set[str]]:
+        ngrams = text_ngrams(self.get_text(id), self.n)
+        new = ngrams - self.covered
+        return len(new), new
+
+    def pop_next(self) -> Optional[str]:
+        if not self.heap:
+            return None
+
+        # Prompts evaluated in this call as (-gain, position, id)
+        evaluated = []
+        best = None
+        best_new: set[str] = set()
+
+        while self.heap and len(evaluated) < self.max_evaluations:
+            _, position, id = heapq.heappop(self.heap)
+            gain, new = self.gain(id)
+
+            entry = (-gain, position, id)
+            evaluated.append(entry)
+            if best is None or entry < best:
+                best, best_new = entry, new
+
+            # No prompt left in the heap can beat the best one evaluated
+            if not self.heap or best <= self.heap[0]:
+                break
+
+        self.covered.update(best_new)
+
+        # The others go back with their exact gain as the new bound
+        for entry in evaluated:
+            if entry is not best:
+                heapq.heappush(self.heap, entry)
+
+        id = best[2]
+        return id
+
+
+SCHEDULERS = {
+    SequentialScheduler.name: SequentialScheduler,
+    RandomScheduler.name: RandomScheduler,
+    CoverageScheduler.name: CoverageScheduler,
+}
+
+
+def get_scheduler(name: str = "sequential", seed: int = 0) -> PromptScheduler:
+    scheduler_class = SCHEDULERS.get(name)
+    if scheduler_class is None:
+        raise ValueError(f"Unknown prompt scheduler: {name}")
+    if scheduler_class is RandomScheduler:
+        return RandomScheduler(seed)
+    return scheduler_class()
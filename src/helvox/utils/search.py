@@ -0,0 +1,158 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable, Iterator
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def contains(postings: array, doc: int) -> bool:
+    i = bisect_left(postings, doc)
+    return i < len(postings) and postings[i] == doc
+
+
+# Above this many completions of the last token, candidates are checked
+# against their text instead of probing every completion's postings
+MAX_PREFIX_PROBES = 32
+
+
+class PromptIndex:
+    """
+    Inverted token index over the prompts of a session.
+
+    Each prompt is a document numbered in insertion order; every token maps
+    to the sorted array of documents containing it. A query matches the
+    documents containing all of its tokens, the last one as a prefix so
+    results follow typing. Intersections are driven by the smallest posting
+    list (or prefix union) and probe the others by binary search, so the
+    cost follows the size of the result, not of the corpus.
+    """
+
+    def __init__(self, get_texts: Callable[[str], Iterable[str]]) -> None:
+        self.get_texts = get_texts
+        self.ids: list[str] = []
+        self.docs: dict[str, int] = {}
+        self.postings: dict[str, array] = {}
+        # Sorted vocabulary for prefix lookups, rebuilt lazily
+        self.terms: list[str] = []
+        self.terms_dirty = False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, id: str) -> None:
+        """Index the texts of a prompt, adding to what it was indexed with."""
+        doc = self.docs.get(id)
+        if doc is None:
+            doc = len(self.ids)
+            self.ids.append(id)
+            self.docs[id] = doc
+
+        # Ids are looked up in self.docs, they are not indexed as tokens
+        tokens = set()
+        for text in self.get_texts(id):
+            tokens.update(tokenize(text))
+
+        for token in tokens:
+            postings = self.postings.get(token)
+            if postings is None:
+                self.postings[token] = array("I", (doc,))
+                self.terms_dirty = True
+            elif postings[-1] < doc:
+                postings.append(doc)
+            elif not contains(postings, doc):
+                # Re-indexing an earlier prompt, keep the array sorted
+                postings.insert(bisect_left(postings, doc), doc)
+
+    def build(self, ids: Iterable[str]) -> None:
+        for id in ids:
+            self.add(id)
+
+    def prefix_terms(self, prefix: str) -> list[str]:
+        if self.terms_dirty:
+            self.terms = sorted(self.postings)
+            self.terms_dirty = False
+
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\U0010ffff")
+        return self.terms[start:end]
+
+    def has_prefix(self, doc: int, prefix: str) -> bool:
+        return any(
+            token.startswith(prefix)
+            for text in self.get_texts(self.ids[doc])
+            for token in tokenize(text)
+        )
+
+    def search(self, query: str, limit: int = 200) -> list[str]:
+        """Ids of the prompts matching query, in corpus order."""
+        results = []
+
+        # An exact id match always comes first
+        id = query.strip()
+        if id in self.docs:
+            results.append(id)
+
+        tokens = tokenize(query)
+        if not tokens:
+            return results
+
+        exact = []
+        for token in tokens[:-1]:
+            postings = self.postings.get(token)
+            if postings is None:
+                return results
+            exact.append(postings)
+        exact.sort(key=len)
+
+        last = tokens[-1]
+        prefix = [self.postings[term] for term in self.prefix_terms(last)]
+        if not prefix:
+            return results
+
+        if not exact or sum(map(len, prefix)) <= len(exact[0]):
+            # Lazily merged, so only as many documents as needed are read
+            candidates: Iterator[int] = unique(heapq.merge(*prefix))
+            others = exact
+            check_prefix = None
+        else:
+            candidates = iter(exact[0])
+            others = exact[1:]
+            check_prefix = prefix
+
+        for doc in candidates:
+            if not all(contains(postings, doc) for postings in others):
+                continue
+            if check_prefix is not None:
+                if len(check_prefix) > MAX_PREFIX_PROBES:
+                    if not self.has_prefix(doc, last):
+                        continue
+                elif not any(contains(postings, doc) for postings in check_prefix):
+                    continue
+            if self.ids[doc] != id:
+                results.append(self.ids[doc])
+            if len(results) >= limit:
+                break
+
+        return results
+
+
+def unique(docs: Iterable[int]) -> Iterator[int]:
+    last = -1
+    for doc in docs:
+        if doc != last:
+            yield doc
+            last = doc
+
+
+def build_prompt_index(
+    ids: Iterable[str], get_texts: Callable[[str], Iterable[str]]
+) -> PromptIndex:
+    index = PromptIndex(get_texts)
+    index.build(ids)
+    return index
@@ -0,0 +1,204 @@
+import asyncio
+from typing import AsyncIterator, Optional
+
+from helvox.utils.recorder import Recorder
+
+# How often takes cut by the hands-free endpointer are collected
+HANDS_FREE_POLL_S = 0.05
+
+
+class HeadlessSession:
+    """
+    asyncio API for driving a Recorder without the Tk app.
+
+    Mirrors what the app's buttons do: the current prompt, record, stop,
+    trim, save and skip. Calls that touch the audio device or the disk run
+    in a thread so the event loop is never blocked, and commands are
+    serialized with a lock since the recorder is not meant to be driven
+    from several places at once.
+
+    With hands-free recording enabled, takes cut by the endpointer are
+    collected in the background like the app does, and saved right away
+    if auto save is on.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        self.recorder = recorder
+        self.current_id: Optional[str] = None
+        self.lock = asyncio.Lock()
+        self.hands_free_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start monitoring the input and load the first prompt."""
+        async with self.lock:
+            await asyncio.to_thread(self.recorder.start_monitoring)
+            self.current_id = self.recorder.get_next_id()
+
+        if self.recorder.hands_free:
+            self.hands_free_task = asyncio.create_task(self.poll_hands_free())
+
+    async def poll_hands_free(self) -> None:
+        """Finish the takes the endpointer cut, as App.poll_hands_free."""
+        while True:
+            await asyncio.sleep(HANDS_FREE_POLL_S)
+            blocks = self.recorder.pop_hands_free_take()
+            if blocks is None:
+                continue
+
+            try:
+                async with self.lock:
+                    future = self.recorder.finish_take_async(blocks)
+                    await asyncio.wrap_future(future)
+                    if self.recorder.auto_save:
+                        await self.save_current()
+            except Exception as e:
+                print(f"Error finishing hands-free take: {e}")
+
+    async def close(self) -> None:
+        if self.hands_free_task is not None:
+            self.hands_free_task.cancel()
+            try:
+                await self.hands_free_task
+            except asyncio.CancelledError:
+                pass
+            self.hands_free_task = None
+
+        async with self.lock:
+            recorder = self.recorder
+            if recorder.recording:
+                await asyncio.to_thread(recorder.stop_recording)
+            await asyncio.to_thread(recorder.stop_monitoring)
+            recorder.release_leases()
+            recorder.close_player()
+            await asyncio.to_thread(recorder.shutdown_finalizer)
+            await asyncio.to_thread(recorder.shutdown_transcoder)
+            await asyncio.to_thread(recorder.shutdown_pipeline)
+
+    def prompt(self) -> Optional[dict]:
+        if self.current_id is None:
+            return None
+
+        sample = self.recorder.get_sample_by_id(self.current_id)
+        return {
+            "id": self.current_id,
+            "de": sample.get("de", ""),
+            "ch": self.recorder.get_prompt_text(self.current_id),
+        }
+
+    def take(self) -> Optional[dict]:
+        recorder = self.recorder
+        if recorder.full_audio is None or recorder.trim_bounds is None:
+            return None
+
+        start, end = recorder.trim_bounds
+        return {
+            "duration_s": recorder.get_duration_full_audio(),
+            "trimmed_duration_s": recorder.get_duration_trimmed_audio(),
+            "trim_start_s": start / recorder.sample_rate,
+            "trim_end_s": end / recorder.sample_rate,
+        }
+
+    def status(self) -> dict:
+        recorder = self.recorder
+        return {
+            "speaker": recorder.speaker_id,
+            "dialect": recorder.speaker_dialect,
+            "device": recorder.selected_device,
+            "monitoring": recorder.monitoring,
+            "hands_free": recorder.hands_free,
+            "recording": recorder.recording or recorder.is_hands_free_recording(),
+            "processing": recorder.is_finalizing(),
+            "level_db": recorder.get_current_level(),
+            "total_duration_s": recorder.total_duration,
+            "prompt": self.prompt(),
+            "take": self.take(),
+        }
+
+    async def next_prompt(self) -> Optional[dict]:
+        """
+        Drop the current take and move on without saving or skipping. The
+        current prompt comes up again after the next one.
+        """
+        async with self.lock:
+            recorder = self.recorder
+            recorder.release_take()
+            previous_id = self.current_id
+            self.current_id = recorder.get_next_id()
+            if previous_id is not None:
+                recorder.put_back(previous_id)
+                # It was the last open prompt
+                if self.current_id is None:
+                    self.current_id = recorder.get_next_id()
+            return self.prompt()
+
+    async def start_recording(self) -> None:
+        async with self.lock:
+            if not self.recorder.recording:
+                await asyncio.to_thread(self.recorder.start_recording)
+
+    async def stop_recording(self) -> Optional[dict]:
+        """Stop recording and return the take once it is trimmed."""
+        async with self.lock:
+            future = await asyncio.to_thread(self.recorder.stop_recording_async)
+            if future is not None:
+                await asyncio.wrap_future(future)
+            return self.take()
+
+    async def trim(
+        self, start_s: Optional[float] = None, end_s: Optional[float] = None
+    ) -> Optional[dict]:
+        """Move the trim bounds of the take, None keeps a bound."""
+        async with self.lock:
+            recorder = self.recorder
+            if recorder.trim_bounds is None:
+                return None
+
+            start, end = recorder.trim_bounds
+            if start_s is not None:
+                start = int(start_s * recorder.sample_rate)
+            if end_s is not None:
+                end = int(end_s * recorder.sample_rate)
+            recorder.set_trim_bounds(start, end)
+            return self.take()
+
+    async def save(self, text_ch: Optional[str] = None) -> Optional[dict]:
+        """Save the take for the current prompt and return the next one."""
+        async with self.lock:
+            return await self.save_current(text_ch)
+
+    async def save_current(self, text_ch: Optional[str] = None) -> Optional[dict]:
+        # The lock must be held by the caller
+        if self.current_id is None or self.recorder.trimmed_audio is None:
+            return None
+
+        prompt = self.prompt()
+        await asyncio.to_thread(
+            self.recorder.save_take,
+            self.current_id,
+            prompt["de"],
+            prompt["ch"] if text_ch is None else text_ch,
+        )
+        self.recorder.release_take()
+        self.recorder.arm_hands_free()
+        self.current_id = self.recorder.get_next_id()
+        return self.prompt()
+
+    async def skip(self) -> Optional[dict]:
+        async with self.lock:
+            if self.current_id is not None:
+                await asyncio.to_thread(self.recorder.add_skip, self.current_id)
+            self.recorder.release_take()
+            self.recorder.arm_hands_free()
+            self.current_id = self.recorder.get_next_id()
+            return self.prompt()
+
+    async def levels(self, interval_s: float = 0.05) -> AsyncIterator[dict]:
+        """Input level and recording state, every interval_s."""
+        while True:
+            yield {
+                "level_db": round(self.recorder.get_current_level(), 1),
+                "recording": (
+                    self.recorder.recording or self.recorder.is_hands_free_recording()
+                ),
+            }
+            await asyncio.sleep(interval_s)
@@ -0,0 +1,104 @@
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+
+class Tracer:
+    """
+    Collects timed spans and writes them as a Chrome/Perfetto trace.
+
+    Disabled by default; span() then returns a shared no-op context, so
+    instrumented code pays almost nothing. Enable it by setting the
+    HELVOX_TRACE environment variable or the trace_file setting to the
+    path of the JSON file, which can be opened in chrome://tracing or
+    https://ui.perfetto.dev.
+    """
+
+    def __init__(self) -> None:
+        self.output_path: Optional[Path] = None
+        self.events = []
+        self.named_threads = set()
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.null_span = contextlib.nullcontext()
+
+    @property
+    def enabled(self) -> bool:
+        return self.output_path is not None
+
+    def enable(self, output_path: Union[str, Path]) -> None:
+        if self.output_path is None:
+            atexit.register(self.flush)
+        self.output_path = Path(output_path)
+
+    def span(self, name: str, **args):
+        if self.output_path is None:
+            return self.null_span
+        return self._span(name, args)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, args: dict):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.add_event(name, start, end, args)
+
+    def add_event(self, name: str, start_ns: int, end_ns: int, args: dict) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": "helvox",
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+
+        with self.lock:
+            # Name each thread once so the trace viewer shows readable lanes
+            if thread.ident not in self.named_threads:
+                self.named_threads.add(thread.ident)
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self.pid,
+                        "tid": thread.ident,
+                        "args": {"name": thread.name},
+                    }
+                )
+            self.events.append(event)
+
+    def flush(self) -> None:
+        if self.output_path is None:
+            return
+
+        with self.lock:
+            events = list(self.events)
+
+        if not self.output_path.parent.exists():
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.output_path, mode="w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+tracer = Tracer()
+
+if os.environ.get("HELVOX_TRACE"):
+    tracer.enable(os.environ["HELVOX_TRACE"])
+
+
+def span(name: str, **args):
+    """Time the enclosed block as a trace span if tracing is enabled."""
+    return tracer.span(name, **args)
@@ -1,77 +1,131 @@
 import numpy as np
-import webrtcvad
 
+from helvox.utils.vad import WebRtcVad, adapt_vad_backend
 
-def trim_silence(
+
+def detect_voiced_frames(
     audio,
     sample_rate=48000,
     aggressiveness=3,
     frame_duration_ms=30,
-    padding_duration_s=0.1,
+    backend=None,
 ):
     """
-    Trim silence from start and end of audio using WebRTC VAD.
+    Run voice activity detection over consecutive frames of audio.
 
     Args:
         audio: numpy array of audio samples (float32 or int16)
-        sample_rate: sample rate in Hz (must be 8000, 16000, 32000, or 48000)
+        sample_rate: sample rate in Hz, resampled for the VAD if needed
         aggressiveness: VAD aggressiveness (0-3, higher = more aggressive)
-        frame_duration_ms: frame size in ms (10, 20, or 30)
-        padding_duration_s: seconds to keep at start/end (default 0.1)
+        frame_duration_ms: frame size in ms (WebRTC: 10, 20, or 30)
+        backend: VAD backend deciding the frames (default: WebRTC VAD)
 
     Returns:
-        Trimmed audio as numpy array
+        Boolean numpy array with one entry per complete frame
     """
 
-    # WebRTC VAD only works with 16-bit PCM
-    if audio.dtype == np.float32 or audio.dtype == np.float64:
-        # Convert float [-1, 1] to int16
-        audio_int16 = (audio * 32767).astype(np.int16)
-    else:
-        audio_int16 = audio.astype(np.int16)
-
-    # Initialize VAD
-    vad = webrtcvad.Vad(aggressiveness)
+    if backend is None:
+        backend = WebRtcVad(aggressiveness)
+    backend = adapt_vad_backend(backend, sample_rate, frame_duration_ms)
 
     # Calculate frame size in samples
     frame_size = int(sample_rate * frame_duration_ms / 1000)
+    num_frames = len(audio) // frame_size
+
+    # Split into frames as a 2D view of the first channel (no copy for mono)
+    data = audio[:, 0] if audio.ndim > 1 else audio
+    frames = data[: num_frames * frame_size].reshape(num_frames, frame_size)
 
-    # Pad audio to make it divisible by frame_size
-    num_frames = len(audio_int16) // frame_size
-    audio_padded = audio_int16[: num_frames * frame_size]
+    return backend.decide(frames, sample_rate)
 
-    # Split into frames and check each frame for voice activity
-    frames = []
-    voiced_frames = []
 
-    for i in range(0, len(audio_padded), frame_size):
-        frame = audio_padded[i : i + frame_size]
+def find_speech_bounds(
+    audio,
+    sample_rate=48000,
+    aggressiveness=3,
+    frame_duration_ms=30,
+    padding_duration_s=0.1,
+    backend=None,
+):
+    """
+    Find the start and end sample of speech in audio using voice activity
+    detection.
 
-        # Convert frame to bytes
-        frame_bytes = frame.tobytes()
+    Args:
+        audio: numpy array of audio samples (float32 or int16)
+        sample_rate: sample rate in Hz, resampled for the VAD if needed
+        aggressiveness: VAD aggressiveness (0-3, higher = more aggressive)
+        frame_duration_ms: frame size in ms (WebRTC: 10, 20, or 30)
+        padding_duration_s: seconds to keep at start/end (default 0.1)
+        backend: VAD backend deciding the frames (default: WebRTC VAD)
 
-        # Check if frame contains voice
-        is_speech = vad.is_speech(frame_bytes, sample_rate)
+    Returns:
+        Tuple (start_sample, end_sample), or None if no voice was detected
+    """
 
-        frames.append((i, frame))
-        voiced_frames.append(is_speech)
+    voiced_frames = detect_voiced_frames(
+        audio,
+        sample_rate=sample_rate,
+        aggressiveness=aggressiveness,
+        frame_duration_ms=frame_duration_ms,
+        backend=backend,
+    )
 
     # Find first and last voiced frames
-    if not any(voiced_frames):
-        # No voice detected, return original audio
-        return audio
-
-    first_voiced = voiced_frames.index(True)
-    last_voiced = len(voiced_frames) - 1 - voiced_frames[::-1].index(True)
+    voiced_idx = np.flatnonzero(voiced_frames)
+    if len(voiced_idx) == 0:
+        return None
 
     # Calculate start and end sample positions
-    start_sample = frames[first_voiced][0]
-    end_sample = frames[last_voiced][0] + frame_size
+    frame_size = int(sample_rate * frame_duration_ms / 1000)
+    start_sample = int(voiced_idx[0]) * frame_size
+    end_sample = (int(voiced_idx[-1]) + 1) * frame_size
 
     # Add padding
     padding_samples = int(padding_duration_s * sample_rate)
     start_sample = max(0, start_sample - padding_samples)
     end_sample = min(len(audio), end_sample + padding_samples)
 
-    # Return trimmed audio in original format
+    return start_sample, end_sample
+
+
+def trim_silence(
+    audio,
+    sample_rate=48000,
+    aggressiveness=3,
+    frame_duration_ms=30,
+    padding_duration_s=0.1,
+    backend=None,
+):
+    """
+    Trim silence from start and end of audio using voice activity detection.
+
+    Args:
+        audio: numpy array of audio samples (float32 or int16)
+        sample_rate: sample rate in Hz, resampled for the VAD if needed
+        aggressiveness: VAD aggressiveness (0-3, higher = more aggressive)
+        frame_duration_ms: frame size in ms (WebRTC: 10, 20, or 30)
+        padding_duration_s: seconds to keep at start/end (default 0.1)
+        backend: VAD backend deciding the frames (default: WebRTC VAD)
+
+    Returns:
+        Trimmed audio as a view into the original numpy array
+    """
+
+    bounds = find_speech_bounds(
+        audio,
+        sample_rate=sample_rate,
+        aggressiveness=aggressiveness,
+        frame_duration_ms=frame_duration_ms,
+        padding_duration_s=padding_duration_s,
+        backend=backend,
+    )
+
+    if bounds is None:
+        # No voice detected, return original audio
+        return audio
+
+    start_sample, end_sample = bounds
+
+    # Return trimmed audio in original format (a view, no copy)
     return audio[start_sample:end_sample]
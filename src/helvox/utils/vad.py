@@ -0,0 +1,174 @@
+import numpy as np
+import webrtcvad
+
+from helvox.utils.resample import resample
+
+# Noise floor margin (dB) per aggressiveness level of the energy detector
+ENERGY_MARGINS_DB = {0: 6.0, 1: 9.0, 2: 12.0, 3: 15.0}
+
+
+class VadBackend:
+    """
+    Decides for a batch of equally sized frames whether each contains speech.
+
+    Frames are passed as a 2D array of shape (num_frames, frame_size),
+    usually a zero-copy view into the take, in float32 or int16.
+    """
+
+    name = ""
+
+    # Preceding frames a streaming caller passes along with each batch, for
+    # detectors that judge a frame relative to the rest of the batch
+    context_frames = 0
+
+    def supports(self, sample_rate: int, frame_duration_ms: int) -> bool:
+        return True
+
+    def decide(self, frames: np.ndarray, sample_rate: int) -> np.ndarray:
+        raise NotImplementedError
+
+
+class WebRtcVad(VadBackend):
+    """WebRTC VAD, called frame by frame on 16-bit PCM."""
+
+    name = "webrtc"
+    sample_rates = (8000, 16000, 32000, 48000)
+    frame_durations_ms = (10, 20, 30)
+
+    def __init__(self, aggressiveness: int = 3) -> None:
+        self.vad = webrtcvad.Vad(aggressiveness)
+
+    def supports(self, sample_rate: int, frame_duration_ms: int) -> bool:
+        return (
+            sample_rate in self.sample_rates
+            and frame_duration_ms in self.frame_durations_ms
+        )
+
+    def decide(self, frames: np.ndarray, sample_rate: int) -> np.ndarray:
+        voiced = np.zeros(len(frames), dtype=bool)
+
+        for i, frame in enumerate(frames):
+            # WebRTC VAD only works with 16-bit PCM. Convert frame by frame
+            # so float takes are never duplicated as a whole int16 copy.
+            if frame.dtype != np.int16:
+                frame = (frame * 32767).astype(np.int16)
+            voiced[i] = self.vad.is_speech(frame.tobytes(), sample_rate)
+
+        return voiced
+
+
+class EnergyVad(VadBackend):
+    """
+    Energy and zero-crossing detector running over all frames at once.
+
+    A frame is voiced if its energy lies a margin above the noise floor
+    (estimated as a low percentile of all frame energies), or if it is a
+    quieter frame whose zero-crossing rate is well above that of the
+    background, which keeps fricatives at word boundaries. Isolated voiced
+    frames (clicks) are dropped.
+    """
+
+    name = "energy"
+
+    # About 3 s at 30 ms frames, enough for a stable noise floor
+    context_frames = 100
+
+    def __init__(
+        self,
+        aggressiveness: int = 3,
+        noise_percentile: float = 10.0,
+        min_energy_db: float = -65.0,
+    ) -> None:
+        self.margin_db = ENERGY_MARGINS_DB.get(aggressiveness, 15.0)
+        self.noise_percentile = noise_percentile
+        self.min_energy_db = min_energy_db
+
+    def decide(self, frames: np.ndarray, sample_rate: int) -> np.ndarray:
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+
+        frame_size = frames.shape[1]
+        full_scale = 32768.0 if frames.dtype == np.int16 else 1.0
+
+        # Mean power per frame in dBFS, accumulated without a float copy
+        power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+        power /= frame_size * full_scale**2
+        energy_db = 10 * np.log10(power + 1e-12)
+
+        # Zero-crossing rate per frame
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_size
+
+        noise_floor_db = np.percentile(energy_db, self.noise_percentile)
+        threshold_db = max(noise_floor_db + self.margin_db, self.min_energy_db)
+
+        quiet = energy_db <= noise_floor_db + 3.0
+        noise_zcr = np.median(zcr[quiet]) if quiet.any() else np.median(zcr)
+
+        loud = energy_db > threshold_db
+        fricative = (energy_db > noise_floor_db + self.margin_db / 2) & (
+            zcr > 1.5 * noise_zcr + 0.05
+        )
+        voiced = loud | fricative
+
+        # Keep only frames that have a voiced neighbour
+        # (summed by hand, np.convolve pads batches shorter than the kernel)
+        neighbours = voiced.astype(np.int8)
+        neighbours[1:] += voiced[:-1]
+        neighbours[:-1] += voiced[1:]
+        return voiced & (neighbours >= 2)
+
+
+class ResampledVad(VadBackend):
+    """
+    Runs a backend on frames resampled to a rate it supports, for takes
+    captured at rates like 44.1 kHz that WebRTC VAD does not accept.
+
+    Each frame is resampled on its own, all frames in one vectorized call.
+    """
+
+    def __init__(self, backend: VadBackend, vad_rate: int) -> None:
+        self.backend = backend
+        self.vad_rate = vad_rate
+        self.name = backend.name
+        self.context_frames = backend.context_frames
+
+    def supports(self, sample_rate: int, frame_duration_ms: int) -> bool:
+        return self.backend.supports(self.vad_rate, frame_duration_ms)
+
+    def decide(self, frames: np.ndarray, sample_rate: int) -> np.ndarray:
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+        frames = resample(frames, sample_rate, self.vad_rate, axis=1)
+        return self.backend.decide(frames, self.vad_rate)
+
+
+# Rates tried, in order, when a backend does not support the take's rate
+VAD_RATES = (16000, 32000, 48000, 8000)
+
+
+def adapt_vad_backend(
+    backend: VadBackend, sample_rate: int, frame_duration_ms: int
+) -> VadBackend:
+    """Return backend, wrapped in a ResampledVad if it needs another rate."""
+    if backend.supports(sample_rate, frame_duration_ms):
+        return backend
+
+    for vad_rate in VAD_RATES:
+        if backend.supports(vad_rate, frame_duration_ms):
+            return ResampledVad(backend, vad_rate)
+
+    return backend
+
+
+VAD_BACKENDS = {
+    WebRtcVad.name: WebRtcVad,
+    EnergyVad.name: EnergyVad,
+}
+
+
+def get_vad_backend(name: str = "webrtc", aggressiveness: int = 3) -> VadBackend:
+    backend_class = VAD_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown VAD backend: {name}")
+    return backend_class(aggressiveness)